@@ -3,34 +3,30 @@ import random
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.tensorboard import SummaryWriter
 from core.base_agent import BaseAgent
+from core.replay_buffer import ReplayBuffer
+from games.tic_tac_toe.compact import board_features
+from games.tic_tac_toe.symmetry import PERMUTATIONS
+from agents.dqn_inference import DQNInferenceMixin, double_dqn_update
 
 
-class DQNAgent(BaseAgent):
+class DQNAgent(DQNInferenceMixin, BaseAgent):
+    compact_state = True
 
     def __init__(self, name, lr=0.001, gamma=0.95, epsilon=1.0,
-                epsilon_min=0.05, epsilon_decay=0.9995, model_path=None):
+                epsilon_min=0.05, epsilon_decay=0.9995, model_path=None,
+                inference=False, quantize=True, augment=None):
         super().__init__(name)
 
+        self.device = torch.device("cpu")
         self.gamma = gamma
         self.epsilon = epsilon
         self.epsilon_min = epsilon_min
         self.epsilon_decay = epsilon_decay
 
-        # Red neuronal principal
-        self.model = nn.Sequential(
-            nn.Linear(9, 32),
-            nn.ReLU(),
-            nn.Linear(32, 9)
-        )
-
-        # Target network
-        self.target_model = nn.Sequential(
-            nn.Linear(9, 32),
-            nn.ReLU(),
-            nn.Linear(32, 9)
-        )
+        # Red neuronal principal y target network
+        self.model = self.build_network()
+        self.target_model = self.build_network()
 
         self.target_model.load_state_dict(self.model.state_dict())
         self.target_model.eval()
@@ -38,9 +34,12 @@ class DQNAgent(BaseAgent):
         self.optimizer = optim.Adam(self.model.parameters(), lr=lr)
         self.loss_fn = nn.MSELoss()
 
-        self.memory = []
         self.batch_size = 128
         self.max_memory = 75000
+        self.memory = ReplayBuffer(self.max_memory)
+        if augment:
+            # "random" o "all": simetrías del tablero al muestrear la memoria
+            self.memory.set_augmentation(PERMUTATIONS, augment)
         self.update_target_steps = 500
         self.last_state = None
         self.train_step = 0
@@ -50,12 +49,29 @@ class DQNAgent(BaseAgent):
             self.target_model.load_state_dict(self.model.state_dict())
             self.epsilon = 0.0  # inferencia pura
 
+        # Modelo optimizado para inferencia en CPU (ver enable_inference_mode)
+        self.inference_model = None
+        if inference:
+            self.enable_inference_mode(quantize=quantize)
+
+    @staticmethod
+    def build_network():
+        """Red Q del agente (9 casillas -> 9 valores Q)."""
+        return nn.Sequential(
+            nn.Linear(9, 32),
+            nn.ReLU(),
+            nn.Linear(32, 9)
+        )
+
     # ------------------------------------------------------------------
     # Métodos del agente
     # ------------------------------------------------------------------
 
     def act(self, state, valid_actions):
-        board = torch.tensor(state["board"].reshape(-1), dtype=torch.float32)
+        if self.inference_model is not None:
+            return self._act_inference(state, valid_actions)
+
+        board = torch.from_numpy(board_features(state))
 
         if random.random() < self.epsilon:
             return random.choice(valid_actions)
@@ -73,9 +89,7 @@ class DQNAgent(BaseAgent):
         if isinstance(reward, list):
             reward = reward[player_idx]
 
-        self.memory.append((self.last_state, self.last_action, reward, next_state, done))
-        if len(self.memory) > self.max_memory:
-            self.memory.pop(0)
+        self.memory.append(self.last_state, self.last_action, reward, next_state, done)
 
 
     def set_last(self, state, action):
@@ -89,44 +103,11 @@ class DQNAgent(BaseAgent):
         if len(self.memory) < self.batch_size:
             return
 
-        batch = random.sample(self.memory, self.batch_size)
-
-        boards = []
-        targets = []
-
-        for state, action, reward, next_state, done in batch:
-            board = torch.tensor(state["board"].reshape(-1), dtype=torch.float32)
-            next_board = torch.tensor(next_state["board"].reshape(-1), dtype=torch.float32)
-
-            target = self.model(board).detach()
-            action_index = action[0] * 3 + action[1]
-
-            if done:
-                target[action_index] = reward
-            else:
-                # DOUBLE DQN (target más estable)
-                best_next_action = torch.argmax(self.model(next_board)).item()
-                target[action_index] = reward + self.gamma * self.target_model(next_board)[best_next_action].item()
-
-            boards.append(board)
-            targets.append(target)
-
-        boards_tensor = torch.stack(boards)
-        targets_tensor = torch.stack(targets)
-
-        pred = self.model(boards_tensor)
-        loss = self.loss_fn(pred, targets_tensor)
-
-        self.optimizer.zero_grad()
-        loss.backward()
-        self.optimizer.step()
-
-        # actualizar target network periódicamente
-        self.train_step += 1
-        if self.train_step % self.update_target_steps == 0:
-            self.target_model.load_state_dict(self.model.state_dict())
+        return self.train_on_batch(*self.memory.sample(self.batch_size))
 
-        return loss.item()
+    def train_on_batch(self, boards, actions, rewards, next_boards, dones):
+        """Un paso de gradiente Double DQN sobre un lote en arrays (ver double_dqn_update)."""
+        return double_dqn_update(self, boards, actions, rewards, next_boards, dones)
 
     def update_target_network(self):
         self.target_model.load_state_dict(self.model.state_dict())
@@ -3,13 +3,18 @@ import random
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.tensorboard import SummaryWriter
 from core.base_agent import BaseAgent
+from core.replay_buffer import ReplayBuffer
+from games.tic_tac_toe.compact import board_features
+from games.tic_tac_toe.symmetry import PERMUTATIONS
+from agents.dqn_inference import DQNInferenceMixin, double_dqn_update
 
-class DQNAgentGPU(BaseAgent):
+class DQNAgentGPU(DQNInferenceMixin, BaseAgent):
+    compact_state = True
 
     def __init__(self, name, lr=0.001, gamma=0.95, epsilon=1.0,
-                 epsilon_min=0.05, epsilon_decay=0.9995, model_path=None):
+                 epsilon_min=0.05, epsilon_decay=0.9995, model_path=None,
+                 inference=False, quantize=True, augment=None):
         super().__init__(name)
 
         if torch.backends.mps.is_available():
@@ -26,25 +31,8 @@ class DQNAgentGPU(BaseAgent):
         self.epsilon_decay = epsilon_decay
 
         # Red neuronal
-        self.model = nn.Sequential(
-            nn.Linear(9, 128),
-            nn.ReLU(),
-            nn.Linear(128, 128),
-            nn.ReLU(),
-            nn.Linear(128, 64),
-            nn.ReLU(),
-            nn.Linear(64, 9)
-        ).to(self.device)
-
-        self.target_model = nn.Sequential(
-            nn.Linear(9, 128),
-            nn.ReLU(),
-            nn.Linear(128, 128),
-            nn.ReLU(),
-            nn.Linear(128, 64),
-            nn.ReLU(),
-            nn.Linear(64, 9)
-        ).to(self.device)
+        self.model = self.build_network().to(self.device)
+        self.target_model = self.build_network().to(self.device)
 
         self.target_model.load_state_dict(self.model.state_dict())
         self.target_model.eval()
@@ -52,9 +40,12 @@ class DQNAgentGPU(BaseAgent):
         self.optimizer = optim.Adam(self.model.parameters(), lr=lr)
         self.loss_fn = nn.MSELoss()
 
-        self.memory = []
         self.batch_size = 128
         self.max_memory = 75000
+        self.memory = ReplayBuffer(self.max_memory)
+        if augment:
+            # "random" o "all": simetrías del tablero al muestrear la memoria
+            self.memory.set_augmentation(PERMUTATIONS, augment)
         self.update_target_steps = 500
         self.last_state = None
         self.train_step = 0
@@ -65,9 +56,30 @@ class DQNAgentGPU(BaseAgent):
             self.target_model.load_state_dict(self.model.state_dict())
             self.epsilon = 0.0  # inferencia pura
 
+        # Modelo optimizado para inferencia en CPU (ver enable_inference_mode)
+        self.inference_model = None
+        if inference:
+            self.enable_inference_mode(quantize=quantize)
+
     # ------------------------ Métodos ------------------------
+    @staticmethod
+    def build_network():
+        """Red Q del agente (9 casillas -> 9 valores Q)."""
+        return nn.Sequential(
+            nn.Linear(9, 128),
+            nn.ReLU(),
+            nn.Linear(128, 128),
+            nn.ReLU(),
+            nn.Linear(128, 64),
+            nn.ReLU(),
+            nn.Linear(64, 9)
+        )
+
     def act(self, state, valid_actions):
-        board = torch.tensor(state["board"].reshape(-1), dtype=torch.float32, device=self.device)
+        if self.inference_model is not None:
+            return self._act_inference(state, valid_actions)
+
+        board = torch.as_tensor(board_features(state), device=self.device)
 
         if random.random() < self.epsilon:
             return random.choice(valid_actions)
@@ -84,9 +96,7 @@ class DQNAgentGPU(BaseAgent):
         if isinstance(reward, list):
             reward = reward[player_idx]
 
-        self.memory.append((self.last_state, self.last_action, reward, next_state, done))
-        if len(self.memory) > self.max_memory:
-            self.memory.pop(0)
+        self.memory.append(self.last_state, self.last_action, reward, next_state, done)
 
     def set_last(self, state, action):
         self.last_state = state
@@ -97,43 +107,11 @@ class DQNAgentGPU(BaseAgent):
         if len(self.memory) < self.batch_size:
             return
 
-        batch = random.sample(self.memory, self.batch_size)
-
-        boards = []
-        targets = []
-
-        for state, action, reward, next_state, done in batch:
-            board = torch.tensor(state["board"].reshape(-1), dtype=torch.float32, device=self.device)
-            next_board = torch.tensor(next_state["board"].reshape(-1), dtype=torch.float32, device=self.device)
-
-            target = self.model(board).detach()
-            action_index = action[0] * 3 + action[1]
-
-            if done:
-                target[action_index] = reward
-            else:
-                best_next_action = torch.argmax(self.model(next_board)).item()
-                target[action_index] = reward + self.gamma * self.target_model(next_board)[best_next_action].item()
-
-            boards.append(board)
-            targets.append(target)
-
-        boards_tensor = torch.stack(boards)
-        targets_tensor = torch.stack(targets)
-
-        pred = self.model(boards_tensor)
-        loss = self.loss_fn(pred, targets_tensor)
-
-        self.optimizer.zero_grad()
-        loss.backward()
-        self.optimizer.step()
-
-        # actualizar target network periódicamente
-        self.train_step += 1
-        if self.train_step % self.update_target_steps == 0:
-            self.target_model.load_state_dict(self.model.state_dict())
+        return self.train_on_batch(*self.memory.sample(self.batch_size))
 
-        return loss.item()
+    def train_on_batch(self, boards, actions, rewards, next_boards, dones):
+        """Un paso de gradiente Double DQN sobre un lote en arrays (ver double_dqn_update)."""
+        return double_dqn_update(self, boards, actions, rewards, next_boards, dones)
 
     def update_target_network(self):
         self.target_model.load_state_dict(self.model.state_dict())
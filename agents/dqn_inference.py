@@ -0,0 +1,135 @@
+import copy
+import warnings
+import numpy as np
+import torch
+import torch.nn as nn
+from games.tic_tac_toe.compact import board_features
+
+
+def build_inference_model(model, quantize=True, script=True, obs_size=9):
+    """
+    Prepara una copia del modelo para inferencia pura en CPU:
+      - cuantización dinámica int8 de las capas Linear (si quantize=True)
+      - grafo TorchScript congelado, si la versión de torch lo permite
+    El modelo original no se modifica (sigue sirviendo para entrenar).
+    """
+    inference_model = copy.deepcopy(model).cpu().eval()
+
+    with warnings.catch_warnings():
+        # las APIs de cuantización y TorchScript avisan de su deprecación
+        warnings.simplefilter("ignore")
+
+        if quantize:
+            try:
+                from torch.ao.quantization import quantize_dynamic
+            except ImportError:
+                from torch.quantization import quantize_dynamic
+            inference_model = quantize_dynamic(inference_model, {nn.Linear}, dtype=torch.qint8)
+
+        if script:
+            try:
+                with torch.inference_mode():
+                    traced = torch.jit.trace(inference_model, torch.zeros(1, obs_size))
+                inference_model = torch.jit.freeze(traced)
+            except Exception:
+                # sin TorchScript seguimos en modo eager
+                pass
+
+    return inference_model
+
+
+def greedy_action(q_values, valid_actions, board_size=3):
+    """Acción válida con mayor Q (a igualdad, la primera de valid_actions)."""
+    indices = [i * board_size + j for i, j in valid_actions]
+    return valid_actions[int(q_values[indices].argmax())]
+
+
+def epsilon_greedy_batch(q_values, valid_mask, epsilon):
+    """
+    Epsilon-greedy enmascarado sobre un lote: q_values y valid_mask (N, casillas).
+    Con probabilidad epsilon cada tablero elige una casilla válida al azar.
+    Devuelve el índice de casilla elegido en cada tablero.
+    """
+    q_values = np.where(valid_mask, q_values, -np.inf)
+    explore = np.random.random(len(q_values)) < epsilon
+    if explore.any():
+        random_scores = np.random.random((explore.sum(), q_values.shape[1]))
+        q_values[explore] = np.where(valid_mask[explore], random_scores, -np.inf)
+    return q_values.argmax(axis=1)
+
+
+def double_dqn_update(agent, boards, actions, rewards, next_boards, dones):
+    """
+    Un paso de gradiente Double DQN de `agent` sobre un lote de transiciones en
+    arrays (tableros aplanados, índices de acción, recompensas, siguientes
+    tableros, dones), en self.device, con sincronización periódica de la
+    target network. Común a DQNAgent y DQNAgentGPU. Devuelve la pérdida.
+    """
+    device = agent.device
+    boards = torch.as_tensor(boards, dtype=torch.float32, device=device)
+    next_boards = torch.as_tensor(next_boards, dtype=torch.float32, device=device)
+    actions = torch.as_tensor(actions, dtype=torch.int64, device=device)
+    rewards = torch.as_tensor(rewards, dtype=torch.float32, device=device)
+    dones = torch.as_tensor(dones, dtype=torch.bool, device=device)
+
+    with torch.no_grad():
+        targets = agent.model(boards)
+        # DOUBLE DQN (target más estable)
+        best_next_actions = agent.model(next_boards).argmax(dim=1, keepdim=True)
+        next_q = agent.target_model(next_boards).gather(1, best_next_actions).squeeze(1)
+        targets[torch.arange(len(actions), device=device), actions] = torch.where(
+            dones, rewards, rewards + agent.gamma * next_q)
+
+    pred = agent.model(boards)
+    loss = agent.loss_fn(pred, targets)
+
+    agent.optimizer.zero_grad()
+    loss.backward()
+    agent.optimizer.step()
+
+    # actualizar target network periódicamente
+    agent.train_step += 1
+    if agent.train_step % agent.update_target_steps == 0:
+        agent.target_model.load_state_dict(agent.model.state_dict())
+
+    return loss.item()
+
+
+class DQNInferenceMixin:
+    """
+    Inferencia común a los agentes DQN (CPU y GPU): modo de inferencia en CPU
+    y selección por lotes. Usa self.model, self.device, self.epsilon y
+    self.inference_model del agente.
+    """
+
+    def _act_inference(self, state, valid_actions):
+        board = torch.from_numpy(board_features(state)).view(1, -1)
+        with torch.inference_mode():
+            q_values = self.inference_model(board)[0].numpy()
+        return greedy_action(q_values, valid_actions)
+
+    def act_batch(self, boards, valid_mask):
+        """
+        Epsilon-greedy sobre un lote de tableros aplanados (N, 9) con una sola
+        pasada por la red. Devuelve el índice de casilla elegido en cada tablero.
+        """
+        boards = torch.as_tensor(boards, dtype=torch.float32)
+        if self.inference_model is not None:
+            with torch.inference_mode():
+                q_values = self.inference_model(boards).numpy()
+        else:
+            with torch.no_grad():
+                q_values = self.model(boards.to(self.device)).cpu().numpy()
+        return epsilon_greedy_batch(q_values, valid_mask, self.epsilon)
+
+    def enable_inference_mode(self, quantize=True, script=True):
+        """
+        Congela el agente para evaluación en CPU: sin exploración, int8 dinámico
+        en las capas lineales y grafo TorchScript si está disponible.
+        El modelo de inferencia vive siempre en CPU, aunque self.device sea GPU.
+        """
+        self.epsilon = 0.0
+        self.inference_model = build_inference_model(self.model, quantize=quantize, script=script)
+
+    def disable_inference_mode(self):
+        self.inference_model = None
@@ -2,5 +2,7 @@ from core.base_agent import BaseAgent
 import random
 
 class RandomAgent(BaseAgent):
+    compact_state = True
+
     def act(self, state, valid_actions):
         return random.choice(valid_actions)
@@ -1,60 +1,99 @@
 from core.base_agent import BaseAgent
+from core.log_buffer import get_logger
+from games.tic_tac_toe.compact import CompactState
+from games.tic_tac_toe.lines import BOARD_SIZE, NUM_CELLS, LINES, CELL_LINES
+from functools import lru_cache
+import numpy as np
 import random
 
+# Prioridad de cada criterio (de mayor a menor) y mensaje de log
+WIN, BLOCK, FORK, BLOCK_FORK = range(4)
+PRIORITY = np.array([1000, 100, 10, 5], dtype=np.int16)
+LOG_MESSAGES = {
+    WIN: "---> I WIN!",
+    BLOCK: "---> I PREVENT YOU FROM WINNING!",
+    FORK: "---> I CREATE A FORK!",
+    BLOCK_FORK: "---> I BLOCK YOUR FORK!",
+}
+
+# Cada tablero normalizado (-1, 0, 1) se indexa en base 3
+POWERS_OF_3 = 3 ** np.arange(NUM_CELLS)
+
+
+def score_boards(boards):
+    """
+    Puntúa las casillas de un lote de tableros (N, 9) en una sola pasada:
+      - ganar: alguna línea con 2 fichas mías y la casilla libre
+      - bloquear: alguna línea con 2 fichas del rival
+      - fork: la casilla abre 2 o más líneas con 2 fichas mías
+      - bloquear fork: la casilla donde el rival haría un fork
+      - + nº de líneas que dejan 2 fichas mías (más opciones de ganar)
+    Devuelve (scores, flags) con formas (N, 9) y (N, 9, 4).
+    """
+    values = boards[:, LINES]
+    mine = (values == 1).sum(axis=2)
+    opp = (values == -1).sum(axis=2)
+    empty = BOARD_SIZE - mine - opp
+
+    line_features = np.stack([
+        (mine == BOARD_SIZE - 1) & (empty == 1),
+        (opp == BOARD_SIZE - 1) & (empty == 1),
+        (mine == 1) & (empty == BOARD_SIZE - 1),
+        (opp == 1) & (empty == BOARD_SIZE - 1),
+    ], axis=2).astype(np.int16)
+    counts = np.einsum("cl,nlf->ncf", CELL_LINES, line_features)
+
+    flags = np.stack([
+        counts[..., 0] > 0,
+        counts[..., 1] > 0,
+        counts[..., 2] >= 2,
+        counts[..., 3] >= 2,
+    ], axis=2)
+    scores = flags @ PRIORITY + counts[..., 2]
+    return scores, flags
+
+
+@lru_cache(maxsize=None)
+def score_tables():
+    """
+    Precalcula (una vez por proceso, en la primera jugada) puntuaciones y
+    motivos para los 3^9 tableros posibles.
+    """
+    keys = np.arange(3 ** NUM_CELLS)
+    boards = (keys[:, None] // POWERS_OF_3) % 3 - 1
+    scores, flags = score_boards(boards)
+    # motivo principal de cada casilla (o -1 si ninguno), solo para los logs
+    reasons = np.where(flags.any(axis=2), flags.argmax(axis=2), -1)
+    return scores.tolist(), reasons
+
+
+def board_key(board):
+    """Índice en base 3 de un tablero normalizado."""
+    return int((np.asarray(board).reshape(-1) + 1) @ POWERS_OF_3)
+
+
 class MyTicTacToeAgent(BaseAgent):
+    compact_state = True
 
     def __init__(self, name="Yo", write_logs=False):
         super().__init__(name)
         self.write_logs = write_logs
+        self.logger = get_logger("logfile.log", enabled=write_logs)
 
     def act(self, state, valid_actions):
-        board = state["board"]
-        board_size = len(board[0])
-
-        with open("logfile.log", "a") as f:
-
-            for action in valid_actions:
-                i, j = action
-                # cells where I can win (check row, column & diagonals)
-                if (sum(board[i, :]) == (board_size - 1)) or \
-                    (sum(board[:, j]) == (board_size - 1)) or \
-                    ((i == j and sum([board[x][x] for x in range(board_size)]) == (board_size - 1))) or \
-                    (i == (board_size - j - 1) and sum([board[x][board_size - x - 1] for x in range(board_size)]) == (board_size - 1)):
-                    if self.write_logs:
-                        f.write(f"board: {board}\n")
-                        f.write(f"action: {action}\n")
-                        f.write("---> I WIN!\n")
-                    return action
-
-            for action in valid_actions:
-                i, j = action
-                # cells where opponent can win (check row, column & diagonals)
-                if (sum(board[i, :]) == -(board_size - 1)) or \
-                    (sum(board[:, j]) == -(board_size - 1)) or \
-                    (i == j and sum([board[x][x] for x in range(board_size)]) == -(board_size - 1)) or \
-                    (i == (board_size - j - 1) and sum([board[x][board_size - x - 1] for x in range(board_size)]) == -(board_size - 1)):
-                    if self.write_logs:
-                        f.write(f"board: {board}\n")
-                        f.write(f"action: {action}\n")
-                        f.write("---> I PREVENT YOU FROM WINNING!\n")
-                    return action
-
-            for action in valid_actions:
-                i, j = action
-                # check minimax value of action
-                # +1 point for every enemy cell
-                # +1 point for every player cell
-                # 0 points if shared row/col/diagonal
-                # check row
-                # for x in range(board_size):
-
-                # check col
-                # check diagonal 1 ?
-                # check diagonal 2 ?
-
-                # cells that create the most chances to win next turn
-                # TODO
-            if self.write_logs:
-                f.write("---> RANDOM ACTION\n")
-            return random.choice(valid_actions)
-        
+        # Estado compacto: el índice sale de las máscaras, sin construir el tablero
+        key = state.base3 if isinstance(state, CompactState) else board_key(state["board"])
+        score_table, reason_table = score_tables()
+        scores = score_table[key]
+
+        valid_scores = [scores[i * BOARD_SIZE + j] for i, j in valid_actions]
+        best_score = max(valid_scores)
+        action = random.choice([a for a, s in zip(valid_actions, valid_scores) if s == best_score])
+
+        if self.logger.enabled:
+            reason = reason_table[key, action[0] * BOARD_SIZE + action[1]]
+            self.logger.write(f"board: {np.asarray(state['board']).tolist()}")
+            self.logger.write(f"action: {action}")
+            self.logger.write(LOG_MESSAGES.get(reason, "---> MOST CHANCES / RANDOM ACTION"))
+
+        return action
@@ -0,0 +1,80 @@
+"""
+Compara el modo de inferencia (int8 dinámico + TorchScript) con el modelo float
+de los agentes DQN:
+  - precisión: misma jugada greedy en todas las posiciones alcanzables
+  - velocidad: jugadas por segundo en CPU
+
+Uso:
+    python -m benchmarks.bench_dqn_inference --agent gpu --model models/best_model_vs_MyTicTacToeAgent.pth
+"""
+import argparse
+import time
+import torch
+from agents.dqn_agent import DQNAgent
+from agents.dqn_agent_gpu import DQNAgentGPU
+from games.tic_tac_toe.positions import reachable_states
+
+AGENT_CLASSES = {"cpu": DQNAgent, "gpu": DQNAgentGPU}
+
+
+def greedy_moves(agent, positions):
+    return [agent.act(state, valid) for state, valid in positions]
+
+
+def moves_per_second(agent, positions, repeats=3):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        greedy_moves(agent, positions)
+    elapsed = time.perf_counter() - start
+    return repeats * len(positions) / elapsed
+
+
+def compare_inference(agent, positions, quantize=True, script=True, repeats=3):
+    """
+    Devuelve un dict con la coincidencia de jugadas respecto al modelo float
+    y las jugadas/s de ambos modos.
+    """
+    agent.disable_inference_mode()
+    agent.epsilon = 0.0
+    reference = greedy_moves(agent, positions)
+    float_mps = moves_per_second(agent, positions, repeats)
+
+    agent.enable_inference_mode(quantize=quantize, script=script)
+    optimized = greedy_moves(agent, positions)
+    inference_mps = moves_per_second(agent, positions, repeats)
+
+    matches = sum(a == b for a, b in zip(reference, optimized))
+    return {
+        "positions": len(positions),
+        "agreement": matches / len(positions),
+        "float_moves_per_s": float_mps,
+        "inference_moves_per_s": inference_mps,
+        "speedup": inference_mps / float_mps,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agent", choices=sorted(AGENT_CLASSES), default="gpu")
+    parser.add_argument("--model", default=None, help="ruta/al/modelo.pth (pesos aleatorios si se omite)")
+    parser.add_argument("--no-quantize", action="store_true")
+    parser.add_argument("--no-script", action="store_true")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    agent = AGENT_CLASSES[args.agent]("Bench", model_path=args.model)
+    if args.agent == "gpu":
+        # la flota de evaluación es solo CPU
+        agent.device = torch.device("cpu")
+        agent.model.to(agent.device)
+
+    positions = reachable_states()
+    result = compare_inference(agent, positions, quantize=not args.no_quantize,
+                               script=not args.no_script, repeats=args.repeats)
+
+    print(f"Posiciones evaluadas: {result['positions']}")
+    print(f"Coincidencia con el modelo float: {result['agreement'] * 100:.2f}%")
+    print(f"Float:      {result['float_moves_per_s']:.0f} jugadas/s")
+    print(f"Inferencia: {result['inference_moves_per_s']:.0f} jugadas/s (x{result['speedup']:.2f})")
@@ -0,0 +1,87 @@
+"""
+Jugadas por segundo de MyTicTacToeAgent frente a la implementación anterior
+(sumas por fila/columna/diagonal en Python y logfile.log abierto en cada jugada).
+
+Uso:
+    python -m benchmarks.bench_tictactoe_agent
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from agents.tic_tac_toe_agent import MyTicTacToeAgent
+from games.tic_tac_toe.positions import reachable_states
+
+
+def legacy_act(state, valid_actions, write_logs=False):
+    """Copia de MyTicTacToeAgent.act antes de las tablas de líneas."""
+    board = state["board"]
+    board_size = len(board[0])
+
+    with open("logfile.log", "a") as f:
+
+        for action in valid_actions:
+            i, j = action
+            if (sum(board[i, :]) == (board_size - 1)) or \
+                (sum(board[:, j]) == (board_size - 1)) or \
+                ((i == j and sum([board[x][x] for x in range(board_size)]) == (board_size - 1))) or \
+                (i == (board_size - j - 1) and sum([board[x][board_size - x - 1] for x in range(board_size)]) == (board_size - 1)):
+                if write_logs:
+                    f.write(f"board: {board}\n")
+                    f.write(f"action: {action}\n")
+                    f.write("---> I WIN!\n")
+                return action
+
+        for action in valid_actions:
+            i, j = action
+            if (sum(board[i, :]) == -(board_size - 1)) or \
+                (sum(board[:, j]) == -(board_size - 1)) or \
+                (i == j and sum([board[x][x] for x in range(board_size)]) == -(board_size - 1)) or \
+                (i == (board_size - j - 1) and sum([board[x][board_size - x - 1] for x in range(board_size)]) == -(board_size - 1)):
+                if write_logs:
+                    f.write(f"board: {board}\n")
+                    f.write(f"action: {action}\n")
+                    f.write("---> I PREVENT YOU FROM WINNING!\n")
+                return action
+
+        if write_logs:
+            f.write("---> RANDOM ACTION\n")
+        return random.choice(valid_actions)
+
+
+def moves_per_second(act, positions, repeats=3):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for state, valid in positions:
+            act(state, valid)
+    return repeats * len(positions) / (time.perf_counter() - start)
+
+
+def run(repeats=3):
+    positions = reachable_states()
+    agent = MyTicTacToeAgent("Bench", write_logs=False)
+
+    # la versión anterior escribe logfile.log en el directorio actual
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            legacy = moves_per_second(legacy_act, positions, repeats)
+        finally:
+            os.chdir(cwd)
+
+    current = moves_per_second(agent.act, positions, repeats)
+    return {"positions": len(positions), "legacy_moves_per_s": legacy,
+            "moves_per_s": current, "speedup": current / legacy}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    result = run(args.repeats)
+    print(f"Posiciones evaluadas: {result['positions']}")
+    print(f"Implementación anterior: {result['legacy_moves_per_s']:.0f} jugadas/s")
+    print(f"Tablas de líneas:        {result['moves_per_s']:.0f} jugadas/s (x{result['speedup']:.2f})")
@@ -0,0 +1,121 @@
+"""
+Benchmark de arranque de los scripts: tiempo hasta terminar `--help` (y la
+importación de la ruta headless de versus/torneo) con un presupuesto en ms, y
+un informe de `python -X importtime` con los módulos más caros.
+
+También comprueba que ningún comando carga dependencias pesadas que no usa
+(torch, tensorboard, pygame, pygame_gui): solo deben importarse en las rutas
+de código que las necesitan.
+
+Uso:
+    python -m benchmarks.startup                  # falla (exit 1) si algo se pasa
+    python -m benchmarks.startup --only versus --top 20
+    python -m benchmarks.startup --scale 2        # presupuestos x2 en máquinas lentas
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("torch", "tensorboard", "pygame", "pygame_gui")
+
+# nombre: (argumentos de python, presupuesto en ms, dependencias pesadas prohibidas).
+# Los --help sin numpy rondan 60 ms; generate_dataset y
+# render_replays cargan numpy con el módulo que define sus opciones, y la ruta
+# headless de versus/torneo lo necesita para el juego.
+COMMANDS = {
+    "versus --help": (["versus.py", "--help"], 100, HEAVY),
+    "versus headless": (["-c", "import versus, core.tournament, core.engine"], 250, HEAVY),
+    "play --help": (["play.py", "--help"], 100, HEAVY),
+    "train_dqn --help": (["train_dqn.py", "--help"], 100, HEAVY),
+    "train_dqn_gpu --help": (["train_dqn_gpu.py", "--help"], 100, HEAVY),
+    "generate_dataset --help": (["generate_dataset.py", "--help"], 250, HEAVY),
+    "render_replays --help": (["render_replays.py", "--help"], 250, HEAVY),
+    "browse_replays --help": (["browse_replays.py", "--help"], 100, HEAVY),
+}
+
+
+def parse_importtime(stderr):
+    """Líneas de -X importtime -> [(módulo, propio_us, acumulado_us, profundidad)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(own), int(cumulative), depth))
+    return rows
+
+
+def _run(args, importtime=False):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} terminó con código {result.returncode}:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def measure_command(args, repeats=5):
+    """Mejor tiempo de pared (ms) de `repeats` ejecuciones y módulos importados (de -X importtime)."""
+    wall = min(_run(args)[0] for _ in range(repeats))
+    rows = parse_importtime(_run(args, importtime=True)[1])
+    return {
+        "wall_ms": 1000 * wall,
+        "import_ms": sum(row[2] for row in rows if row[3] == 0) / 1000,
+        "modules": rows,
+    }
+
+
+def heavy_modules(rows, forbidden=HEAVY):
+    """Paquetes de `forbidden` que aparecen entre los módulos importados."""
+    return sorted({name.split(".")[0] for name, *_ in rows if name.split(".")[0] in forbidden})
+
+
+def top_modules(rows, n):
+    """Los `n` módulos de primer nivel (paquetes) con más tiempo acumulado."""
+    packages = {}
+    for name, _, cumulative, _ in rows:
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0), cumulative)
+    return sorted(packages.items(), key=lambda item: -item[1])[:n]
+
+
+def run_startup(only=None, repeats=5, scale=1.0, top=10):
+    """Mide cada comando; devuelve {nombre: resultado} con los fallos de presupuesto/imports."""
+    report = {}
+    for name, (args, budget, forbidden) in COMMANDS.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        result = measure_command(args, repeats)
+        result["budget_ms"] = budget * scale
+        result["heavy"] = heavy_modules(result["modules"], forbidden)
+        result["ok"] = result["wall_ms"] <= result["budget_ms"] and not result["heavy"]
+        report[name] = result
+
+        status = "OK" if result["ok"] else "FALLO"
+        print(f"[PERF] {name:<26} {result['wall_ms']:7.1f} ms (presupuesto {result['budget_ms']:.0f} ms, "
+              f"imports {result['import_ms']:.1f} ms) {status}")
+        if result["heavy"]:
+            print(f"         importa dependencias pesadas: {', '.join(result['heavy'])}")
+        if top:
+            print("         " + ", ".join(f"{package} {us / 1000:.1f}" for package, us in
+                                       top_modules(result["modules"], top)) + " (ms)")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo de arranque e imports de los scripts")
+    parser.add_argument("--only", nargs="+", default=None, help="prefijos de los comandos a medir")
+    parser.add_argument("--repeats", type=int, default=5, help="ejecuciones por comando (se toma la mejor)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplicador de los presupuestos")
+    parser.add_argument("--top", type=int, default=10, help="paquetes más caros a mostrar (0 = ninguno)")
+    args = parser.parse_args()
+
+    report = run_startup(args.only, args.repeats, args.scale, args.top)
+    if not all(result["ok"] for result in report.values()):
+        sys.exit(1)
@@ -0,0 +1,291 @@
+"""
+Suite de benchmarks del juego, los agentes y el entrenamiento, con salida JSON
+y comparación contra una línea base guardada.
+
+  - micro: TicTacToeGame.step / is_terminal / get_winner / get_state /
+    valid_actions / evaluate_move, y act() de cada agente (jugadas/s)
+  - entrenamiento: pasos/s de DQNAgent.train_from_memory
+  - macro: partidas/s de GameEngine.run y un versus de 10k partidas
+
+Todas las métricas son "más es mejor" (operaciones por segundo).
+
+Uso:
+    python -m benchmarks.suite --out bench.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json   # falla si hay regresiones
+    python -m benchmarks.suite --only game agent --quick
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+from agents.random_agent import RandomAgent
+from agents.tic_tac_toe_agent import MyTicTacToeAgent
+from core.engine import GameEngine
+from games.tic_tac_toe.game import TicTacToeGame
+from games.tic_tac_toe.positions import reachable_states
+
+TOLERANCE = 0.15  # caída máxima respecto a la línea base antes de marcar regresión
+VERSUS_GAMES = 10_000
+
+
+def measure(fn, items=1, min_time=0.2, repeats=5):
+    """
+    Operaciones por segundo de `fn` (cada llamada hace `items` operaciones):
+    la mejor de `repeats` tandas de al menos `min_time / repeats` segundos
+    (como timeit: las tandas más lentas solo miden ruido del sistema).
+    """
+    fn()  # calentamiento (cachés, lazy imports)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeats:
+            break
+        loops *= 2
+
+    rates = [loops * items / elapsed]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        rates.append(loops * items / (time.perf_counter() - start))
+    return max(rates)
+
+
+def sample_positions(n=200, seed=0):
+    positions = reachable_states()
+    return random.Random(seed).sample(positions, min(n, len(positions)))
+
+
+def _boards(positions):
+    """Tableros absolutos (1/2) de las posiciones normalizadas, con el jugador al que le toca."""
+    boards = []
+    for state, _ in positions:
+        normalized, player = state["board"], state["player_id"]
+        board = np.where(normalized == 1, player + 1, np.where(normalized == -1, 2 - player, 0))
+        boards.append((board, player))
+    return boards
+
+
+# ----------------------------------------------------------------------
+# Micro: juego
+# ----------------------------------------------------------------------
+
+def bench_game(quick=False):
+    game = TicTacToeGame(num_players=2)
+    boards = _boards(sample_positions(50 if quick else 200))
+    moves = [(p % 2, divmod(cell, 3)) for p, cell in enumerate([4, 0, 8, 2, 6, 3, 5, 7, 1])]
+
+    def play_moves():
+        game.reset()
+        for move in moves:
+            game.step([move])
+
+    def over_boards(method):
+        def run():
+            for board, player in boards:
+                game.board = board
+                game.current_player = player
+                method(player)
+        return run
+
+    compact = TicTacToeGame(num_players=2, compact=True)
+
+    def play_compact():
+        # step() devuelve el estado: aquí un CompactState internado en lugar de un dict nuevo
+        compact.reset()
+        for move in moves:
+            compact.step([move])
+
+    def evaluate():
+        for board, player in boards:
+            game.board = board
+            for action in game.valid_actions(player):
+                game.evaluate_move(player, action)
+    evaluations = sum(int((board == 0).sum()) for board, _ in boards)
+
+    return {
+        "game.step": measure(play_moves, items=len(moves)),
+        "game.is_terminal": measure(over_boards(lambda p: game.is_terminal()), items=len(boards)),
+        "game.get_winner": measure(over_boards(lambda p: game.get_winner()), items=len(boards)),
+        "game.get_state": measure(over_boards(game.get_state), items=len(boards)),
+        "game.valid_actions": measure(over_boards(game.valid_actions), items=len(boards)),
+        "game.step_compact": measure(play_compact, items=len(moves)),
+        "game.evaluate_move": measure(evaluate, items=evaluations),
+    }
+
+
+# ----------------------------------------------------------------------
+# Micro: act() de los agentes
+# ----------------------------------------------------------------------
+
+def _act_rate(agent, positions):
+    def run():
+        for state, valid in positions:
+            agent.act(state, valid)
+    return measure(run, items=len(positions))
+
+
+def bench_agents(quick=False):
+    positions = sample_positions(100 if quick else 500)
+    results = {
+        "agent.random.act": _act_rate(RandomAgent("Bench"), positions),
+        "agent.my.act": _act_rate(MyTicTacToeAgent("Bench"), positions),
+    }
+
+    from agents.dqn_agent import DQNAgent  # torch solo para los agentes DQN
+    import torch
+    torch.set_num_threads(1)
+    dqn = DQNAgent("Bench", epsilon=0.0)
+    results["agent.dqn.act"] = _act_rate(dqn, positions)
+    dqn.enable_inference_mode()
+    results["agent.dqn_inference.act"] = _act_rate(dqn, positions)
+    return results
+
+
+# ----------------------------------------------------------------------
+# Entrenamiento
+# ----------------------------------------------------------------------
+
+def bench_training(quick=False):
+    from agents.dqn_agent import DQNAgent
+    import torch
+    torch.set_num_threads(1)
+
+    agent = DQNAgent("Bench")
+    game = TicTacToeGame(num_players=2)
+    rival = RandomAgent("Rival")
+    while len(agent.memory) < 2 * agent.batch_size:
+        GameEngine(game, [agent, rival]).run()
+    return {"dqn.train_from_memory": measure(agent.train_from_memory, min_time=0.5 if quick else 2.0)}
+
+
+# ----------------------------------------------------------------------
+# Macro
+# ----------------------------------------------------------------------
+
+def bench_engine(quick=False):
+    game = TicTacToeGame(num_players=2)
+    agents = [MyTicTacToeAgent("Yo"), RandomAgent("Random")]
+
+    def run():
+        GameEngine(game, agents).run()
+    return {"engine.games": measure(run, min_time=0.5 if quick else 2.0)}
+
+
+def bench_versus(quick=False):
+    """Un versus.py completo (log de resultados incluido) entre MyTicTacToeAgent y RandomAgent."""
+    from versus import start_versus
+
+    games = VERSUS_GAMES // 10 if quick else VERSUS_GAMES
+    config = {
+        "players": [
+            {"name": "Yo", "agent": "my", "params": {}},
+            {"name": "Random", "agent": "random", "params": {}},
+        ],
+        "rounds": games,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = os.path.join(tmp, "versus.json")
+        with open(cfg, "w") as f:
+            json.dump(config, f)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            start_versus(cfg, results_path=os.path.join(tmp, "results.jsonl"))
+        elapsed = time.perf_counter() - start
+    return {"versus.games": games / elapsed}
+
+
+BENCHMARKS = {
+    "game": bench_game,
+    "agent": bench_agents,
+    "training": bench_training,
+    "engine": bench_engine,
+    "versus": bench_versus,
+}
+
+
+def environment():
+    info = {"python": platform.python_version(), "platform": platform.platform(),
+            "numpy": np.__version__, "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    if "torch" in sys.modules:
+        info["torch"] = sys.modules["torch"].__version__
+    return info
+
+
+def run_suite(only=None, quick=False):
+    results = {}
+    for group, bench in BENCHMARKS.items():
+        if only and group not in only:
+            continue
+        start = time.perf_counter()
+        results.update(bench(quick))
+        print(f"[PERF] {group}: {time.perf_counter() - start:.1f}s")
+    return {"environment": environment(), "quick": quick, "results": results}
+
+
+def compare(current, baseline, tolerance=TOLERANCE):
+    """
+    Compara cada métrica con la línea base. Devuelve filas
+    (nombre, actual, base, ratio, regresión) de las métricas presentes en ambas.
+    """
+    rows = []
+    for name, value in current["results"].items():
+        base = baseline["results"].get(name)
+        if base:
+            ratio = value / base
+            rows.append((name, value, base, ratio, ratio < 1 - tolerance))
+    return rows
+
+
+def print_results(report, rows=None):
+    if rows is None:
+        for name, value in report["results"].items():
+            print(f"  {name:<28} {value:14.1f} /s")
+        return
+    for name, value, base, ratio, regression in rows:
+        flag = "  <-- REGRESIÓN" if regression else ""
+        print(f"  {name:<28} {value:14.1f} /s  (base {base:.1f}, x{ratio:.2f}){flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del juego, agentes, entrenamiento y motor")
+    parser.add_argument("--out", default=None, help="fichero JSON con los resultados")
+    parser.add_argument("--baseline", default=None, help="JSON de una ejecución anterior con la que comparar")
+    parser.add_argument("--save-baseline", default=None, help="guarda estos resultados como línea base")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="caída relativa permitida antes de marcar regresión")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None,
+                        help="grupos de benchmarks a ejecutar (todos si se omite)")
+    parser.add_argument("--quick", action="store_true", help="versión corta (menos posiciones y partidas)")
+    args = parser.parse_args()
+
+    report = run_suite(args.only, args.quick)
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("quick") != report["quick"]:
+            print("[PERF] Aviso: la línea base y esta ejecución usan distinto --quick")
+        rows = compare(report, baseline, args.tolerance)
+        print_results(report, rows)
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions:
+            print(f"[PERF] {len(regressions)} regresiones: {', '.join(regressions)}")
+            sys.exit(1)
+    else:
+        print_results(report)
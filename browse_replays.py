@@ -0,0 +1,16 @@
+from core.profiling import add_profile_args, profile_from_args
+import argparse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Navegador de replays con filtros para archivos grandes")
+    parser.add_argument("source", help="archivo .replays o directorio con replays JSON")
+    parser.add_argument("--width", type=int, default=900)
+    parser.add_argument("--height", type=int, default=600)
+    add_profile_args(parser)
+    args = parser.parse_args()
+
+    from ui.replay_browser import ReplayBrowser  # pygame solo si se abre la ventana
+
+    with profile_from_args(args, "browse_replays"):
+        ReplayBrowser(args.source, width=args.width, height=args.height).run()
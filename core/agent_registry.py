@@ -0,0 +1,131 @@
+"""
+Registro de agentes compartido por play.py, versus.py y el torneo.
+
+Un agente se indica por nombre de registro ("random", "my", "dqn"...), como
+"modulo:Clase" o por la ruta de su fichero .py (la forma de los ficheros de
+configuración). Las rutas dentro del proyecto se importan como módulos
+normales, así que cada módulo se carga una sola vez por proceso y las clases
+se pueden enviar a otros procesos. La clase resuelta se cachea por proceso.
+
+load_agent() devuelve una AgentFactory: el módulo del agente (y lo que
+importe, p. ej. torch) no se carga hasta crear el primer agente.
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import zlib
+from core.base_agent import BaseAgent
+
+AGENTS = {
+    "random": "agents.random_agent:RandomAgent",
+    "my": "agents.tic_tac_toe_agent:MyTicTacToeAgent",
+    "dqn": "agents.dqn_agent:DQNAgent",
+    "dqn_gpu": "agents.dqn_agent_gpu:DQNAgentGPU",
+}
+ENTRY_POINT_GROUP = "game_env.agents"  # agentes de paquetes externos instalados
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_classes = {}
+
+
+def register(name, target):
+    """Registra `target` ("modulo:Clase" o clase) con el nombre `name`."""
+    AGENTS[name] = target
+    _classes.pop(name, None)
+
+
+def _find_agent_class(module):
+    """Primera subclase de BaseAgent definida en el módulo (o, si no, importada en él)."""
+    candidates = [obj for obj in module.__dict__.values()
+                  if isinstance(obj, type) and issubclass(obj, BaseAgent) and obj is not BaseAgent]
+    for obj in candidates:
+        if obj.__module__ == module.__name__:
+            return obj
+    if candidates:
+        return candidates[0]
+    raise ValueError(f"No se encontró ninguna clase Agent válida en {module.__name__}")
+
+
+def _module_name(path):
+    """Nombre de módulo de un fichero del proyecto (None si está fuera)."""
+    relative = os.path.relpath(os.path.abspath(path), ROOT)
+    if relative.startswith(os.pardir) or not relative.endswith(".py"):
+        return None
+    parts = relative[:-3].split(os.sep)
+    return ".".join(parts) if all(part.isidentifier() for part in parts) else None
+
+
+def _load_file(path):
+    if not os.path.exists(path):
+        raise ValueError(f"No existe el fichero del agente: {path}")
+    module_name = _module_name(path)
+    if module_name is not None:
+        return _find_agent_class(importlib.import_module(module_name))
+
+    # Fichero externo: se ejecuta una vez y se registra en sys.modules
+    module_name = f"_agent_{zlib.crc32(os.path.abspath(path).encode()):08x}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return _find_agent_class(module)
+
+
+def _load_entry_point(name):
+    from importlib.metadata import entry_points
+
+    for entry in entry_points(group=ENTRY_POINT_GROUP):
+        if entry.name == name:
+            return entry.load()
+    return None
+
+
+def resolve(spec):
+    """Clase de agente para `spec` (nombre de registro, "modulo:Clase" o ruta .py)."""
+    cls = _classes.get(spec)
+    if cls is not None:
+        return cls
+
+    target = AGENTS.get(spec, spec)
+    if isinstance(target, type):
+        cls = target
+    elif target.endswith(".py"):
+        cls = _load_file(target)
+    elif ":" in target:
+        module_name, class_name = target.split(":", 1)
+        cls = getattr(importlib.import_module(module_name), class_name)
+    else:
+        cls = _load_entry_point(target)
+        if cls is None:
+            raise ValueError(f"Agente desconocido: {spec}")
+    _classes[spec] = cls
+    return cls
+
+
+class AgentFactory:
+    """Crea agentes de `spec`; la clase se resuelve (e importa) en la primera llamada."""
+
+    def __init__(self, spec):
+        self.spec = spec
+
+    @property
+    def cls(self):
+        return resolve(self.spec)
+
+    def __call__(self, *args, **kwargs):
+        return self.cls(*args, **kwargs)
+
+    def __repr__(self):
+        return f"AgentFactory({self.spec!r})"
+
+
+def load_agent(spec):
+    return AgentFactory(spec)
+
+
+def player_spec(player):
+    """Agente de una entrada "players" de configuración: clave "agent" (registro) o "path"."""
+    return player.get("agent") or player["path"]
@@ -4,6 +4,10 @@ class BaseAgent(ABC):
     """
     Define la interfaz que cualquier 'jugador' debe implementar.
     """
+    # True si el agente acepta el estado compacto de solo lectura (CompactState)
+    # en act/observe; los que no lo declaran reciben el dict con un tablero propio
+    compact_state = False
+
     def __init__(self, name="Agent"):
         self.name = name
 
@@ -18,3 +22,8 @@ class BaseAgent(ABC):
 
     def set_last(self, state, action):
         pass
+
+
+def supports_compact_state(agents):
+    """True si todos los agentes aceptan el estado compacto (también los que no heredan de BaseAgent)."""
+    return all(getattr(agent, "compact_state", False) for agent in agents)
@@ -1,5 +1,7 @@
 import time
-import pygame
+
+FPS = 30
+
 
 class GameEngine:
     """
@@ -8,19 +10,43 @@ class GameEngine:
     - Solicita las acciones a cada agente
     - Ejecuta esas acciones en el juego
     - Actualiza la interfaz (si existe)
+    - Añade la partida a un archivo de replays (si se indica un ReplayArchiveWriter)
     """
-    def __init__(self, game, agents, ui=None, delay=0.6):
+    def __init__(self, game, agents, ui=None, delay=0.6, archive=None):
         self.game = game
         self.agents = agents
         self.ui = ui
         self.delay = delay
+        self.archive = archive
         self.history = []
+        self.moves = []
+        self.think_time = [0.0] * len(agents)  # segundos en act() de cada agente (última partida)
+
+    def _wait(self, seconds):
+        """
+        Espera entre jugadas procesando eventos a ritmo de frames (en lugar de
+        time.sleep) para que la ventana siga respondiendo. False si se cierra.
+        """
+        import pygame
+
+        clock = pygame.time.Clock()
+        end = time.time() + seconds
+        while time.time() < end:
+            if pygame.event.peek(pygame.QUIT):
+                return False
+            pygame.event.pump()
+            clock.tick(FPS)
+        return True
 
     def run(self, verbose=False):
         self.game.reset()
+        self.moves = []
+        self.think_time = [0.0] * len(self.agents)
         done = False
 
         if self.ui:
+            import pygame  # solo con interfaz: las partidas headless no cargan pygame
+
             self.ui.render(self.game.get_state())
             pygame.display.flip()
 
@@ -42,8 +68,11 @@ class GameEngine:
                 agent = self.agents[player_idx]
                 state = self.game.get_state(player_idx)
                 valid = self.game.valid_actions(player_idx)
+                start = time.perf_counter()
                 action = agent.act(state, valid)
+                self.think_time[player_idx] += time.perf_counter() - start
                 player_actions.append((player_idx, action))
+                self.moves.append((player_idx, action))
                 
                 agent.set_last(state, action)
                 next_state, reward, done = self.game.step([(player_idx, action)])
@@ -64,9 +93,14 @@ class GameEngine:
             if self.ui:
                 self.ui.render(self.game.get_state())
                 pygame.display.flip()
-                time.sleep(self.delay)
+                if not self._wait(self.delay):
+                    pygame.quit()
+                    return
 
         winner = self.game.get_winner()
+        if self.archive:
+            self.archive.write_game([agent.name for agent in self.agents], self.moves, winner)
+
         if verbose and winner:
             print(f"Game over. Winner: {self.agents[winner].name}")
 
@@ -0,0 +1,59 @@
+import atexit
+
+_loggers = {}
+
+
+class NullLogger:
+    """Logger que no hace nada: se usa cuando los logs están desactivados."""
+    enabled = False
+
+    def write(self, message):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BufferedLogger:
+    """
+    Acumula líneas en memoria y las escribe al fichero en bloques,
+    abriéndolo en modo append solo al vaciar el buffer.
+    """
+    enabled = True
+
+    def __init__(self, path, buffer_size=256):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer = []
+        atexit.register(self.flush)
+
+    def write(self, message):
+        self.buffer.append(message)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        with open(self.path, "a") as f:
+            f.write("\n".join(self.buffer) + "\n")
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+def get_logger(path, enabled=True, buffer_size=256):
+    """
+    Devuelve un NullLogger si los logs están desactivados; si no, el
+    BufferedLogger compartido para ese fichero (uno por path y proceso).
+    """
+    if not enabled:
+        return NullLogger()
+    if path not in _loggers:
+        _loggers[path] = BufferedLogger(path, buffer_size=buffer_size)
+    return _loggers[path]
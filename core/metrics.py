@@ -0,0 +1,118 @@
+"""
+Métricas de entrenamiento con una API común `log_scalar(tag, value, step)`.
+
+Los valores se acumulan en memoria y se escriben en bloques:
+  - "jsonl": una línea JSON por valor ({"tag", "value", "step", "time"})
+  - "csv": tag,value,step,time
+  - "tensorboard": SummaryWriter, que solo se importa al crear este backend
+"""
+import atexit
+import csv
+from abc import ABC, abstractmethod
+import json
+import os
+import time
+
+BACKENDS = ("jsonl", "csv", "tensorboard")
+
+
+class NullMetrics:
+    """Métricas desactivadas: log_scalar no hace nada."""
+    enabled = False
+
+    def log_scalar(self, tag, value, step):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BufferedMetrics(ABC):
+    """Acumula (tag, value, step, time) y los vuelca al backend cada `buffer_size` valores."""
+    enabled = True
+
+    def __init__(self, buffer_size=1024):
+        self.buffer_size = buffer_size
+        self.buffer = []
+        atexit.register(self.flush)
+
+    def log_scalar(self, tag, value, step):
+        self.buffer.append((tag, float(value), int(step), time.time()))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        self._write(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+    @abstractmethod
+    def _write(self, rows):
+        """Escribe en el backend las filas (tag, value, step, time) acumuladas."""
+        pass
+
+
+class JsonlMetrics(BufferedMetrics):
+    def __init__(self, path, buffer_size=1024):
+        super().__init__(buffer_size)
+        self.path = path
+
+    def _write(self, rows):
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps({"tag": t, "value": v, "step": s, "time": w}) + "\n" for t, v, s, w in rows)
+
+
+class CsvMetrics(BufferedMetrics):
+    def __init__(self, path, buffer_size=1024):
+        super().__init__(buffer_size)
+        self.path = path
+        if not os.path.exists(path):
+            with open(path, "w", newline="") as f:
+                csv.writer(f).writerow(["tag", "value", "step", "time"])
+
+    def _write(self, rows):
+        with open(self.path, "a", newline="") as f:
+            csv.writer(f).writerows(rows)
+
+
+class TensorBoardMetrics(BufferedMetrics):
+    def __init__(self, log_dir=None, buffer_size=1024):
+        super().__init__(buffer_size)
+        from torch.utils.tensorboard import SummaryWriter
+        self.writer = SummaryWriter(log_dir)
+
+    def _write(self, rows):
+        for tag, value, step, wall_time in rows:
+            self.writer.add_scalar(tag, value, step, walltime=wall_time)
+        self.writer.flush()
+
+    def close(self):
+        super().close()
+        self.writer.close()
+
+
+def create_metrics(backend="jsonl", log_dir="runs", enabled=True, buffer_size=1024):
+    """
+    Crea el sink de métricas de una ejecución dentro de `log_dir`
+    (NullMetrics si están desactivadas o `backend` es None).
+    """
+    if not enabled or backend is None:
+        return NullMetrics()
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de métricas desconocido: {backend}")
+
+    run_dir = os.path.join(log_dir, time.strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(run_dir, exist_ok=True)
+    if backend == "tensorboard":
+        return TensorBoardMetrics(run_dir, buffer_size=buffer_size)
+    if backend == "csv":
+        return CsvMetrics(os.path.join(run_dir, "metrics.csv"), buffer_size=buffer_size)
+    return JsonlMetrics(os.path.join(run_dir, "metrics.jsonl"), buffer_size=buffer_size)
@@ -0,0 +1,266 @@
+"""
+Perfilado de los scripts con --profile, sin tocar el código del trabajo.
+
+  - cprofile (por defecto): perfilador determinista (cProfile). Guarda
+    profile.prof (legible con pstats o snakeviz) y top.txt con las N
+    funciones más caras.
+  - sample (--profiler sample): muestreo periódico de la pila de todos los
+    hilos, con mucho menos overhead; ve también los hilos de partida de
+    play.py, que cProfile no ve.
+    Guarda samples.folded (formato de flamegraph.pl/speedscope) y top.txt.
+  - --profile-torch: además, traza del profiler de torch (torch_trace.json,
+    para chrome://tracing o Perfetto) y tabla de operadores en torch_top.txt.
+
+Con --profile-window INICIO FIN solo se perfila esa ventana: los bucles de
+entrenamiento y de partidas llaman a step(índice) en cada episodio/partida y
+el perfilador se activa al llegar a INICIO y se para al llegar a FIN. Sin
+ventana se perfila la ejecución completa. Solo se perfila el proceso principal
+(no los workers de los pools).
+"""
+import collections
+import contextlib
+import io
+import os
+import signal
+import sys
+import threading
+import time
+
+PROFILE_DIR = "profiles"
+SAMPLE_INTERVAL = 0.005  # segundos entre muestras del perfilador por muestreo
+
+_active = None
+
+
+def step(index):
+    """Marca el episodio/partida `index` para la ventana del perfilador activo (si lo hay)."""
+    if _active is not None:
+        _active.step(index)
+
+
+class SamplingProfiler:
+    """
+    Muestrea la pila de todos los hilos cada `interval` segundos de CPU.
+    En Unix usa SIGPROF (las muestras caen donde se gasta CPU, no donde se
+    suelta el GIL); si no, un hilo aparte que muestrea por tiempo real.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._previous_handler = None
+        self.use_signal = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    def enable(self):
+        if self.use_signal:
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+
+    def disable(self):
+        if self.use_signal:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _on_signal(self, signum, frame):
+        self._sample()
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        own = threading.get_ident() if not self.use_signal else None
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            if self.use_signal and thread_id == threading.main_thread().ident:
+                frame = frame.f_back  # se saltan los marcos de _sample y _on_signal
+                frame = frame.f_back if frame is not None else None
+            # Se descartan los hilos parados en esperas (monitor de tqdm, colas...)
+            if frame is None or frame.f_code.co_filename == threading.__file__:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def write_folded(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def report(self, top):
+        total = sum(self.stacks.values())
+        own, cumulative = collections.Counter(), collections.Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                cumulative[function] += count
+
+        lines = [f"{total} muestras cada {1000 * self.interval:.0f} ms de CPU"]
+        for title, counter in (("propio", own), ("acumulado", cumulative)):
+            lines.append(f"\nTop {top} por tiempo {title}:")
+            for function, count in counter.most_common(top):
+                lines.append(f"  {100 * count / max(total, 1):6.2f}%  {count:8d}  {function}")
+        return "\n".join(lines) + "\n"
+
+
+class Profiler:
+    """
+    Contexto que perfila el bloque (o solo la ventana [start, stop) de step())
+    y al salir escribe los ficheros de estadísticas en `out_dir`.
+    """
+
+    def __init__(self, out_dir, mode="cprofile", top=30, window=None, torch_trace=False,
+                 interval=SAMPLE_INTERVAL):
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"Perfilador desconocido: {mode}")
+        if window is not None and window[0] >= window[1]:
+            raise ValueError("La ventana de perfilado debe cumplir INICIO < FIN")
+        self.out_dir = out_dir
+        self.mode = mode
+        self.top = top
+        self.window = window
+        self.torch_trace = torch_trace
+        self.interval = interval
+        self.profiler = None
+        self.torch_profiler = None
+        self.running = False
+        self.done = False
+        self.elapsed = 0.0
+        self._started = None
+
+    def start(self):
+        if self.running or self.done:
+            return
+        if self.profiler is None:
+            if self.mode == "cprofile":
+                import cProfile  # cProfile y pstats solo al perfilar: no pesan en el arranque
+
+                self.profiler = cProfile.Profile()
+            else:
+                self.profiler = SamplingProfiler(self.interval)
+        if self.torch_trace:
+            import torch  # solo si se pide la traza de torch
+
+            self.torch_profiler = torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU])
+            self.torch_profiler.__enter__()
+        self._started = time.perf_counter()
+        self.profiler.enable()
+        self.running = True
+
+    def stop(self):
+        if not self.running:
+            return
+        self.profiler.disable()
+        self.elapsed += time.perf_counter() - self._started
+        if self.torch_profiler is not None:
+            self.torch_profiler.__exit__(None, None, None)
+        self.running = False
+        self.done = True
+
+    def step(self, index):
+        if self.window is None:
+            return
+        start, stop = self.window
+        if start <= index < stop:
+            self.start()
+        elif index >= stop:
+            self.stop()
+
+    def __enter__(self):
+        global _active
+        _active = self
+        if self.window is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = None
+        self.stop()
+        self.write()
+        return False
+
+    def write(self):
+        """Escribe las estadísticas y el informe top-N; devuelve las rutas creadas."""
+        if self.profiler is None:
+            print(f"[PERF] La ventana de perfilado {self.window} no llegó a abrirse; nada que guardar")
+            return []
+        os.makedirs(self.out_dir, exist_ok=True)
+        paths = []
+
+        if self.mode == "cprofile":
+            import pstats
+
+            stats_path = os.path.join(self.out_dir, "profile.prof")
+            self.profiler.dump_stats(stats_path)
+            buffer = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=buffer).strip_dirs()
+            for order in ("cumulative", "tottime"):
+                buffer.write(f"\nTop {self.top} por {order}:\n")
+                stats.sort_stats(order).print_stats(self.top)
+            report = buffer.getvalue()
+        else:
+            stats_path = os.path.join(self.out_dir, "samples.folded")
+            self.profiler.write_folded(stats_path)
+            report = self.profiler.report(self.top)
+        paths.append(stats_path)
+
+        window = f"ventana {self.window[0]}-{self.window[1]}, " if self.window else ""
+        report_path = os.path.join(self.out_dir, "top.txt")
+        with open(report_path, "w") as f:
+            f.write(f"{self.mode}: {window}{self.elapsed:.1f}s perfilados\n{report}")
+        paths.append(report_path)
+
+        if self.torch_profiler is not None:
+            trace_path = os.path.join(self.out_dir, "torch_trace.json")
+            self.torch_profiler.export_chrome_trace(trace_path)
+            table = self.torch_profiler.key_averages().table(sort_by="self_cpu_time_total", row_limit=self.top)
+            with open(os.path.join(self.out_dir, "torch_top.txt"), "w") as f:
+                f.write(table)
+            paths += [trace_path, os.path.join(self.out_dir, "torch_top.txt")]
+
+        print(f"[PERF] Perfil ({self.mode}, {window}{self.elapsed:.1f}s) guardado en {self.out_dir}:")
+        print(report)
+        return paths
+
+
+def add_profile_args(parser):
+    """Añade las opciones --profile* comunes a un script."""
+    group = parser.add_argument_group("perfilado")
+    group.add_argument("--profile", action="store_true", help="perfila la ejecución")
+    group.add_argument("--profiler", choices=["cprofile", "sample"], default="cprofile",
+                       help="cprofile: determinista; sample: por muestreo, con menos overhead")
+    group.add_argument("--profile-window", nargs=2, type=int, metavar=("INICIO", "FIN"), default=None,
+                       help="perfila solo los episodios/partidas en [INICIO, FIN)")
+    group.add_argument("--profile-out", default=None,
+                       help=f"directorio de salida (por defecto {PROFILE_DIR}/<script>-<fecha>)")
+    group.add_argument("--profile-top", type=int, default=30, help="funciones en el informe top-N")
+    group.add_argument("--profile-torch", action="store_true",
+                       help="guarda también una traza del profiler de torch (pasos de entrenamiento)")
+
+
+def profile_from_args(args, name):
+    """Contexto de perfilado según las opciones de add_profile_args (nulo sin --profile)."""
+    if not args.profile and not args.profile_torch:
+        return contextlib.nullcontext()
+    out_dir = args.profile_out or os.path.join(PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+    return Profiler(out_dir, mode=args.profiler, top=args.profile_top,
+                    window=tuple(args.profile_window) if args.profile_window else None,
+                    torch_trace=args.profile_torch)
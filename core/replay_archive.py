@@ -0,0 +1,384 @@
+"""
+Archivo binario de replays: muchas partidas en un único fichero, con un byte
+por jugada y un índice de offsets para acceder a la partida k en O(1).
+
+Fichero `<nombre>.replays`:
+  - cabecera (8 bytes): MAGIC, versión (u8), tamaño del tablero (u8), 2 bytes reservados
+  - una entrada por partida, añadida al final:
+      u8 nº de jugadores, y por jugador: u8 longitud + nombre en utf-8
+      u16 nº de jugadas, y por jugada 1 byte: (jugador << 4) | casilla
+      i8 ganador (-1 = empate / sin ganador)
+Fichero `<nombre>.replays.idx`: offset (u64) del comienzo de cada partida.
+
+Los dos ficheros se escriben por separado, así que un proceso matado puede
+dejarlos descuadrados (entradas del índice más allá del final, partidas sin
+indexar o media partida al final). Al abrir el archivo se comprueba que el
+índice cuadra con los datos: el lector corrige los offsets en memoria sin
+tocar el disco y el escritor, antes de añadir partidas, reescribe el .idx y
+descarta la partida a medias.
+
+Las recompensas y las métricas no se guardan: se recalculan rejugando la
+partida cuando se convierte al formato JSON de ui/replay_viewer.py.
+"""
+import argparse
+import json
+import os
+import struct
+import numpy as np
+
+MAGIC = b"GRPL"
+VERSION = 1
+HEADER = struct.Struct("<4sBBH")
+INDEX_DTYPE = np.dtype("<u8")
+
+
+def index_path(path):
+    return f"{path}.idx"
+
+
+def encode_game(players, moves, winner=None, board_size=3):
+    """Codifica una partida: `moves` es una lista de (jugador, (fila, columna))."""
+    record = bytearray([len(players)])
+    for name in players:
+        encoded = str(name).encode("utf-8")[:255]
+        record.append(len(encoded))
+        record += encoded
+    record += struct.pack("<H", len(moves))
+    record += bytes((player << 4) | (i * board_size + j) for player, (i, j) in moves)
+    record += struct.pack("<b", -1 if winner is None else winner)
+    return bytes(record)
+
+
+def decode_game(record, board_size=3):
+    """Inversa de encode_game(): devuelve {"players", "moves", "winner"}."""
+    pos = 1
+    players = []
+    for _ in range(record[0]):
+        length = record[pos]
+        players.append(record[pos + 1:pos + 1 + length].decode("utf-8", errors="ignore"))
+        pos += 1 + length
+    num_moves, = struct.unpack_from("<H", record, pos)
+    pos += 2
+    moves = [(b >> 4, divmod(b & 0x0F, board_size)) for b in record[pos:pos + num_moves]]
+    winner, = struct.unpack_from("<b", record, pos + num_moves)
+    return {"players": players, "moves": moves, "winner": None if winner < 0 else winner}
+
+
+class ReplayArchiveWriter:
+    """
+    Añade partidas a un archivo de replays (lo crea si no existe).
+    Cada partida se escribe en cuanto termina, así que se puede usar en
+    streaming desde GameEngine o versus.py sin acumular nada en memoria.
+    """
+    def __init__(self, path, board_size=3):
+        self.path = path
+        self.board_size = board_size
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            repair_index(path)
+        self.data = open(path, "ab")
+        self.index = open(index_path(path), "ab")
+        if self.data.tell() == 0:
+            self.data.write(HEADER.pack(MAGIC, VERSION, board_size, 0))
+
+    def write_game(self, players, moves, winner=None):
+        offset = self.data.tell()
+        self.data.write(encode_game(players, moves, winner, self.board_size))
+        # Datos antes que índice: si se mata el proceso, como mucho quedan partidas sin indexar
+        self.data.flush()
+        self.index.write(struct.pack("<Q", offset))
+        self.index.flush()
+
+    def flush(self):
+        self.data.flush()
+        self.index.flush()
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayArchive:
+    """Lectura de un archivo de replays: len(archive) partidas y archive[k] en O(1)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        magic, version, self.board_size, _ = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} no es un archivo de replays válido")
+        # Solo lectura: si el índice no cuadra se corrige en memoria (self.size = final de la última partida)
+        self.offsets, self.size = load_offsets(path)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        start = int(self.offsets[k])
+        end = int(self.offsets[k + 1]) if k + 1 < len(self) else self.size
+        self.file.seek(start)
+        return decode_game(self.file.read(end - start), self.board_size)
+
+    def __iter__(self):
+        return (self[k] for k in range(len(self)))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplaySummary:
+    """
+    Resumen de todas las partidas de un archivo (nº de jugadas, ganador y
+    jugadores) calculado con NumPy sobre el fichero mapeado en memoria, sin
+    decodificar partida a partida. Sirve para filtrar decenas de miles de
+    partidas y cargar solo la que se selecciona.
+    """
+    CHUNK = 65536
+
+    def __init__(self, archive):
+        self.names = []
+        codes = {}
+        size = len(archive)
+        self.num_moves = np.zeros(size, dtype=np.int32)
+        self.winner = np.full(size, -1, dtype=np.int8)
+        self.players = np.full((size, 0), -1, dtype=np.int32)
+        if not size:
+            return
+
+        data = np.memmap(archive.path, dtype=np.uint8, mode="r")
+        offsets = archive.offsets.astype(np.int64)
+        max_players = int(data[offsets].max())
+        self.players = np.full((size, max_players), -1, dtype=np.int32)
+        for start in range(0, size, self.CHUNK):
+            rows = slice(start, start + self.CHUNK)
+            self._summarize(data, offsets[rows], rows, max_players, codes)
+
+    def _summarize(self, data, offsets, rows, max_players, codes):
+        num_players = data[offsets]
+        pos = offsets + 1
+        name_pos = np.zeros((len(offsets), max_players), dtype=np.int64)
+        name_len = np.zeros((len(offsets), max_players), dtype=np.int64)
+        for p in range(max_players):
+            has = p < num_players
+            length = np.where(has, data[np.minimum(pos, len(data) - 1)], 0)
+            name_pos[:, p], name_len[:, p] = pos + 1, length
+            pos = np.where(has, pos + 1 + length, pos)
+
+        num_moves = data[pos].astype(np.int32) | (data[pos + 1].astype(np.int32) << 8)
+        self.num_moves[rows] = num_moves
+        self.winner[rows] = data[pos + 2 + num_moves].view(np.int8)
+
+        # Nombres como filas de bytes de ancho fijo: se decodifica solo cada nombre distinto
+        width = max(int(name_len.max()), 1)
+        cols = np.arange(width)
+        raw = data[np.minimum(name_pos[..., None] + cols, len(data) - 1)]
+        raw = np.ascontiguousarray(np.where(cols < name_len[..., None], raw, 0).reshape(-1, width))
+        unique, inverse = np.unique(raw.view(f"S{width}").ravel(), return_inverse=True)
+        unique_codes = []
+        for name_bytes in unique:
+            name = name_bytes.rstrip(b"\0").decode("utf-8", errors="ignore")
+            if name not in codes:
+                codes[name] = len(self.names)
+                self.names.append(name)
+            unique_codes.append(codes[name])
+        players = np.asarray(unique_codes, dtype=np.int32)[inverse.reshape(-1)].reshape(len(offsets), max_players)
+        self.players[rows] = np.where(np.arange(max_players) < num_players[:, None], players, -1)
+
+    def __len__(self):
+        return len(self.num_moves)
+
+    def winner_codes(self):
+        """Código del nombre del ganador de cada partida (-1 = empate)."""
+        seats = np.maximum(self.winner, 0).astype(np.int64)
+        codes = self.players[np.arange(len(self)), seats] if len(self) else self.winner.astype(np.int32)
+        return np.where(self.winner >= 0, codes, -1)
+
+    def select(self, winner=None, agent=None, min_moves=None, max_moves=None):
+        """
+        Índices de las partidas que cumplen los filtros. `winner` y `agent` son
+        nombres de jugador (winner="draw" para empates).
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if winner == "draw":
+            mask &= self.winner < 0
+        elif winner is not None:
+            code = self.names.index(winner) if winner in self.names else -2
+            mask &= self.winner_codes() == code
+        if agent is not None:
+            code = self.names.index(agent) if agent in self.names else -2
+            mask &= (self.players == code).any(axis=1)
+        if min_moves is not None:
+            mask &= self.num_moves >= min_moves
+        if max_moves is not None:
+            mask &= self.num_moves <= max_moves
+        return np.flatnonzero(mask)
+
+
+def _record_end(data, pos):
+    """Posición donde termina la partida que empieza en `pos`, o None si `data` se corta antes."""
+    n = len(data)
+    if pos >= n:
+        return None
+    num_players = data[pos]
+    pos += 1
+    for _ in range(num_players):
+        if pos >= n:
+            return None
+        pos += 1 + data[pos]
+    if pos + 2 > n:
+        return None
+    num_moves, = struct.unpack_from("<H", data, pos)
+    end = pos + 2 + num_moves + 1
+    return end if end <= n else None
+
+
+def _scan(data, pos):
+    """Offsets de las partidas completas de `data` desde `pos` y dónde termina la última."""
+    offsets = []
+    while (end := _record_end(data, pos)) is not None:
+        offsets.append(pos)
+        pos = end
+    return offsets, pos
+
+
+def load_offsets(path):
+    """
+    Offsets de las partidas completas del archivo y dónde termina la última,
+    sin escribir nada. Si el .idx cuadra con los datos (offsets crecientes y
+    la última partida indexada completa) solo se recorren las partidas del
+    final que falten en él; si no, se recorre el archivo entero.
+    """
+    idx = index_path(path)
+    indexed = np.zeros(0, dtype=INDEX_DTYPE)
+    if os.path.exists(idx):
+        indexed = np.fromfile(idx, dtype=INDEX_DTYPE, count=os.path.getsize(idx) // INDEX_DTYPE.itemsize)
+        if len(indexed) and not (indexed[0] >= HEADER.size and (np.diff(indexed.astype(np.int64)) > 0).all()):
+            indexed = indexed[:0]
+    start = int(indexed[-1]) if len(indexed) else HEADER.size
+    with open(path, "rb") as f:
+        f.seek(start)
+        tail, base = f.read(), start
+        if len(indexed) and _record_end(tail, 0) is None:
+            # La última partida indexada no está entera en el fichero: se recorre todo
+            indexed = indexed[:0]
+            f.seek(HEADER.size)
+            tail, base = f.read(), HEADER.size
+    offsets, end = _scan(tail, 0)
+    offsets = np.concatenate([indexed[:-1], np.array([base + o for o in offsets], dtype=INDEX_DTYPE)])
+    return offsets, base + end
+
+
+def rebuild_index(path):
+    """
+    Reconstruye el índice recorriendo el archivo (p. ej. si se perdió el .idx).
+    Una partida a medias al final no se indexa. Devuelve dónde termina la última completa.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    offsets, end = _scan(data, HEADER.size)
+    np.array(offsets, dtype=INDEX_DTYPE).tofile(index_path(path))
+    return end
+
+
+def repair_index(path):
+    """
+    Deja el .idx y los datos cuadrados antes de añadir partidas: reescribe el
+    índice si no coincide con load_offsets() y corta la partida a medias del final.
+    """
+    offsets, end = load_offsets(path)
+    idx = index_path(path)
+    if not os.path.exists(idx) or not np.array_equal(np.fromfile(idx, dtype=np.uint8), offsets.view(np.uint8)):
+        offsets.tofile(idx)
+    if end < os.path.getsize(path):
+        with open(path, "r+b") as f:
+            f.truncate(end)  # partida a medias de un proceso matado
+
+
+# ----------------------------------------------------------------------
+# Conversión desde/hacia el JSON de ui/replay_viewer.py
+# ----------------------------------------------------------------------
+
+def game_to_json(replay, game):
+    """
+    Convierte una partida del archivo al formato JSON de ReplayViewer.save_replay,
+    rejugándola en `game` para recalcular recompensas y métricas.
+    """
+    game.reset()
+    history = []
+    for player, action in replay["moves"]:
+        _, rewards, _ = game.step([(player, action)])
+        history.append({"player": replay["players"][player], "action": list(action), "reward": rewards[player]})
+    metrics = game.get_metrics() if hasattr(game, "get_metrics") else {}
+    metrics = {k: v.item() if hasattr(v, "item") else v for k, v in metrics.items()}
+    return {"history": history, "metrics": metrics}
+
+
+def json_to_game(data, players=None):
+    """
+    Inversa de game_to_json(): (jugadores, jugadas, ganador) a partir del JSON.
+    El jugador de cada jugada se identifica por su nombre, en orden de aparición.
+    """
+    players = list(players or [])
+    moves = []
+    for entry in data["history"]:
+        if entry["player"] not in players:
+            players.append(entry["player"])
+        moves.append((players.index(entry["player"]), tuple(entry["action"])))
+    winner = data.get("metrics", {}).get("Winner")
+    return players, moves, winner
+
+
+def export_json(archive_path, k, out_path, game):
+    with ReplayArchive(archive_path) as archive:
+        data = game_to_json(archive[k], game)
+    with open(out_path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def import_json(json_paths, archive_path):
+    with ReplayArchiveWriter(archive_path) as writer:
+        for json_path in json_paths:
+            with open(json_path) as f:
+                writer.write_game(*json_to_game(json.load(f)))
+
+
+if __name__ == "__main__":
+    from games.tic_tac_toe.game import TicTacToeGame
+
+    parser = argparse.ArgumentParser(description="Conversión entre replays JSON y archivos binarios")
+    sub = parser.add_subparsers(dest="command", required=True)
+    to_json = sub.add_parser("to-json", help="exporta la partida k de un archivo a JSON")
+    to_json.add_argument("archive")
+    to_json.add_argument("k", type=int)
+    to_json.add_argument("out")
+    from_json = sub.add_parser("from-json", help="añade replays JSON a un archivo")
+    from_json.add_argument("archive")
+    from_json.add_argument("json_files", nargs="+")
+    info = sub.add_parser("info", help="nº de partidas del archivo")
+    info.add_argument("archive")
+    args = parser.parse_args()
+
+    if args.command == "to-json":
+        export_json(args.archive, args.k, args.out, TicTacToeGame(num_players=2))
+    elif args.command == "from-json":
+        import_json(args.json_files, args.archive)
+    else:
+        with ReplayArchive(args.archive) as archive:
+            print(f"{args.archive}: {len(archive)} partidas")
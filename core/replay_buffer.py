@@ -0,0 +1,181 @@
+import contextlib
+import multiprocessing as mp
+import os
+import numpy as np
+
+# Campos de cada transición: (dtype numpy, código ctypes para RawArray, ancho)
+FIELDS = {
+    "boards": (np.int8, "b", "obs"),
+    "actions": (np.int64, "q", 1),
+    "rewards": (np.float32, "f", 1),
+    "next_boards": (np.int8, "b", "obs"),
+    "dones": (np.bool_, "B", 1),
+}
+
+
+class ReplayBuffer:
+    """
+    Memoria de experiencias circular guardada en arrays NumPy de tamaño fijo.
+    Los tableros se almacenan aplanados (int8) y las acciones como índice de casilla.
+    Cuando se llena, las nuevas transiciones sustituyen a las más antiguas.
+    """
+    def __init__(self, capacity, obs_size=9, board_size=3):
+        self.capacity = capacity
+        self.obs_size = obs_size
+        self.board_size = board_size
+        self.rng = np.random.default_rng()
+        self.lock = contextlib.nullcontext()
+        self.meta = np.zeros(2, dtype=np.int64)  # [posición de escritura, tamaño]
+        self.augment = None
+        for name, (dtype, _, width) in FIELDS.items():
+            setattr(self, name, np.zeros(self._shape(width), dtype=dtype))
+
+    def _shape(self, width):
+        return (self.capacity, self.obs_size) if width == "obs" else (self.capacity,)
+
+    def __len__(self):
+        return int(self.meta[1])
+
+    def append(self, state, action, reward, next_state, done):
+        """Añade una transición con estados en formato dict (API de los agentes)."""
+        self.add_batch(
+            np.asarray(state["board"]).reshape(1, -1),
+            np.array([action[0] * self.board_size + action[1]]),
+            np.array([reward]),
+            np.asarray(next_state["board"]).reshape(1, -1),
+            np.array([done]),
+        )
+
+    def add_batch(self, boards, actions, rewards, next_boards, dones):
+        """Añade N transiciones de golpe (arrays con N filas)."""
+        n = len(actions)
+        if n == 0:
+            return
+        with self.lock:
+            pos, size = int(self.meta[0]), int(self.meta[1])
+            idx = (pos + np.arange(n)) % self.capacity
+            self.boards[idx] = boards
+            self.actions[idx] = actions
+            self.rewards[idx] = rewards
+            self.next_boards[idx] = next_boards
+            self.dones[idx] = dones
+            self.meta[0] = (pos + n) % self.capacity
+            self.meta[1] = min(size + n, self.capacity)
+
+    def set_augmentation(self, permutations, mode="random"):
+        """
+        Activa el aumento de datos por simetrías en sample().
+        `permutations` (K, obs_size): nuevo[k] = original[perm[k]] para cada transformación.
+          - mode="random": una transformación aleatoria por transición muestreada
+          - mode="all": se muestrean batch_size / K transiciones y se devuelven sus K variantes
+        mode=None lo desactiva.
+        """
+        self.augment = mode
+        self.permutations = np.asarray(permutations)
+        self.inverse = np.argsort(self.permutations, axis=1)
+
+    def copy_augmentation(self, other):
+        """Usa la misma configuración de aumento de datos que la memoria `other`."""
+        if other.augment is not None:
+            self.set_augmentation(other.permutations, other.augment)
+
+    def sample(self, batch_size):
+        """Muestra uniforme sin reemplazo: (boards, actions, rewards, next_boards, dones)."""
+        num_transforms = len(self.permutations) if self.augment == "all" else 1
+        with self.lock:
+            count = min(len(self), max(1, batch_size // num_transforms))
+            idx = self.rng.choice(len(self), size=count, replace=False)
+            batch = (self.boards[idx], self.actions[idx], self.rewards[idx],
+                     self.next_boards[idx], self.dones[idx])
+        if self.augment is None:
+            return batch
+        return self.augment_batch(*batch)
+
+    def augment_batch(self, boards, actions, rewards, next_boards, dones):
+        """
+        Aplica las simetrías al lote con permutaciones de índices (sin bucles por
+        transición). También sirve para lotes que no salen de sample(), como los
+        del dataset de train-offline.
+        """
+        if self.augment == "all":
+            n, k = len(actions), len(self.permutations)
+            transforms = np.tile(np.arange(k), n)
+            boards, actions, rewards, next_boards, dones = (
+                np.repeat(a, k, axis=0) for a in (boards, actions, rewards, next_boards, dones))
+        else:
+            transforms = self.rng.integers(len(self.permutations), size=len(actions))
+
+        perms = self.permutations[transforms]
+        rows = np.arange(len(actions))[:, None]
+        return (boards[rows, perms], self.inverse[transforms, actions], rewards,
+                next_boards[rows, perms], dones)
+
+    def contents(self):
+        """Transiciones guardadas, de la más antigua a la más reciente."""
+        with self.lock:
+            pos, size = int(self.meta[0]), int(self.meta[1])
+            idx = (pos - size + np.arange(size)) % self.capacity
+            return (self.boards[idx], self.actions[idx], self.rewards[idx],
+                    self.next_boards[idx], self.dones[idx])
+
+    def clear(self):
+        with self.lock:
+            self.meta[:] = 0
+
+    def save(self, directory):
+        """Guarda cada campo como un .npy (reabrible con memory-map) en `directory`."""
+        os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            np.save(os.path.join(directory, "meta.npy"), self.meta)
+            for name in FIELDS:
+                np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def open(cls, directory, mmap_mode="c", board_size=3):
+        """
+        Reabre una memoria guardada con save() sin cargarla entera en RAM.
+        Con mmap_mode="c" (copy-on-write) se puede seguir escribiendo en ella
+        sin modificar los ficheros originales.
+        """
+        buffer = cls.__new__(cls)
+        buffer.rng = np.random.default_rng()
+        buffer.lock = contextlib.nullcontext()
+        buffer.board_size = board_size
+        buffer.augment = None
+        buffer.meta = np.load(os.path.join(directory, "meta.npy")).astype(np.int64)
+        for name in FIELDS:
+            setattr(buffer, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode))
+        buffer.capacity, buffer.obs_size = buffer.boards.shape
+        return buffer
+
+
+class SharedReplayBuffer(ReplayBuffer):
+    """
+    ReplayBuffer cuyos arrays viven en memoria compartida (multiprocessing.RawArray),
+    de modo que varios procesos (actores y learner) escriben y muestrean
+    sobre la misma memoria. Se pasa a los procesos hijos como argumento.
+    """
+    def __init__(self, capacity, obs_size=9, board_size=3):
+        self.capacity = capacity
+        self.obs_size = obs_size
+        self.board_size = board_size
+        self.lock = mp.Lock()
+        self.raw = {"meta": mp.RawArray("q", 2)}
+        for name, (_, ctype, width) in FIELDS.items():
+            self.raw[name] = mp.RawArray(ctype, int(np.prod(self._shape(width))))
+        self._attach()
+
+    def _attach(self):
+        self.rng = np.random.default_rng()
+        self.augment = None
+        self.meta = np.frombuffer(self.raw["meta"], dtype=np.int64)
+        for name, (dtype, _, width) in FIELDS.items():
+            setattr(self, name, np.frombuffer(self.raw[name], dtype=dtype).reshape(self._shape(width)))
+
+    def __getstate__(self):
+        return {"capacity": self.capacity, "obs_size": self.obs_size,
+                "board_size": self.board_size, "lock": self.lock, "raw": self.raw}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach()
@@ -0,0 +1,44 @@
+"""
+Test secuencial de razón de verosimilitudes (SPRT) sobre resultados
+victoria/empate/derrota, para cortar una evaluación en cuanto está decidida.
+
+H0: la puntuación esperada del candidato es la de `elo0`; H1: la de `elo1`
+(o directamente las puntuaciones `p0`/`p1`). El LLR usa la aproximación
+normal de la puntuación por partida (la habitual en pruebas de motores de
+ajedrez), que tiene en cuenta los empates.
+"""
+import math
+
+
+def elo_to_score(elo):
+    return 1.0 / (1.0 + 10 ** (-elo / 400))
+
+
+class SPRT:
+    def __init__(self, elo0=0.0, elo1=20.0, alpha=0.05, beta=0.05, p0=None, p1=None):
+        self.p0 = elo_to_score(elo0) if p0 is None else p0
+        self.p1 = elo_to_score(elo1) if p1 is None else p1
+        if not 0 < self.p0 < self.p1 < 1:
+            raise ValueError("SPRT: las hipótesis deben cumplir 0 < p0 < p1 < 1")
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    def llr(self, wins, losses, draws):
+        games = wins + losses + draws
+        if not games:
+            return 0.0
+        score = (wins + 0.5 * draws) / games
+        # Una victoria y una derrota virtuales en la varianza: si todas las partidas
+        # acaban igual (p. ej. solo victorias) la varianza observada sería 0
+        variance = ((wins + 1) * (1 - score) ** 2 + (losses + 1) * score ** 2
+                    + draws * (0.5 - score) ** 2) / (games + 2)
+        return games * (self.p1 - self.p0) * (2 * score - self.p0 - self.p1) / (2 * variance)
+
+    def status(self, wins, losses, draws):
+        """"H1" (el candidato es mejor), "H0" (no lo es) o None (seguir jugando)."""
+        llr = self.llr(wins, losses, draws)
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
@@ -0,0 +1,322 @@
+"""
+Torneo todos contra todos entre N agentes (versus.py --mode tournament).
+
+  - cada pareja juega lotes de partidas alternando quién empieza, repartidos
+    entre un pool de procesos
+  - cada lote terminado se añade a `results.jsonl` y tras cada ronda se
+    reescribe `standings.json`: un torneo a medias se puede consultar y, al
+    relanzarlo sobre el mismo directorio, continúa donde se quedó
+  - una pareja deja de recibir partidas en cuanto su resultado está decidido
+    (el intervalo de confianza de su puntuación no incluye 0.5 o ya es más
+    estrecho que `precision`), así que el tiempo de CPU va a las parejas dudosas
+  - ratings Elo (máxima verosimilitud) o Glicko-2 (una ronda = un periodo),
+    con intervalos de confianza al 95%
+"""
+import json
+import math
+import multiprocessing as mp
+import os
+import numpy as np
+from core.engine import GameEngine
+from games.tic_tac_toe.game import TicTacToeGame
+from core.agent_registry import load_agent, player_spec
+from core.base_agent import supports_compact_state
+
+RESULTS = "results.jsonl"
+STANDINGS = "standings.json"
+RATINGS = ("elo", "glicko")
+Z95 = 1.96
+
+INITIAL_RATING = 1000.0
+ELO_SCALE = 400 / math.log(10)
+ELO_PRIOR_DRAWS = 1.0  # empate virtual por pareja: evita ratings infinitos con 100% de victorias
+
+GLICKO_RATING = 1500.0
+GLICKO_RD = 350.0
+GLICKO_VOLATILITY = 0.06
+GLICKO_TAU = 0.5
+GLICKO_SCALE = 173.7178
+
+
+# ----------------------------------------------------------------------
+# Ratings
+# ----------------------------------------------------------------------
+
+def pair_score(wins_a, wins_b, draws):
+    """Puntuación media de `a` (victoria 1, empate 0.5) y semiancho de su intervalo al 95%."""
+    games = wins_a + wins_b + draws
+    if not games:
+        return 0.5, 0.5
+    p = (wins_a + 0.5 * draws) / games
+    variance = (wins_a * (1 - p) ** 2 + wins_b * p ** 2 + draws * (0.5 - p) ** 2) / games
+    return p, Z95 * math.sqrt(variance / games)
+
+
+def fit_elo(names, results, prior_draws=ELO_PRIOR_DRAWS, iterations=50):
+    """
+    Elo por máxima verosimilitud (Bradley-Terry) con todos los resultados a la vez.
+    `results`: {(a, b): [victorias a, victorias b, empates]}. Devuelve {nombre: (rating, ic95)}.
+    """
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    score = np.zeros((n, n))
+    games = np.zeros((n, n))
+    for (a, b), (wins_a, wins_b, draws) in results.items():
+        if not wins_a + wins_b + draws:
+            continue
+        i, j = index[a], index[b]
+        score[i, j] += wins_a + 0.5 * (draws + prior_draws)
+        score[j, i] += wins_b + 0.5 * (draws + prior_draws)
+        games[i, j] = games[j, i] = games[i, j] + wins_a + wins_b + draws + prior_draws
+
+    # Newton sobre r (en unidades naturales); la media se fija a 0
+    r = np.zeros(n)
+    for _ in range(iterations):
+        expected = 1.0 / (1.0 + np.exp(r[None, :] - r[:, None]))
+        gradient = (score - games * expected).sum(axis=1)
+        weights = games * expected * (1 - expected)
+        information = np.diag(weights.sum(axis=1)) - weights
+        covariance = np.linalg.pinv(information)
+        step = covariance @ gradient
+        r += step
+        r -= r.mean()
+        if np.abs(step).max() < 1e-9:
+            break
+
+    errors = np.sqrt(np.maximum(np.diag(covariance), 0))
+    return {name: (INITIAL_RATING + ELO_SCALE * r[i], Z95 * ELO_SCALE * errors[i]) for name, i in index.items()}
+
+
+def _glicko_volatility(phi, sigma, v, delta, tau):
+    """Nueva volatilidad (paso 5 de Glicko-2, método de Illinois)."""
+    a = math.log(sigma ** 2)
+
+    def f(x):
+        ex = math.exp(x)
+        return ex * (delta ** 2 - phi ** 2 - v - ex) / (2 * (phi ** 2 + v + ex) ** 2) - (x - a) / tau ** 2
+
+    A = a
+    if delta ** 2 > phi ** 2 + v:
+        B = math.log(delta ** 2 - phi ** 2 - v)
+    else:
+        k = 1
+        while f(a - k * tau) < 0:
+            k += 1
+        B = a - k * tau
+    fA, fB = f(A), f(B)
+    while abs(B - A) > 1e-6:
+        C = A + (A - B) * fA / (fB - fA)
+        fC = f(C)
+        if fC * fB <= 0:
+            A, fA = B, fB
+        else:
+            fA /= 2
+        B, fB = C, fC
+    return math.exp(A / 2)
+
+
+def fit_glicko2(names, periods, tau=GLICKO_TAU):
+    """
+    Glicko-2 aplicando los periodos en orden (cada uno, {(a, b): [victorias a, victorias b, empates]}).
+    Devuelve {nombre: (rating, ic95)}.
+    """
+    state = {name: (0.0, GLICKO_RD / GLICKO_SCALE, GLICKO_VOLATILITY) for name in names}
+    for period in periods:
+        opponents = {name: [] for name in names}
+        for (a, b), (wins_a, wins_b, draws) in period.items():
+            games = wins_a + wins_b + draws
+            opponents[a].append((b, wins_a + 0.5 * draws, games))
+            opponents[b].append((a, wins_b + 0.5 * draws, games))
+
+        updated = {}
+        for name, (mu, phi, sigma) in state.items():
+            if not opponents[name]:
+                updated[name] = (mu, math.sqrt(phi ** 2 + sigma ** 2), sigma)
+                continue
+            v_inv = improvement = 0.0
+            for opponent, score, games in opponents[name]:
+                mu_j, phi_j, _ = state[opponent]
+                g = 1 / math.sqrt(1 + 3 * phi_j ** 2 / math.pi ** 2)
+                expected = 1 / (1 + math.exp(-g * (mu - mu_j)))
+                v_inv += games * g ** 2 * expected * (1 - expected)
+                improvement += g * (score - games * expected)
+            v = 1 / v_inv
+            sigma = _glicko_volatility(phi, sigma, v, v * improvement, tau)
+            phi = 1 / math.sqrt(1 / (phi ** 2 + sigma ** 2) + 1 / v)
+            updated[name] = (mu + phi ** 2 * improvement, phi, sigma)
+        state = updated
+
+    return {name: (GLICKO_RATING + GLICKO_SCALE * mu, Z95 * GLICKO_SCALE * phi)
+            for name, (mu, phi, _) in state.items()}
+
+
+# ----------------------------------------------------------------------
+# Partidas
+# ----------------------------------------------------------------------
+
+def play_batch(agent_a, agent_b, games):
+    """Juega `games` partidas alternando quién empieza. Devuelve (victorias a, victorias b, empates)."""
+    results = [0, 0, 0]
+    compact = supports_compact_state([agent_a, agent_b])  # solo si ambos lo admiten
+    for g in range(games):
+        seats = [agent_a, agent_b] if g % 2 == 0 else [agent_b, agent_a]
+        winner = GameEngine(TicTacToeGame(num_players=2, compact=compact), seats).run()
+        results[2 if winner is None else (0 if seats[winner] is agent_a else 1)] += 1
+    return results
+
+
+_agents = {}
+
+
+def _build_agent(player):
+    """Agente de la configuración `player`, creado una sola vez por proceso."""
+    key = json.dumps(player, sort_keys=True)
+    if key not in _agents:
+        _agents[key] = load_agent(player_spec(player))(player["name"], **player["params"])
+    return _agents[key]
+
+
+def _batch_worker(task):
+    a, b, games = task
+    return a["name"], b["name"], play_batch(_build_agent(a), _build_agent(b), games)
+
+
+class Tournament:
+    def __init__(self, players, out_dir, rating="elo", batch_games=20, min_games=40, max_games=400,
+                 precision=0.05):
+        if rating not in RATINGS:
+            raise ValueError(f"Rating no soportado: {rating}")
+        names = [p["name"] for p in players]
+        if len(set(names)) != len(names) or len(names) < 2:
+            raise ValueError("El torneo necesita al menos dos jugadores con nombres distintos")
+
+        self.players = {p["name"]: p for p in players}
+        self.names = names
+        self.out_dir = out_dir
+        self.rating = rating
+        self.batch_games = batch_games + batch_games % 2  # par: mismas partidas empezando cada uno
+        self.min_games = min_games
+        self.max_games = max_games
+        self.precision = precision
+        self.results = {(a, b): [0, 0, 0] for i, a in enumerate(names) for b in names[i + 1:]}
+        self.periods = []
+        os.makedirs(out_dir, exist_ok=True)
+        self.load()
+
+    @property
+    def results_path(self):
+        return os.path.join(self.out_dir, RESULTS)
+
+    def load(self):
+        """
+        Recupera los lotes ya jugados de `results.jsonl` (torneo interrumpido).
+        Una última línea a medias (corte durante la escritura) se descarta del fichero.
+        """
+        if not os.path.exists(self.results_path):
+            return
+        valid = 0
+        with open(self.results_path, "rb") as f:
+            for line in f:
+                try:
+                    r = json.loads(line) if line.strip() else None
+                except json.JSONDecodeError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                valid += len(line)
+                if r is not None:
+                    self._add(r["round"], r["a"], r["b"], [r["wins_a"], r["wins_b"], r["draws"]])
+        if valid < os.path.getsize(self.results_path):
+            with open(self.results_path, "r+b") as f:
+                f.truncate(valid)
+
+    def _add(self, round_idx, a, b, outcome):
+        if (a, b) not in self.results:
+            a, b, outcome = b, a, [outcome[1], outcome[0], outcome[2]]
+        while len(self.periods) <= round_idx:
+            self.periods.append({})
+        for totals in (self.results[(a, b)], self.periods[round_idx].setdefault((a, b), [0, 0, 0])):
+            for i, n in enumerate(outcome):
+                totals[i] += n
+
+    def record(self, log, round_idx, a, b, outcome):
+        self._add(round_idx, a, b, outcome)
+        log.write(json.dumps({"round": round_idx, "a": a, "b": b, "wins_a": outcome[0],
+                              "wins_b": outcome[1], "draws": outcome[2]}) + "\n")
+        log.flush()
+
+    def decided(self, pair):
+        wins = self.results[pair]
+        games = sum(wins)
+        if games >= self.max_games:
+            return True
+        if games < self.min_games:
+            return False
+        p, half_width = pair_score(*wins)
+        return abs(p - 0.5) > half_width or half_width <= self.precision
+
+    def pending(self):
+        return [pair for pair in self.results if not self.decided(pair)]
+
+    def ratings(self):
+        if self.rating == "glicko":
+            return fit_glicko2(self.names, self.periods)
+        return fit_elo(self.names, self.results)
+
+    def standings(self):
+        ratings = self.ratings()
+        games = {name: 0 for name in self.names}
+        for (a, b), wins in self.results.items():
+            games[a] += sum(wins)
+            games[b] += sum(wins)
+        return sorted(({"name": name, "rating": rating, "ci95": ci, "games": games[name]}
+                       for name, (rating, ci) in ratings.items()), key=lambda row: -row["rating"])
+
+    def save_standings(self):
+        pairs = []
+        for (a, b), wins in self.results.items():
+            score, half_width = pair_score(*wins)
+            pairs.append({"a": a, "b": b, "wins_a": wins[0], "wins_b": wins[1], "draws": wins[2],
+                          "score": score, "ci95": half_width, "decided": self.decided((a, b))})
+        state = {"rating": self.rating, "rounds": len(self.periods),
+                 "standings": self.standings(), "pairs": pairs}
+        path = os.path.join(self.out_dir, STANDINGS)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def print_table(self):
+        total = sum(sum(w) for w in self.results.values())
+        print(f"\n--- TOURNAMENT {self.rating.upper()} ({total} partidas, {len(self.periods)} rondas) ---")
+        for row in self.standings():
+            print(f"  {row['name']:<24} {row['rating']:7.1f} ± {row['ci95']:5.1f}  ({row['games']} partidas)")
+
+    def run(self, workers=1):
+        """Juega rondas de lotes hasta que todas las parejas estén decididas."""
+        pool = None
+        if workers > 1:
+            # spawn: cada worker carga sus agentes una vez y los reutiliza en todos sus lotes
+            pool = mp.get_context("spawn").Pool(workers)
+        try:
+            with open(self.results_path, "a") as log:
+                while True:
+                    pairs = self.pending()
+                    if not pairs:
+                        break
+                    round_idx = len(self.periods)
+                    tasks = [(self.players[a], self.players[b],
+                              min(self.batch_games, self.max_games - sum(self.results[(a, b)])))
+                             for a, b in pairs]
+                    outcomes = pool.imap_unordered(_batch_worker, tasks) if pool else map(_batch_worker, tasks)
+                    for a, b, outcome in outcomes:
+                        self.record(log, round_idx, a, b, outcome)
+                    self.save_standings()
+                    print(f"[TOURNAMENT] Ronda {round_idx}: {len(pairs)} parejas jugadas, "
+                          f"{len(self.pending())} sin decidir")
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+        self.save_standings()
+        self.print_table()
+        return self.standings()
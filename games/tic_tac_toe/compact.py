@@ -0,0 +1,104 @@
+"""
+Estado compacto del tres en raya: dos máscaras de 9 bits (mis fichas y las
+del rival, bit 3*fila+columna) y el jugador.
+
+Los estados son inmutables y se internan (un único objeto por posición y
+jugador), así que pedir el estado en cada jugada no reserva memoria una vez
+vista la posición, y el propio estado (o `state.key`) sirve de clave en
+cachés y tablas. El tablero en array (1 = mías, -1 = rival) solo se calcula
+si un agente lo pide con state["board"], y se guarda en el propio estado.
+"""
+import numpy as np
+from games.tic_tac_toe.lines import LINES, NUM_CELLS
+
+CELL_BITS = 1 << np.arange(NUM_CELLS)
+# Índice en base 3 (el de MyTicTacToeAgent: (tablero + 1) · 3^k) a partir de las máscaras
+MASK_BASE3 = np.array([sum(3 ** k for k in range(NUM_CELLS) if mask >> k & 1)
+                       for mask in range(1 << NUM_CELLS)], dtype=np.int64).tolist()
+EMPTY_BASE3 = sum(3 ** k for k in range(NUM_CELLS))
+FULL_MASK = (1 << NUM_CELLS) - 1
+# Máscara de cada fila, columna y diagonal
+LINE_MASKS = [sum(1 << int(cell) for cell in line) for line in LINES]
+
+
+def mask_winner(masks):
+    """Índice del jugador con una línea completa en sus máscaras, o None."""
+    for player, mask in enumerate(masks):
+        for line in LINE_MASKS:
+            if mask & line == line:
+                return player
+    return None
+
+
+class CompactState:
+    __slots__ = ("mine", "theirs", "player_id", "_board", "_features")
+
+    def __init__(self, mine, theirs, player_id):
+        self.mine = mine
+        self.theirs = theirs
+        self.player_id = player_id
+        self._board = None
+        self._features = None
+
+    @property
+    def key(self):
+        """Entero de 18 bits con las dos máscaras (no incluye el jugador)."""
+        return (self.mine << NUM_CELLS) | self.theirs
+
+    @property
+    def base3(self):
+        return EMPTY_BASE3 + MASK_BASE3[self.mine] - MASK_BASE3[self.theirs]
+
+    @property
+    def board(self):
+        """Tablero normalizado 3x3 (solo lectura: el estado es compartido)."""
+        if self._board is None:
+            board = ((self.mine & CELL_BITS) > 0).astype(int) - ((self.theirs & CELL_BITS) > 0)
+            board = board.reshape(3, 3)
+            board.flags.writeable = False
+            self._board = board
+        return self._board
+
+    @property
+    def features(self):
+        """Tablero aplanado en float32, la entrada de las redes DQN."""
+        if self._features is None:
+            # Escribible para que torch.from_numpy no avise; nadie debe modificarlo
+            self._features = self.board.reshape(-1).astype(np.float32)
+        return self._features
+
+    # Misma interfaz que el dict de get_state()
+    def __getitem__(self, name):
+        if name == "board":
+            return self.board
+        if name == "player_id":
+            return self.player_id
+        raise KeyError(name)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"CompactState(mine={self.mine:#05x}, theirs={self.theirs:#05x}, player_id={self.player_id})"
+
+
+_states = {}
+
+
+def compact_state(mine, theirs, player_id):
+    """Estado internado: siempre el mismo objeto para las mismas máscaras y jugador."""
+    code = (((mine << NUM_CELLS) | theirs) << 4) | player_id
+    state = _states.get(code)
+    if state is None:
+        state = _states[code] = CompactState(mine, theirs, player_id)
+    return state
+
+
+def board_features(state):
+    """Tablero aplanado en float32 de un estado compacto o de un dict de get_state()."""
+    if isinstance(state, CompactState):
+        return state.features
+    return np.asarray(state["board"], dtype=np.float32).reshape(-1)
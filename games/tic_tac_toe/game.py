@@ -1,10 +1,17 @@
 import numpy as np
 from core.base_game import BaseGame
+from games.tic_tac_toe.compact import FULL_MASK, compact_state, mask_winner
 
 class TicTacToeGame(BaseGame):
-    def __init__(self, num_players=2):
+    def __init__(self, num_players=2, compact=False):
+        """
+        compact=True: get_state() devuelve un CompactState (máscaras de bits
+        internadas, ver compact.py) en lugar de un dict con un array nuevo.
+        En ese modo el tablero solo debe modificarse con step().
+        """
         super().__init__()
         self.num_players = num_players
+        self.compact = compact
         self.reset()
 
     def reset(self):
@@ -12,6 +19,7 @@ class TicTacToeGame(BaseGame):
         self.current_player = 0
         self.history = []
         self.done = False
+        self.masks = [0] * self.num_players  # bit 3*fila+columna de las fichas de cada jugador
 
     def get_state(self, player_index=None):
         """
@@ -22,6 +30,10 @@ class TicTacToeGame(BaseGame):
         if player_index is None:
             player_index = self.current_player
 
+        if self.compact:
+            mine = self.masks[player_index]
+            return compact_state(mine, sum(self.masks) - mine, player_index)
+
         normalized = np.zeros_like(self.board)
         normalized[self.board == player_index + 1] = 1
         normalized[(self.board != 0) & (self.board != player_index + 1)] = -1
@@ -125,6 +137,7 @@ class TicTacToeGame(BaseGame):
         for player_index, action in player_actions:
             i, j = action
             self.board[i, j] = player_index + 1
+            self.masks[player_index] |= 1 << (i * 3 + j)
             self.history.append((player_index, action))
 
         # Check terminal
@@ -149,6 +162,9 @@ class TicTacToeGame(BaseGame):
         return self.get_state(), rewards, self.done
 
     def is_terminal(self):
+        if self.compact:
+            return mask_winner(self.masks) is not None or sum(self.masks) == FULL_MASK
+
         board = self.board
 
         for i in range(3):
@@ -166,6 +182,9 @@ class TicTacToeGame(BaseGame):
         return not any(board.flatten() == 0)
 
     def get_winner(self):
+        if self.compact:
+            return mask_winner(self.masks)
+
         board = self.board
         for i in range(3):
             if len(set(board[i, :])) == 1 and board[i, 0] != 0:
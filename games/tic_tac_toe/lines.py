@@ -0,0 +1,17 @@
+import numpy as np
+
+BOARD_SIZE = 3
+NUM_CELLS = BOARD_SIZE * BOARD_SIZE
+
+# Índices (sobre el tablero aplanado) de cada fila, columna y diagonal
+LINES = np.array(
+    [[r * BOARD_SIZE + c for c in range(BOARD_SIZE)] for r in range(BOARD_SIZE)] +
+    [[r * BOARD_SIZE + c for r in range(BOARD_SIZE)] for c in range(BOARD_SIZE)] +
+    [[x * BOARD_SIZE + x for x in range(BOARD_SIZE)]] +
+    [[x * BOARD_SIZE + (BOARD_SIZE - x - 1) for x in range(BOARD_SIZE)]]
+)
+
+# CELL_LINES[c, l] = 1 si la casilla c pertenece a la línea l
+CELL_LINES = np.zeros((NUM_CELLS, len(LINES)), dtype=np.int16)
+for line_idx, line in enumerate(LINES):
+    CELL_LINES[line, line_idx] = 1
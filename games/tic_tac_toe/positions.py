@@ -0,0 +1,39 @@
+import numpy as np
+from games.tic_tac_toe.game import TicTacToeGame
+
+
+def reachable_states(include_terminal=False):
+    """
+    Enumera todas las posiciones alcanzables desde el tablero vacío.
+    Devuelve una lista de (state, valid_actions) con el estado normalizado
+    desde la perspectiva del jugador al que le toca mover.
+    """
+    game = TicTacToeGame(num_players=2)
+    seen = set()
+    positions = []
+    stack = [(np.zeros((3, 3), dtype=int), 0)]
+
+    while stack:
+        board, player = stack.pop()
+        key = (board.tobytes(), player)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        game.board = board
+        game.current_player = player
+        terminal = game.is_terminal()
+        if terminal and not include_terminal:
+            continue
+
+        valid = game.valid_actions(player)
+        positions.append((game.get_state(player), valid))
+        if terminal:
+            continue
+
+        for i, j in valid:
+            child = board.copy()
+            child[i, j] = player + 1
+            stack.append((child, 1 - player))
+
+    return positions
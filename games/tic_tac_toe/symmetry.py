@@ -0,0 +1,19 @@
+import numpy as np
+from games.tic_tac_toe.lines import BOARD_SIZE
+
+_cells = np.arange(BOARD_SIZE * BOARD_SIZE).reshape(BOARD_SIZE, BOARD_SIZE)
+
+# Las 8 simetrías del tablero (rotaciones y reflexiones) como permutaciones de
+# casillas sobre el tablero aplanado: nuevo[k] = original[PERMUTATIONS[t, k]]
+PERMUTATIONS = np.array([
+    t.reshape(-1) for t in (
+        _cells,
+        np.rot90(_cells, 1),
+        np.rot90(_cells, 2),
+        np.rot90(_cells, 3),
+        np.fliplr(_cells),
+        np.flipud(_cells),
+        _cells.T,
+        np.rot90(_cells, 2).T,
+    )
+])
@@ -1,6 +1,8 @@
 import pygame
 import sys
 import numpy as np
+from games.tic_tac_toe.compact import CompactState
+from ui.render_cache import TextCache
 
 CELL_SIZE = 120
 GRID_COLOR = (50, 50, 50)
@@ -25,6 +27,11 @@ class TicTacToeUI:
         self.font = pygame.font.SysFont(None, 72)
         self.small_font = pygame.font.SysFont(None, 36)
         self.clock = pygame.time.Clock()
+        # Glifos cacheados y último tablero dibujado (para actualizar solo lo que cambia)
+        self.glyphs = TextCache(self.font)
+        self.labels = TextCache(self.small_font)
+        self.last_state = None
+        self.last_label = None
 
     # -----------------------------
     # Drawing helpers
@@ -40,17 +47,16 @@ class TicTacToeUI:
                 self.screen, GRID_COLOR, (i * CELL_SIZE, 0), (i * CELL_SIZE, self.size), LINE_WIDTH
             )
 
-    def draw_marks(self, state):
-        for i in range(3):
-            for j in range(3):
-                mark = state[i, j]
-                if mark == 0:
-                    continue
-                color = COLORS[(mark - 1) % len(COLORS)]
-                symbol = self.get_symbol(mark - 1)
-                text = self.font.render(symbol, True, color)
-                rect = text.get_rect(center=(j * CELL_SIZE + CELL_SIZE // 2, i * CELL_SIZE + CELL_SIZE // 2))
-                self.screen.blit(text, rect)
+    def draw_marks(self, state, cells=None):
+        for i, j in cells if cells is not None else np.ndindex(3, 3):
+            mark = state[i, j]
+            if mark == 0:
+                continue
+            color = COLORS[(mark - 1) % len(COLORS)]
+            symbol = self.get_symbol(mark - 1)
+            text = self.glyphs.render(symbol, color)
+            rect = text.get_rect(center=(j * CELL_SIZE + CELL_SIZE // 2, i * CELL_SIZE + CELL_SIZE // 2))
+            self.screen.blit(text, rect)
 
     def get_symbol(self, player_idx):
         """Devuelve un símbolo o inicial del agente."""
@@ -64,15 +70,37 @@ class TicTacToeUI:
     # -----------------------------
 
     def render(self, state, current_player=None):
+        """
+        Dibuja el tablero. Si solo se han añadido fichas desde el último render,
+        únicamente se dibujan y actualizan en pantalla esas casillas.
+        """
+        if isinstance(state, (dict, CompactState)):
+            state = self.game.board  # el motor pasa get_state(): pintamos el tablero absoluto
+        state = np.array(state)
+
+        label = None
+        if current_player is not None and self.agents:
+            label = f"Turn: {self.agents[current_player].name}"
+
+        previous = self.last_state
+        incremental = (previous is not None and previous.shape == state.shape and label == self.last_label
+                       and not ((previous != 0) & (previous != state)).any())
+        self.last_state, self.last_label = state, label
+
+        if incremental:
+            cells = list(zip(*np.nonzero(previous != state)))
+            if cells:
+                self.draw_marks(state, cells)
+                pygame.display.update([pygame.Rect(j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                                       for i, j in cells])
+            return
+
         self.draw_board()
         self.draw_marks(state)
 
         # Mostrar turno actual
-        if current_player is not None and self.agents:
-            name = self.agents[current_player].name
-            info = f"Turn: {name}"
-            text = self.small_font.render(info, True, (20, 20, 20))
-            self.screen.blit(text, (10, 10))
+        if label:
+            self.screen.blit(self.labels.render(label, (20, 20, 20)), (10, 10))
 
         pygame.display.flip()
 
@@ -94,6 +122,7 @@ class TicTacToeUI:
         rect = text.get_rect(center=(self.size // 2, self.size // 2))
         self.screen.blit(text, rect)
         pygame.display.flip()
+        self.last_state = None  # el overlay tapa el tablero: el próximo render es completo
         pygame.time.wait(2000)
 
     # -----------------------------
@@ -118,9 +147,8 @@ class TicTacToeUI:
     # -----------------------------
 
     def wait_exit(self):
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-            self.clock.tick(30)
+        # Bloquea hasta el siguiente evento en lugar de sondear a 30 FPS
+        while pygame.event.wait().type != pygame.QUIT:
+            pass
+        pygame.quit()
+        sys.exit()
@@ -0,0 +1,84 @@
+import numpy as np
+from games.tic_tac_toe.lines import BOARD_SIZE, NUM_CELLS, LINES, CELL_LINES
+
+
+class VecTicTacToe:
+    """
+    N partidas de tres en raya avanzando a la vez (lockstep) sobre arrays NumPy.
+    Los tableros se guardan aplanados (N, 9) con 0 = vacío, 1/2 = fichas del
+    jugador 0/1, igual que TicTacToeGame.board. Las recompensas reproducen
+    exactamente TicTacToeGame.step (incluido el reward shaping de evaluate_move).
+    """
+    def __init__(self, num_envs, num_players=2):
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.boards = np.zeros((num_envs, NUM_CELLS), dtype=np.int8)
+        self.current_player = np.zeros(num_envs, dtype=np.int8)
+        self.done = np.zeros(num_envs, dtype=bool)
+        self.turns = np.zeros(num_envs, dtype=np.int16)
+        self._rows = np.arange(num_envs)
+
+    def reset(self, mask=None):
+        """Reinicia todas las partidas, o solo las indicadas por `mask`."""
+        if mask is None:
+            mask = slice(None)
+        self.boards[mask] = 0
+        self.current_player[mask] = 0
+        self.done[mask] = False
+        self.turns[mask] = 0
+
+    def get_boards(self, player=None):
+        """
+        Tableros normalizados (1 = mis fichas, -1 = rival, 0 = vacío) desde la
+        perspectiva de `player` (array por partida); por defecto, el jugador al que le toca.
+        """
+        if player is None:
+            player = self.current_player
+        mine = self.boards == (np.asarray(player)[:, None] + 1)
+        return mine.astype(np.int8) - ((self.boards != 0) & ~mine).astype(np.int8)
+
+    def valid_mask(self):
+        return self.boards == 0
+
+    def step(self, actions):
+        """
+        Aplica una jugada (índice de casilla) del jugador actual en cada partida.
+        Devuelve (tableros normalizados para el siguiente jugador, recompensas (N, num_players),
+        dones, ganadores (-1 si no hay)).
+        """
+        actions = np.asarray(actions)
+        player = self.current_player.copy()
+        marks = (player + 1).astype(np.int8)
+        self.boards[self._rows, actions] = marks
+        self.turns += 1
+
+        # Estado de las líneas tras la jugada
+        values = self.boards[:, LINES]
+        mine = (values == marks[:, None, None]).sum(axis=2)
+        empty = (values == 0).sum(axis=2)
+        opp = BOARD_SIZE - mine - empty
+
+        won = (mine == BOARD_SIZE).any(axis=1)
+        self.done = won | (self.turns >= NUM_CELLS)
+        winners = np.where(won, player, -1)
+
+        rewards = np.zeros((self.num_envs, self.num_players), dtype=np.float32)
+        rewards[self._rows, player] = np.where(
+            self.done, np.where(won, 3.0, 0.0), self._evaluate_moves(actions, mine, opp, empty)
+        )
+
+        # Siguiente jugador
+        self.current_player = (self.current_player + 1) % self.num_players
+        return self.get_boards(), rewards, self.done.copy(), winners
+
+    def _evaluate_moves(self, actions, mine, opp, empty):
+        """Versión vectorizada de TicTacToeGame.evaluate_move (con la ficha ya colocada)."""
+        through_cell = CELL_LINES[actions].astype(bool)
+        my_two_in_line = ((mine == 2) & (empty == 1) & through_cell).sum(axis=1)
+        block_two_line = ((opp == 2) & (empty == 1) & through_cell).sum(axis=1)
+        emptiness_bonus = ((empty == BOARD_SIZE) & through_cell).sum(axis=1)
+
+        reward = np.where(my_two_in_line >= 2, 0.3, np.where(my_two_in_line == 1, 0.2, 0.0))
+        reward += np.where(block_two_line >= 1, 0.2, 0.0)
+        reward += emptiness_bonus * 0.02
+        return reward
@@ -0,0 +1,24 @@
+from training.offline import generate_dataset, DATA_AGENTS
+from core.profiling import add_profile_args, profile_from_args
+import argparse
+
+GAMES = 100000
+DATA_DIR = "data/offline"
+SHARD_SIZE = 100000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un dataset de transiciones para train-offline")
+    parser.add_argument("--games", type=int, default=GAMES)
+    parser.add_argument("--out", default=DATA_DIR, help="directorio del dataset")
+    parser.add_argument("--agents", nargs=2, choices=sorted(DATA_AGENTS), default=["my", "random"],
+                        help="agentes que juegan las partidas (alternando quién empieza)")
+    parser.add_argument("--workers", type=int, default=1, help="procesos que generan partidas")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help="transiciones por shard")
+    parser.add_argument("--seed", type=int, default=None)
+    add_profile_args(parser)
+    args = parser.parse_args()
+
+    with profile_from_args(args, "generate_dataset"):
+        generate_dataset(args.out, args.games, agent_names=args.agents, workers=args.workers,
+                         shard_size=args.shard_size, seed=args.seed)
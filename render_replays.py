@@ -0,0 +1,25 @@
+from ui.batch_render import render_replays, FORMATS
+from core.profiling import add_profile_args, profile_from_args
+import argparse
+import time
+
+OUT_DIR = "renders"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renderiza replays sin ventana a PNG o GIF")
+    parser.add_argument("replays", nargs="+", help="replays JSON y/o archivos .replays")
+    parser.add_argument("--out", default=OUT_DIR, help="directorio de salida")
+    parser.add_argument("--format", choices=FORMATS, default="gif")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos de render")
+    parser.add_argument("--frame-ms", type=int, default=600, help="duración de cada jugada en el GIF")
+    parser.add_argument("--limit", type=int, default=None, help="máximo de partidas a renderizar")
+    add_profile_args(parser)
+    args = parser.parse_args()
+
+    with profile_from_args(args, "render_replays"):
+        start = time.time()
+        outputs = render_replays(args.replays, args.out, fmt=args.format, workers=args.workers,
+                                 frame_ms=args.frame_ms, limit=args.limit)
+        print(f"[INFO] {len(outputs)} partidas renderizadas en {time.time() - start:.1f}s -> {args.out}")
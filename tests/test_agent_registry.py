@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from agents.random_agent import RandomAgent
+from agents.tic_tac_toe_agent import MyTicTacToeAgent
+from core.agent_registry import load_agent, player_spec, resolve
+
+
+def test_resolve_by_name_path_and_module():
+    assert resolve("random") is RandomAgent
+    assert resolve("agents/tic_tac_toe_agent.py") is MyTicTacToeAgent
+    assert resolve("agents.random_agent:RandomAgent") is RandomAgent
+    assert player_spec({"agent": "my", "path": "ignored.py"}) == "my"
+    agent = load_agent(player_spec({"path": "agents/random_agent.py"}))("R")
+    assert isinstance(agent, RandomAgent) and agent.name == "R"
+
+
+def test_versus_startup_does_not_import_torch(tmp_path):
+    # Proceso nuevo: comprueba qué módulos deja cargados una partida entre agentes sin red
+    code = (
+        "import sys\n"
+        "from core.agent_registry import load_agent\n"
+        "from core.engine import GameEngine\n"
+        "from games.tic_tac_toe.game import TicTacToeGame\n"
+        "agents = [load_agent('agents/random_agent.py')('R'), load_agent('agents/tic_tac_toe_agent.py')('Yo')]\n"
+        "GameEngine(TicTacToeGame(num_players=2), agents).run()\n"
+        "print('torch' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == "False"
@@ -0,0 +1,16 @@
+import os
+from core.replay_archive import ReplayArchiveWriter
+from ui.batch_render import render_replays
+
+
+def test_renders_archive_games_headless(tmp_path):
+    archive = str(tmp_path / "games.replays")
+    with ReplayArchiveWriter(archive) as writer:
+        writer.write_game(["Ana", "Bob"], [(0, (1, 1)), (1, (0, 0)), (0, (2, 2))])
+        writer.write_game(["Bob", "Ana"], [(0, (0, 1))])
+
+    gifs = render_replays([archive], str(tmp_path / "gif"), fmt="gif")
+    assert [os.path.basename(p) for p in gifs] == ["games_000000.gif", "games_000001.gif"]
+
+    frames, = render_replays([archive], str(tmp_path / "png"), fmt="png", limit=1)
+    assert sorted(os.listdir(frames)) == [f"frame_00{n}.png" for n in range(4)]
@@ -0,0 +1,31 @@
+from benchmarks.suite import compare, measure, run_suite
+
+
+def test_suite_reports_rates_and_flags_regressions():
+    report = run_suite(only=["game"], quick=True)
+    assert set(report["results"]) >= {"game.step", "game.get_state", "game.evaluate_move"}
+    assert all(v > 0 for v in report["results"].values())
+
+    baseline = {"results": {name: 2 * v for name, v in report["results"].items()}}
+    rows = compare(report, baseline, tolerance=0.15)
+    assert len(rows) == len(report["results"]) and all(row[4] for row in rows)
+    assert not any(row[4] for row in compare(report, report))
+    assert measure(lambda: None, items=10, min_time=0.01) > 0
+
+
+def test_startup_does_not_import_heavy_dependencies():
+    from benchmarks.startup import parse_importtime, run_startup
+
+    rows = parse_importtime("import time: self [us] | cumulative | imported package\n"
+                            "import time:       120 |        300 |   numpy.core\n"
+                            "import time:        50 |        350 | numpy\n")
+    assert rows == [("numpy.core", 120, 300, 1), ("numpy", 50, 350, 0)]
+
+    # Sin comprobar tiempos (dependen de la máquina): solo qué se importa
+    report = run_startup(only=["versus", "play", "train_dqn --help", "browse"], repeats=1, top=0)
+    assert len(report) == 5
+    for name, result in report.items():
+        assert result["heavy"] == [], name
+        if name.endswith("--help"):
+            # --help tampoco carga numpy ni tqdm
+            assert not {"numpy", "tqdm"} & {module.split(".")[0] for module, *_ in result["modules"]}, name
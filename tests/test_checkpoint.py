@@ -0,0 +1,78 @@
+import random
+import numpy as np
+import torch
+from agents.dqn_agent import DQNAgent
+from training.sequential import train_sequential
+from core.replay_buffer import ReplayBuffer
+
+
+def seed_everything(seed=0):
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+
+def test_resume_continues_exactly(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    seed_everything()
+    full_run = train_sequential(DQNAgent, 40, checkpoint_dir="ckpt", checkpoint_interval=25)
+
+    # Otro proceso arrancaría con otras semillas: el checkpoint debe restaurarlas
+    seed_everything(123)
+    resumed = train_sequential(DQNAgent, 40, resume=True, checkpoint_dir="ckpt", checkpoint_interval=25)
+
+    for a, b in zip(full_run, resumed):
+        assert a.train_step == b.train_step > 0
+        assert a.epsilon == b.epsilon
+        for p, q in zip(a.model.parameters(), b.model.parameters()):
+            assert torch.equal(p, q)
+        assert np.array_equal(a.memory.contents()[0], b.memory.contents()[0])
+    assert isinstance(np.load("ckpt/ckpt-00000025/replay_0/boards.npy", mmap_mode="r"), np.memmap)
+
+
+def test_replay_reopens_memory_mapped(tmp_path):
+    buffer = ReplayBuffer(capacity=4)
+    buffer.append({"board": np.eye(3, dtype=int)}, (0, 0), 1.0, {"board": np.zeros((3, 3), dtype=int)}, False)
+    buffer.save(tmp_path / "replay")
+
+    reopened = ReplayBuffer.open(tmp_path / "replay")
+    assert isinstance(reopened.boards, np.memmap)
+    assert len(reopened) == 1 and reopened.capacity == 4
+
+    # copy-on-write: se puede seguir añadiendo sin tocar los ficheros
+    reopened.append({"board": np.eye(3, dtype=int)}, (1, 1), 0.0, {"board": np.eye(3, dtype=int)}, True)
+    assert len(reopened) == 2
+    assert len(ReplayBuffer.open(tmp_path / "replay")) == 1
+
+
+def test_shared_self_play_resumes_shared(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    agents = train_sequential(DQNAgent, 30, checkpoint_dir="ckpt", checkpoint_interval=30, shared="network")
+    assert agents[0].memory is agents[1].memory and agents[0].model is agents[1].model
+    assert agents[1].train_step == 0 < agents[0].train_step  # un solo paso de gradiente por jugada
+
+    resumed = train_sequential(DQNAgent, 30, resume=True, checkpoint_dir="ckpt", shared="network")
+    assert resumed[0].memory is resumed[1].memory
+    assert len(resumed[0].memory) == len(agents[0].memory)
+    assert not (tmp_path / "ckpt/ckpt-00000030/replay_1").exists()
+
+
+def test_fresh_run_does_not_prune_its_own_checkpoint(tmp_path):
+    from training.checkpoint import Checkpointer
+
+    agents = [DQNAgent("A"), DQNAgent("B")]
+    checkpointer = Checkpointer(str(tmp_path), keep=2)
+    # Restos de una ejecución más larga con nombres "mayores"
+    checkpointer.save(29000, agents, {"episode": 29000})
+    checkpointer.save(30000, agents, {"episode": 30000})
+
+    path = checkpointer.save(1000, agents, {"episode": 1000})
+    assert checkpointer.latest() == path and (tmp_path / "ckpt-00001000/state.pt").exists()
+    assert not (tmp_path / "ckpt-00029000").exists()  # el más antiguo por orden de guardado
+    assert checkpointer.load_latest(agents) == {"episode": 1000}
+
+    # Reescribir el mismo tag no deja restos
+    checkpointer.save(1000, agents, {"episode": 1001})
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ckpt-00001000", "ckpt-00030000", "latest"]
@@ -0,0 +1,41 @@
+import random
+import numpy as np
+from agents.tic_tac_toe_agent import board_key
+from games.tic_tac_toe.compact import board_features
+from games.tic_tac_toe.game import TicTacToeGame
+
+
+def test_compact_game_matches_dict_states():
+    random.seed(1)
+    for _ in range(100):
+        game, compact = TicTacToeGame(), TicTacToeGame(compact=True)
+        done = False
+        while not done:
+            p = game.current_player
+            state, small = game.get_state(p), compact.get_state(p)
+            assert np.array_equal(state["board"], small["board"]) and small["player_id"] == p
+            assert small.base3 == board_key(state["board"])
+            assert np.array_equal(board_features(state), board_features(small))
+            # Estados internados: la misma posición no vuelve a reservar memoria
+            assert compact.get_state(p) is small
+
+            action = random.choice(game.valid_actions())
+            _, rewards, done = game.step([(p, action)])
+            assert compact.step([(p, action)])[1:] == (rewards, done)
+        assert compact.get_winner() == game.get_winner()
+
+
+def test_compact_state_is_only_used_when_every_agent_supports_it():
+    from agents.random_agent import RandomAgent
+    from core.base_agent import BaseAgent, supports_compact_state
+    from core.tournament import play_batch
+
+    class ScribbleAgent(BaseAgent):
+        """Agente de terceros que escribe en el tablero que recibe."""
+        def act(self, state, valid_actions):
+            state["board"][:] = 0
+            return valid_actions[0]
+
+    scribble, rival = ScribbleAgent("Scribble"), RandomAgent("Random")
+    assert supports_compact_state([rival]) and not supports_compact_state([scribble, rival])
+    assert sum(play_batch(scribble, rival, 6)) == 6
@@ -0,0 +1,28 @@
+import torch
+from agents.dqn_agent_gpu import DQNAgentGPU
+from benchmarks.bench_dqn_inference import greedy_moves
+from games.tic_tac_toe.positions import reachable_states
+
+
+def test_reachable_states_count():
+    # 5478 posiciones legales, de las cuales 958 son finales
+    assert len(reachable_states()) == 4520
+    assert len(reachable_states(include_terminal=True)) == 5478
+
+
+def test_inference_mode_matches_float_model():
+    torch.manual_seed(0)
+    agent = DQNAgentGPU("Test", epsilon=0.0)
+    agent.device = torch.device("cpu")
+    agent.model.to(agent.device)
+    positions = reachable_states()[:1500]
+
+    reference = greedy_moves(agent, positions)
+
+    agent.enable_inference_mode(quantize=False)
+    assert greedy_moves(agent, positions) == reference
+
+    agent.enable_inference_mode(quantize=True)
+    quantized = greedy_moves(agent, positions)
+    agreement = sum(a == b for a, b in zip(reference, quantized)) / len(positions)
+    assert agreement >= 0.97, f"Coincidencia int8 demasiado baja: {agreement:.3f}"
@@ -0,0 +1,16 @@
+import numpy as np
+from ui.keyframes import BoardKeyframes
+
+
+def test_keyframes_match_replaying_from_start():
+    rng = np.random.default_rng(0)
+    cells = rng.permutation(49)
+    moves = [(n % 2 + 1, divmod(int(c), 7)) for n, c in enumerate(cells)]
+    keyframes = BoardKeyframes(np.zeros((7, 7), dtype=int), moves, interval=5)
+
+    board = np.zeros((7, 7), dtype=int)
+    for index in [49, 0, 23, 5, 24, 10, 60]:
+        expected = np.zeros((7, 7), dtype=int)
+        for value, (i, j) in moves[:index]:
+            expected[i, j] = value
+        assert np.array_equal(keyframes.board_at(index, board), expected)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+import torch
+from agents.dqn_agent import DQNAgent
+from training.league import League, PolicyCache, play_match
+
+
+def test_frozen_weights_are_memory_mapped_views(tmp_path):
+    league = League(str(tmp_path))
+    agent = DQNAgent("Learner")
+    member = league.freeze("Learner@1", agent.model)
+
+    policy = PolicyCache(DQNAgent).get(member)
+    for p, q in zip(agent.model.parameters(), policy.model.parameters()):
+        assert torch.equal(p, q)
+    # Los parámetros apuntan al fichero mapeado, no a una copia
+    mapped = np.load(member["source"], mmap_mode="r")
+    assert not policy.model[0].weight.requires_grad
+    assert sum(p.numel() for p in policy.model.parameters()) == mapped.size
+
+    league.add_heuristic("Random", "random")
+    wins = play_match([policy, PolicyCache(DQNAgent).get(league.members["Random"])], 10)
+    assert sum(wins) == 10
+    league.record("Learner@1", "Random", *wins)
+    ratings = [m["rating"] for m in league.members.values()]
+    assert sum(ratings) == pytest.approx(2000.0) and league.members["Random"]["games"] == 10
+    assert league.schedule(1) == [("Learner@1", "Random")]
+
+
+def test_frozen_policy_has_no_training_state_and_elo_is_per_game(tmp_path):
+    league = League(str(tmp_path))
+    member = league.freeze("Learner@1", DQNAgent("Learner").model)
+    policy = PolicyCache(DQNAgent).get(member)
+    assert not hasattr(policy, "memory") and not hasattr(policy, "optimizer")
+
+    # Un 75% en 100 partidas no desborda: la diferencia tiende a la de un 75% esperado (~191)
+    league.add_heuristic("Random", "random")
+    league.record("Learner@1", "Random", 75, 25, 0)
+    gap = league.members["Learner@1"]["rating"] - league.members["Random"]["rating"]
+    assert 150 < gap < 200
@@ -0,0 +1,66 @@
+import csv
+import json
+from core.metrics import create_metrics, NullMetrics
+
+
+def test_metrics_are_buffered_until_flush(tmp_path):
+    metrics = create_metrics("jsonl", log_dir=str(tmp_path), buffer_size=3)
+    metrics.log_scalar("loss", 0.5, 1)
+    metrics.log_scalar("loss", 0.25, 2)
+    assert not list(tmp_path.rglob("metrics.jsonl"))  # todavía en memoria
+
+    metrics.log_scalar("winrate_vs_fixed", 1, 2)  # llena el buffer → se escribe
+    metrics.log_scalar("loss", 0.125, 3)
+    metrics.close()
+
+    path, = tmp_path.rglob("metrics.jsonl")
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(r["tag"], r["value"], r["step"]) for r in rows] == [
+        ("loss", 0.5, 1), ("loss", 0.25, 2), ("winrate_vs_fixed", 1.0, 2), ("loss", 0.125, 3)]
+
+
+def test_csv_backend_and_disabled_metrics(tmp_path):
+    metrics = create_metrics("csv", log_dir=str(tmp_path))
+    metrics.log_scalar("epsilon/DQN-1", 0.9, 7)
+    metrics.close()
+
+    path, = tmp_path.rglob("metrics.csv")
+    header, row = list(csv.reader(path.open()))
+    assert header == ["tag", "value", "step", "time"] and row[:3] == ["epsilon/DQN-1", "0.9", "7"]
+    assert isinstance(create_metrics("jsonl", log_dir=str(tmp_path), enabled=False), NullMetrics)
+
+
+def test_async_results_report_the_snapshot_epsilon(tmp_path, capsys):
+    import torch
+    from training.evaluation import BestModelTracker
+
+    metrics = create_metrics("jsonl", log_dir=str(tmp_path / "runs"))
+    tracker = BestModelTracker("Rival", save_dir=str(tmp_path / "models"))
+    snapshot = {"w": torch.ones(2)}
+    tracker.report_async([(500, 0.75, snapshot, 0.42)], metrics)
+    metrics.close()
+
+    assert "winrate vs Rival: 0.75 | ε=0.420" in capsys.readouterr().out
+    assert torch.equal(torch.load(tmp_path / "models/best_model_vs_Rival.pth")["w"], snapshot["w"])
+    path, = (tmp_path / "runs").rglob("metrics.jsonl")
+    assert json.loads(path.read_text())["tag"] == "winrate_vs_fixed"
+
+
+def test_trainers_log_only_when_metrics_are_requested(tmp_path, monkeypatch):
+    import pytest
+    from agents.dqn_agent import DQNAgent
+    from core.metrics import BufferedMetrics
+    from training.vectorized import train_vectorized
+
+    with pytest.raises(TypeError):
+        BufferedMetrics()  # _write es abstracto
+
+    monkeypatch.chdir(tmp_path)
+    train_vectorized(DQNAgent, 16, num_envs=4, eval_interval=8, eval_episodes=2, checkpoint_interval=0)
+    assert not (tmp_path / "runs").exists()
+
+    train_vectorized(DQNAgent, 16, num_envs=4, eval_interval=8, eval_episodes=2, checkpoint_interval=0,
+                     metrics="jsonl")
+    path, = (tmp_path / "runs").rglob("metrics.jsonl")
+    tags = {json.loads(line)["tag"] for line in path.read_text().splitlines()}
+    assert {"winrate_vs_fixed", "epsilon/DQN-1"} <= tags
@@ -0,0 +1,48 @@
+import numpy as np
+from training.offline import generate_dataset, ShardLoader
+
+
+def test_generated_shards_stream_every_transition(tmp_path):
+    manifest = generate_dataset(str(tmp_path), 40, shard_size=64, seed=0)
+    total = manifest["transitions"]
+    assert len(manifest["shards"]) > 1 and all(s["size"] <= 64 for s in manifest["shards"])
+
+    loader = ShardLoader(str(tmp_path), batch_size=1, epochs=2, prefetch=4, seed=0)
+    batches = list(loader)
+    assert len(batches) == 2 * total
+
+    boards, actions, rewards, next_boards, dones = (np.concatenate(f) for f in zip(*batches))
+    assert boards.dtype == np.int8 and boards.shape == (2 * total, 9)
+    # La casilla jugada siempre estaba vacía y cada partida termina en un done
+    assert (boards[np.arange(len(actions)), actions] == 0).all()
+    assert dones.sum() == 2 * 2 * 40
+
+
+def test_small_shards_and_augmented_offline_training(tmp_path, monkeypatch):
+    from agents.dqn_agent import DQNAgent
+    from training.offline import train_offline
+
+    manifest = generate_dataset(str(tmp_path / "data"), 3, shard_size=8, seed=0)
+    # Shards más pequeños que el batch: el resto de cada shard también se entrena
+    loader = ShardLoader(str(tmp_path / "data"), batch_size=64, seed=0)
+    assert sum(len(batch[1]) for batch in loader) == manifest["transitions"]
+
+    shapes = []
+    original = DQNAgent.train_on_batch
+    monkeypatch.setattr(DQNAgent, "train_on_batch",
+                        lambda self, *batch: shapes.append(len(batch[1])) or original(self, *batch))
+    monkeypatch.chdir(tmp_path)
+    train_offline(DQNAgent, "data", batch_size=16, eval_interval=0, agent_kwargs={"augment": "all"})
+    # Con augment="all" se leen 16 / 8 = 2 transiciones por batch y se entrenan sus 8 variantes
+    assert shapes and all(n % 8 == 0 and n <= 16 for n in shapes)
+    assert sum(shapes) == 8 * manifest["transitions"]
+
+
+def test_missing_shard_fails_the_epoch(tmp_path):
+    import os
+    import pytest
+
+    manifest = generate_dataset(str(tmp_path), 10, shard_size=16, seed=0)
+    os.remove(tmp_path / manifest["shards"][-1]["name"] / "boards.npy")
+    with pytest.raises(FileNotFoundError):
+        list(ShardLoader(str(tmp_path), batch_size=4, seed=0))
@@ -0,0 +1,55 @@
+import argparse
+import os
+import pstats
+from core import profiling
+from core.profiling import Profiler, add_profile_args, profile_from_args
+
+
+def busy(n=20000):
+    return sum(i * i for i in range(n))
+
+
+def test_window_profiles_only_the_selected_steps(tmp_path):
+    calls = []
+
+    def work(i):
+        calls.append(i)
+        busy(2000)
+
+    with Profiler(str(tmp_path), top=5, window=(3, 6)) as profiler:
+        for i in range(10):
+            profiling.step(i)
+            work(i)
+    assert profiler.done and not profiler.running
+
+    stats = pstats.Stats(str(tmp_path / "profile.prof"))
+    work_calls = [value[1] for key, value in stats.stats.items() if key[2] == "work"]
+    assert work_calls == [3]
+    assert "work" in (tmp_path / "top.txt").read_text()
+    # Fuera del contexto step() no hace nada
+    profiling.step(4)
+
+
+def test_sampling_profiler_writes_folded_stacks(tmp_path):
+    with Profiler(str(tmp_path), mode="sample", top=5, interval=0.001):
+        for _ in range(50):
+            busy()
+    folded = (tmp_path / "samples.folded").read_text().splitlines()
+    assert folded and all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+    assert any("busy" in line for line in folded)
+    assert (tmp_path / "top.txt").exists()
+
+
+def test_profile_args_are_off_by_default(tmp_path):
+    parser = argparse.ArgumentParser()
+    add_profile_args(parser)
+    with profile_from_args(parser.parse_args([]), "test") as profiler:
+        assert profiler is None
+
+    args = parser.parse_args(["--profile", "--profiler", "sample", "--profile-window", "10", "20",
+                              "--profile-out", str(tmp_path / "out")])
+    profiler = profile_from_args(args, "test")
+    assert (profiler.mode, profiler.window) == ("sample", (10, 20))
+    with profiler:
+        pass
+    assert not os.path.exists(tmp_path / "out")  # la ventana no llegó a abrirse
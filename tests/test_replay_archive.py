@@ -0,0 +1,96 @@
+import os
+import numpy as np
+from agents.random_agent import RandomAgent
+from core.engine import GameEngine
+from core.replay_archive import (ReplayArchive, ReplayArchiveWriter, ReplaySummary, game_to_json, json_to_game,
+                                 index_path, rebuild_index)
+from games.tic_tac_toe.game import TicTacToeGame
+
+
+def test_archive_streams_games_with_random_access(tmp_path):
+    path = str(tmp_path / "versus.replays")
+    game = TicTacToeGame(num_players=2)
+    played = []
+    with ReplayArchiveWriter(path) as writer:
+        for k in range(20):
+            engine = GameEngine(game, [RandomAgent(f"R{k}"), RandomAgent("Rival")], archive=writer)
+            winner = engine.run()
+            played.append((list(engine.moves), winner, engine.history))
+
+    archive = ReplayArchive(path)
+    assert len(archive) == 20
+    for k in (19, 0, 7):
+        moves, winner, history = played[k]
+        replay = archive[k]
+        assert replay["players"] == [f"R{k}", "Rival"]
+        assert replay["moves"] == moves and replay["winner"] == winner
+
+        # JSON del viewer: mismas jugadas y recompensas que registró el motor
+        data = game_to_json(replay, TicTacToeGame(num_players=2))
+        assert [(h["player"], tuple(h["action"]), h["reward"]) for h in data["history"]] == history
+        assert json_to_game(data) == (replay["players"], replay["moves"], replay["winner"])
+
+    # Un byte por jugada (más nombres y cabecera de cada partida)
+    total_moves = sum(len(m) for m, _, _ in played)
+    assert os.path.getsize(path) < total_moves + 20 * 16 + 8
+
+    offsets = np.fromfile(index_path(path), dtype=np.uint64)
+    os.remove(index_path(path))
+    rebuild_index(path)
+    assert np.array_equal(np.fromfile(index_path(path), dtype=np.uint64), offsets)
+
+
+def test_summary_filters_match_decoded_games(tmp_path):
+    path = str(tmp_path / "mixed.replays")
+    rng = np.random.default_rng(0)
+    with ReplayArchiveWriter(path) as writer:
+        for k in range(300):
+            players = ["Random", "MyAgent"] if k % 2 else ["MyAgent", "Jugador largo ñ"]
+            cells = rng.permutation(9)[:rng.integers(0, 10)]
+            moves = [(n % 2, divmod(int(c), 3)) for n, c in enumerate(cells)]
+            writer.write_game(players, moves, None if k % 3 == 0 else k % 2)
+
+    archive = ReplayArchive(path)
+    summary = ReplaySummary(archive)
+    games = list(archive)
+    assert summary.num_moves.tolist() == [len(g["moves"]) for g in games]
+
+    def expected(pred):
+        return [k for k, g in enumerate(games) if pred(g)]
+    assert summary.select(winner="draw").tolist() == expected(lambda g: g["winner"] is None)
+    assert summary.select(winner="MyAgent").tolist() == expected(
+        lambda g: g["winner"] is not None and g["players"][g["winner"]] == "MyAgent")
+    assert summary.select(agent="Jugador largo ñ", min_moves=3, max_moves=6).tolist() == expected(
+        lambda g: "Jugador largo ñ" in g["players"] and 3 <= len(g["moves"]) <= 6)
+    assert len(summary.select(agent="Nadie")) == 0
+
+
+def test_desynced_index_is_repaired_on_open(tmp_path):
+    path = str(tmp_path / "killed.replays")
+    with ReplayArchiveWriter(path) as writer:
+        for k in range(10):
+            writer.write_game([f"P{k}", "Rival"], [(0, (1, 1)), (1, (0, 0))], k % 2)
+    offsets = np.fromfile(index_path(path), dtype=np.uint64)
+
+    # Índice sin las últimas partidas: el lector lo corrige en memoria sin tocar el .idx
+    offsets[:7].tofile(index_path(path))
+    assert len(ReplayArchive(path)) == 10
+    assert len(np.fromfile(index_path(path), dtype=np.uint64)) == 7
+
+    # Entradas del índice más allá del final del fichero
+    np.concatenate([offsets, offsets[-1:] + 1000]).tofile(index_path(path))
+    archive = ReplayArchive(path)
+    assert len(archive) == 10 and archive[-1]["players"] == ["P9", "Rival"]
+    assert len(ReplaySummary(archive)) == 10
+
+    # Media partida al final: no se indexa y el escritor la descarta antes de añadir
+    with open(path, "ab") as f:
+        f.write(b"\x02\x03abc")
+    assert len(ReplayArchive(path)) == 10
+    with ReplayArchiveWriter(path) as writer:
+        writer.write_game(["Nueva", "Rival"], [(0, (2, 2))], 0)
+        # Con el escritor abierto, el lector ya ve la partida y el .idx está al día
+        assert len(ReplayArchive(path)) == 11
+        assert np.array_equal(np.fromfile(index_path(path), dtype=np.uint64), ReplayArchive(path).offsets)
+    archive = ReplayArchive(path)
+    assert len(archive) == 11 and archive[10]["players"] == ["Nueva", "Rival"]
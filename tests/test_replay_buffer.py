@@ -0,0 +1,64 @@
+import pickle
+import numpy as np
+from core.replay_buffer import ReplayBuffer, SharedReplayBuffer
+
+
+def make_batch(start, n):
+    boards = np.tile(np.arange(start, start + n, dtype=np.int8)[:, None], (1, 9))
+    return boards, np.arange(start, start + n), np.ones(n), -boards, np.zeros(n, dtype=bool)
+
+
+def test_ring_buffer_keeps_most_recent():
+    buffer = ReplayBuffer(capacity=5)
+    buffer.add_batch(*make_batch(0, 3))
+    buffer.add_batch(*make_batch(3, 4))
+
+    assert len(buffer) == 5
+    boards, actions, _, next_boards, _ = buffer.contents()
+    assert actions.tolist() == [2, 3, 4, 5, 6]
+    assert (next_boards == -boards).all()
+
+
+def test_append_from_agent_states():
+    buffer = ReplayBuffer(capacity=10)
+    state = {"board": np.eye(3, dtype=int)}
+    buffer.append(state, (1, 2), 0.5, {"board": -np.eye(3, dtype=int)}, True)
+
+    boards, actions, rewards, _, dones = buffer.sample(1)
+    assert boards[0].tolist() == np.eye(3).reshape(-1).tolist()
+    assert actions[0] == 5 and rewards[0] == 0.5 and dones[0]
+
+
+def test_shared_buffer_survives_pickling():
+    buffer = SharedReplayBuffer(capacity=8)
+    buffer.add_batch(*make_batch(0, 2))
+
+    # RawArray solo se puede serializar al crear procesos: simulamos el re-attach
+    attached = SharedReplayBuffer.__new__(SharedReplayBuffer)
+    attached.__setstate__(buffer.__getstate__())
+    attached.add_batch(*make_batch(2, 2))
+
+    assert len(buffer) == 4
+    assert buffer.contents()[1].tolist() == [0, 1, 2, 3]
+    assert pickle.dumps(ReplayBuffer(4))
+
+
+def test_symmetry_augmentation_keeps_moves_consistent():
+    from games.tic_tac_toe.lines import LINES
+    from games.tic_tac_toe.symmetry import PERMUTATIONS
+
+    # Cada simetría convierte las 8 líneas ganadoras en las mismas 8 líneas
+    lines = {frozenset(line) for line in LINES.tolist()}
+    for perm in PERMUTATIONS:
+        assert {frozenset(perm[line].tolist()) for line in LINES} == lines
+
+    buffer = ReplayBuffer(capacity=10)
+    boards = np.arange(9, dtype=np.int8)[None, :]  # todas las casillas distintas
+    buffer.add_batch(boards, np.array([5]), np.ones(1), -boards, np.zeros(1, dtype=bool))
+    buffer.set_augmentation(PERMUTATIONS, "all")
+
+    aug_boards, aug_actions, _, aug_next, _ = buffer.sample(8)
+    assert len(aug_actions) == 8 and len(set(map(bytes, aug_boards))) == 8
+    # La casilla jugada sigue teniendo el mismo contenido tras la transformación
+    assert (aug_boards[np.arange(8), aug_actions] == boards[0, 5]).all()
+    assert (aug_next == -aug_boards).all()
@@ -0,0 +1,36 @@
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from agents.random_agent import RandomAgent
+from core.engine import GameEngine
+from games.tic_tac_toe.game import TicTacToeGame
+from ui.replay_viewer_gui import ReplayViewerGUI
+
+
+def test_viewer_idles_without_redrawing(monkeypatch):
+    engine = GameEngine(TicTacToeGame(num_players=2), [RandomAgent("A"), RandomAgent("B")])
+    engine.run()
+    viewer = ReplayViewerGUI(TicTacToeGame(num_players=2), engine)
+    updates = []
+    monkeypatch.setattr(pygame.display, "update", lambda rects=None: updates.append(rects))
+
+    viewer.update(0.0)
+    assert len(updates) == 1 and len(updates[0]) == 2  # primer frame: tablero y panel
+
+    # Sin nada en marcha: ni se redibuja ni hay timeout (se bloquea esperando eventos)
+    viewer.animate_until = 0.0
+    viewer.update(0.0)
+    assert len(updates) == 1 and viewer.timeout() is None
+
+    # Con play se espera hasta la próxima jugada y solo se actualiza el tablero
+    viewer.toggle_play()
+    viewer.last_update = time.time()
+    assert 0 < viewer.timeout() <= viewer.delay
+    viewer.last_update -= viewer.delay + 1
+    viewer.animate_until = -1.0
+    viewer.update(0.0)
+    assert updates[-1] == [viewer.board_rect, viewer.panel_rect]  # nueva jugada: tablero y textos
+    pygame.quit()
@@ -0,0 +1,24 @@
+import numpy as np
+from core.sprt import SPRT
+
+
+def run_sprt(test, probs, batch=50, max_games=20000, seed=0):
+    """Simula partidas (victoria, derrota, empate) con probabilidades `probs` hasta que el test concluye."""
+    outcomes = np.random.default_rng(seed).choice(3, size=max_games, p=probs)
+    for games in range(batch, max_games + 1, batch):
+        wins, losses, draws = np.bincount(outcomes[:games], minlength=3)
+        decision = test.status(wins, losses, draws)
+        if decision:
+            return decision, games
+    return None, max_games
+
+
+def test_sprt_stops_early_with_the_right_decision():
+    test = SPRT(elo0=0, elo1=50, alpha=0.05, beta=0.05)
+    assert run_sprt(test, [0.8, 0.05, 0.15])[0] == "H1"
+    assert run_sprt(test, [0.8, 0.05, 0.15])[1] <= 100
+    # Igualados: se acepta H0 mucho antes del máximo de partidas
+    decision, games = run_sprt(test, [0.3, 0.3, 0.4])
+    assert decision == "H0" and games < 5000
+    # Solo victorias (varianza observada 0) también concluye
+    assert test.status(40, 0, 0) == "H1"
@@ -0,0 +1,60 @@
+import json
+import random
+import pytest
+from core.tournament import Tournament, fit_elo, fit_glicko2, pair_score
+
+PLAYERS = [
+    {"name": "Random", "path": "agents/random_agent.py", "params": {}},
+    {"name": "Yo", "path": "agents/tic_tac_toe_agent.py", "params": {"write_logs": False}},
+    {"name": "Random2", "path": "agents/random_agent.py", "params": {}},
+]
+
+
+def test_ratings_order_and_confidence():
+    names = ["A", "B", "C"]
+    results = {("A", "B"): [70, 20, 10], ("A", "C"): [90, 5, 5], ("B", "C"): [60, 30, 10]}
+    elo = fit_elo(names, results)
+    assert elo["A"][0] > elo["B"][0] > elo["C"][0]
+    assert sum(r for r, _ in elo.values()) / 3 == pytest.approx(1000)
+
+    glicko = fit_glicko2(names, [results])
+    assert glicko["A"][0] > glicko["B"][0] > glicko["C"][0]
+    # Más partidas -> intervalo más estrecho
+    assert fit_glicko2(names, [results] * 4)["A"][1] < glicko["A"][1]
+
+    p, half_width = pair_score(50, 50, 0)
+    assert p == 0.5 and 0 < half_width < 0.11
+
+
+def test_tournament_streams_results_and_skips_decided_pairs(tmp_path):
+    random.seed(0)
+    tournament = Tournament(PLAYERS, str(tmp_path), batch_games=20, min_games=40, max_games=200)
+    standings = tournament.run()
+    assert standings[0]["name"] == "Yo"
+
+    # Las parejas contra "Yo" se deciden pronto; Random vs Random2 necesita más partidas
+    assert sum(tournament.results[("Random", "Yo")]) < sum(tournament.results[("Random", "Random2")])
+
+    with open(tmp_path / "results.jsonl") as f:
+        lines = [json.loads(line) for line in f]
+    assert sum(r["wins_a"] + r["wins_b"] + r["draws"] for r in lines) == sum(
+        sum(w) for w in tournament.results.values())
+
+    # Relanzar sobre el mismo directorio recupera el torneo sin jugar más
+    resumed = Tournament(PLAYERS, str(tmp_path), rating="glicko", batch_games=20, min_games=40, max_games=200)
+    assert resumed.results == tournament.results and not resumed.pending()
+
+
+def test_tournament_resumes_after_a_half_written_line(tmp_path):
+    log = tmp_path / "results.jsonl"
+    batch = {"round": 0, "a": "Random", "b": "Yo", "wins_a": 2, "wins_b": 15, "draws": 3}
+    log.write_text(json.dumps(batch) + "\n" + '{"round": 0, "a": "Random", "b": "Ra')
+
+    tournament = Tournament(PLAYERS, str(tmp_path), batch_games=20, min_games=40, max_games=200)
+    assert tournament.results[("Random", "Yo")] == [2, 15, 3]
+    assert log.read_text() == json.dumps(batch) + "\n"
+
+    random.seed(0)
+    tournament.run()
+    with open(log) as f:
+        assert all(json.loads(line) for line in f)
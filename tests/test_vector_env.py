@@ -0,0 +1,31 @@
+import random
+import numpy as np
+from games.tic_tac_toe.game import TicTacToeGame
+from games.tic_tac_toe.vector_env import VecTicTacToe
+
+
+def test_vector_env_matches_game():
+    num_envs = 16
+    env = VecTicTacToe(num_envs)
+    games = [TicTacToeGame(num_players=2) for _ in range(num_envs)]
+
+    for _ in range(200):
+        actions = []
+        expected = []
+        for game in games:
+            i, j = random.choice(game.valid_actions())
+            actions.append(i * 3 + j)
+            player = game.current_player
+            expected.append((game.step([(player, (i, j))]), game.get_winner()))
+
+        next_boards, rewards, dones, winners = env.step(actions)
+
+        for e, ((next_state, game_rewards, done), winner) in enumerate(expected):
+            assert np.array_equal(next_boards[e], next_state["board"].reshape(-1))
+            assert np.allclose(rewards[e], game_rewards)
+            assert dones[e] == done
+            assert winners[e] == (-1 if winner is None else winner)
+            if done:
+                games[e].reset()
+
+        env.reset(dones)
@@ -0,0 +1,79 @@
+import json
+import random
+from versus import read_results, start_versus, summarize
+
+CONFIG = {
+    "players": [
+        {"name": "Yo", "path": "agents/tic_tac_toe_agent.py", "params": {"write_logs": False}},
+        {"name": "Random", "path": "agents/random_agent.py", "params": {}},
+    ],
+    "rounds": 40,
+}
+
+
+def test_results_log_resume_and_summary(tmp_path):
+    cfg = tmp_path / "versus.json"
+    cfg.write_text(json.dumps(CONFIG))
+    log = str(tmp_path / "results.jsonl")
+    random.seed(0)
+    full = start_versus(str(cfg), results_path=log)
+    assert full["games"] == 40
+
+    # Simula un corte: quedan 15 partidas y media línea
+    with open(log) as f:
+        lines = f.readlines()
+    with open(log, "w") as f:
+        f.writelines(lines[:16])
+        f.write(lines[16][:10])
+
+    resumed = start_versus(str(cfg), results_path=log, resume=True)
+    header, records, _ = read_results(log)
+    assert resumed["games"] == 40 and sorted(records) == list(range(40))
+    assert [records[i]["first"] for i in range(40)] == [0] * 20 + [1] * 20
+
+    # El resumen desde el log coincide con lo que devolvió la ejecución
+    _, stats = summarize(log)
+    assert stats["total"]["wins"] == resumed["wins"] and stats["total"]["draws"] == resumed["draws"]
+
+
+def test_results_log_is_protected(tmp_path):
+    import pytest
+
+    cfg = tmp_path / "versus.json"
+    cfg.write_text(json.dumps(dict(CONFIG, rounds=10)))
+    log = str(tmp_path / "results.jsonl")
+    start_versus(str(cfg), results_path=log)
+
+    # Repetir el comando sin --resume no borra el log
+    with pytest.raises(ValueError, match="--resume"):
+        start_versus(str(cfg), results_path=log)
+    assert len(read_results(log)[1]) == 10
+
+    # Reanudar con otro orden de inicio (SPRT) u otro nº de partidas se rechaza
+    with pytest.raises(ValueError, match="orden de inicio"):
+        start_versus(str(cfg), results_path=log, resume=True, sprt={"elo0": 0, "elo1": 50})
+    cfg.write_text(json.dumps(dict(CONFIG, rounds=20)))
+    with pytest.raises(ValueError, match="10 partidas"):
+        start_versus(str(cfg), results_path=log, resume=True)
+
+    assert start_versus(str(cfg), results_path=log, fresh=True)["games"] == 20
+    assert read_results(log)[0] == {"players": ["Yo", "Random"], "rounds": 20, "order": "halves"}
+
+
+def test_default_results_log_is_new_per_run(tmp_path, monkeypatch):
+    import versus
+
+    monkeypatch.setattr(versus, "RESULTS_DIR", str(tmp_path / "logs"))
+    cfg = tmp_path / "versus.json"
+    cfg.write_text(json.dumps(dict(CONFIG, rounds=6)))
+
+    # Repetir el mismo versus sin opciones de log funciona y no pisa el anterior
+    start_versus(str(cfg))
+    start_versus(str(cfg))
+    logs = sorted((tmp_path / "logs").iterdir())
+    assert len(logs) == 2 and all(len(read_results(str(log))[1]) == 6 for log in logs)
+
+    # --resume sin --results continúa el más reciente
+    latest = versus.latest_results_path(str(cfg))
+    assert start_versus(str(cfg), resume=True)["games"] == 6
+    assert len(list((tmp_path / "logs").iterdir())) == 2 and versus.latest_results_path(str(cfg)) == latest
@@ -0,0 +1,185 @@
+"""
+Modo actor/learner para el self-play de los agentes DQN:
+  - N procesos actores juegan partidas con una copia de la política, que
+    refrescan periódicamente, y envían sus transiciones a una memoria compartida
+  - un único learner (el proceso principal) entrena de forma continua sobre
+    esa memoria y publica los nuevos pesos
+"""
+import multiprocessing as mp
+import os
+import random
+import time
+import numpy as np
+import torch
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+from core import profiling
+from core.replay_buffer import SharedReplayBuffer
+from games.tic_tac_toe.game import TicTacToeGame
+from agents.tic_tac_toe_agent import MyTicTacToeAgent
+from training.evaluation import evaluate_against_fixed, BestModelTracker
+from training.self_play import play_self_play_episode, decay_epsilon
+from core.metrics import create_metrics
+
+
+class SharedWeights:
+    """
+    Vector de parámetros de un modelo en memoria compartida, con un número
+    de versión que se incrementa en cada publicación.
+    """
+    def __init__(self, model):
+        self.size = sum(p.numel() for p in model.parameters())
+        self.lock = mp.Lock()
+        self.raw = mp.RawArray("f", self.size)
+        self.version = mp.RawValue("q", 0)
+        self.publish(model)
+
+    def publish(self, model):
+        vector = parameters_to_vector(model.parameters()).detach().cpu().numpy()
+        with self.lock:
+            np.frombuffer(self.raw, dtype=np.float32)[:] = vector
+            self.version.value += 1
+
+    def pull(self, model, known_version=0):
+        """Carga en `model` los pesos publicados si son más nuevos. Devuelve la versión cargada."""
+        if self.version.value == known_version:
+            return known_version
+        with self.lock:
+            vector = torch.from_numpy(np.frombuffer(self.raw, dtype=np.float32).copy())
+            version = self.version.value
+        device = next(model.parameters()).device
+        vector_to_parameters(vector.to(device), model.parameters())
+        return version
+
+
+def run_actor(actor_id, agent_class, replay, weights, counters, stop_event, sync_interval):
+    """Bucle de un proceso actor: juega self-play y vuelca las transiciones en `replay`."""
+    torch.set_num_threads(1)
+    seed = (os.getpid() * 1000 + actor_id) % 2**32
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+    agents = [agent_class(f"Actor-{actor_id}-{seat}") for seat in range(2)]
+    agents[1].model = agents[0].model  # ambos asientos juegan con la misma política
+    version = weights.pull(agents[0].model)
+    game = TicTacToeGame(num_players=2)
+    episode = 0
+
+    while not stop_event.is_set():
+        steps, _ = play_self_play_episode(game, agents, train=False)
+        decay_epsilon(agents)
+        episode += 1
+
+        for agent in agents:
+            replay.add_batch(*agent.memory.contents())
+            agent.memory.clear()
+
+        with counters["env_steps"].get_lock():
+            counters["env_steps"].value += steps
+        with counters["episodes"].get_lock():
+            counters["episodes"].value += 1
+
+        if episode % sync_interval == 0:
+            version = weights.pull(agents[0].model, version)
+
+
+def run_actor_learner(agent_class, episodes, num_actors=4, updates_per_step=0.5,
+                      publish_interval=50, sync_interval=10, eval_interval=500,
+                      eval_episodes=50, report_interval=10.0, save_dir="models",
+                      async_eval=False, eval_workers=2, agent_kwargs=None, metrics=None, log_dir="runs"):
+    """
+    Entrena un learner con `num_actors` actores hasta completar `episodes` partidas.
+    `updates_per_step` fija la proporción de pasos de gradiente por jugada de los
+    actores (None = el learner entrena sin límite). Con async_eval=True el
+    learner no se detiene para evaluar. `agent_kwargs` se pasa al constructor
+    del learner (p. ej. augment="random"). `metrics` y `log_dir` como en
+    train_sequential (winrate, jugadas/s y pasos de gradiente/s). Devuelve un
+    resumen con jugadas/s y pasos de gradiente/s.
+    """
+    learner = agent_class("DQN-Learner", **(agent_kwargs or {}))
+    replay = SharedReplayBuffer(learner.max_memory)
+    replay.copy_augmentation(learner.memory)
+    learner.memory = replay
+    weights = SharedWeights(learner.model)
+    counters = {"env_steps": mp.Value("q", 0), "episodes": mp.Value("q", 0)}
+    stop_event = mp.Event()
+
+    actors = [
+        mp.Process(target=run_actor, daemon=True,
+                   args=(i, agent_class, replay, weights, counters, stop_event, sync_interval))
+        for i in range(num_actors)
+    ]
+    for p in actors:
+        p.start()
+
+    evaluator = None
+    if async_eval:
+        from training.async_eval import AsyncEvaluator
+        evaluator = AsyncEvaluator(agent_class, MyTicTacToeAgent, TicTacToeGame,
+                                   episodes=eval_episodes, num_workers=eval_workers)
+
+    grad_steps = 0
+    tracker = BestModelTracker(MyTicTacToeAgent.__name__, save_dir=save_dir)
+    writer = create_metrics(metrics, log_dir=log_dir)
+    next_eval = eval_interval
+    start = last_report = time.time()
+    last_env_steps = last_grad_steps = 0
+
+    try:
+        while counters["episodes"].value < episodes:
+            # Ventana por episodios de los actores (el perfil es el del learner)
+            profiling.step(counters["episodes"].value)
+            env_steps = counters["env_steps"].value
+            throttled = updates_per_step is not None and grad_steps >= env_steps * updates_per_step
+            if len(replay) < learner.batch_size or throttled:
+                time.sleep(0.001)
+            else:
+                learner.train_from_memory()
+                grad_steps += 1
+                if grad_steps % publish_interval == 0:
+                    weights.publish(learner.model)
+
+            now = time.time()
+            if now - last_report >= report_interval:
+                elapsed = now - last_report
+                episode = counters["episodes"].value
+                writer.log_scalar("env_steps_per_s", (env_steps - last_env_steps) / elapsed, episode)
+                writer.log_scalar("grad_steps_per_s", (grad_steps - last_grad_steps) / elapsed, episode)
+                print(f"[PERF] env steps/s: {(env_steps - last_env_steps) / elapsed:.0f} | "
+                      f"grad steps/s: {(grad_steps - last_grad_steps) / elapsed:.0f} | "
+                      f"episodes: {counters['episodes'].value} | replay: {len(replay)}")
+                last_report, last_env_steps, last_grad_steps = now, env_steps, grad_steps
+
+            # --- Evaluación periódica ---
+            episode = counters["episodes"].value
+            if episode >= next_eval:
+                next_eval += eval_interval
+                if evaluator:
+                    evaluator.submit(episode, learner.model)
+                else:
+                    winrate = evaluate_against_fixed(learner, MyTicTacToeAgent, TicTacToeGame, episodes=eval_episodes)
+                    tracker.report(episode, winrate, learner.save, writer=writer)
+            if evaluator:
+                tracker.report_async(evaluator.poll(), writer)
+    finally:
+        stop_event.set()
+        for p in actors:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        if evaluator:
+            tracker.report_async(evaluator.close(wait=True), writer)
+        writer.close()
+
+    elapsed = time.time() - start
+    summary = {
+        "episodes": counters["episodes"].value,
+        "env_steps": counters["env_steps"].value,
+        "grad_steps": grad_steps,
+        "env_steps_per_s": counters["env_steps"].value / elapsed,
+        "grad_steps_per_s": grad_steps / elapsed,
+        "best_winrate": tracker.best_winrate,
+    }
+    print(f"[PERF] total → env steps/s: {summary['env_steps_per_s']:.0f} | "
+          f"grad steps/s: {summary['grad_steps_per_s']:.0f}")
+    return summary
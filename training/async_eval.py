@@ -0,0 +1,95 @@
+"""
+Evaluación en segundo plano durante el entrenamiento.
+El trainer envía instantáneas de los pesos con submit() y sigue entrenando;
+varios procesos worker juegan la evaluación en paralelo y poll() devuelve
+los resultados ya terminados sin bloquear.
+"""
+import multiprocessing as mp
+import queue
+import torch
+from training.evaluation import evaluate_against_fixed
+
+
+def _eval_worker(agent_class, opponent_class, game_class, requests, results):
+    torch.set_num_threads(1)
+    agent = agent_class("Eval")
+    agent.device = torch.device("cpu")
+    agent.model.to(agent.device)
+
+    while True:
+        task = requests.get()
+        if task is None:
+            break
+        tag, episodes, state_dict = task
+        agent.model.load_state_dict(state_dict)
+        # greedy en CPU, sin cuantizar para no alterar las jugadas del modelo float
+        agent.enable_inference_mode(quantize=False)
+        winrate = evaluate_against_fixed(agent, opponent_class, game_class, episodes=episodes)
+        results.put((tag, round(winrate * episodes), episodes))
+
+
+class AsyncEvaluator:
+    """
+    Pool de procesos que evalúa instantáneas de un modelo contra un oponente fijo.
+    Cada evaluación de `episodes` partidas se reparte en bloques entre `num_workers` procesos.
+    """
+    def __init__(self, agent_class, opponent_class, game_class, episodes=1000, num_workers=2, chunk_size=100):
+        # spawn: el trainer puede tener CUDA/MPS inicializado
+        ctx = mp.get_context("spawn")
+        self.episodes = episodes
+        self.chunk_size = chunk_size
+        self.requests = ctx.Queue()
+        self.results = ctx.Queue()
+        self.pending = {}  # tag -> [victorias, partidas jugadas, instantánea, epsilon]
+        self.workers = [
+            ctx.Process(target=_eval_worker, daemon=True,
+                        args=(agent_class, opponent_class, game_class, self.requests, self.results))
+            for _ in range(num_workers)
+        ]
+        for p in self.workers:
+            p.start()
+
+    def submit(self, tag, model, epsilon=None):
+        """
+        Encola la evaluación de una copia de los pesos actuales de `model`
+        (`epsilon` es el del agente en ese momento, para el informe).
+        """
+        snapshot = {k: v.detach().cpu().clone() for k, v in model.state_dict().items()}
+        self.pending[tag] = [0, 0, snapshot, epsilon]
+        remaining = self.episodes
+        while remaining > 0:
+            chunk = min(self.chunk_size, remaining)
+            self.requests.put((tag, chunk, snapshot))
+            remaining -= chunk
+
+    def poll(self, block=False):
+        """
+        Devuelve la lista de evaluaciones completadas [(tag, winrate, instantánea, epsilon)].
+        Con block=True espera a que termine al menos una de las pendientes.
+        """
+        finished = []
+        while self.pending:
+            try:
+                tag, wins, played = self.results.get(block=block and not finished)
+            except queue.Empty:
+                break
+            entry = self.pending[tag]
+            entry[0] += wins
+            entry[1] += played
+            if entry[1] >= self.episodes:
+                del self.pending[tag]
+                finished.append((tag, entry[0] / entry[1], entry[2], entry[3]))
+        return finished
+
+    def close(self, wait=True):
+        """Termina los workers; con wait=True devuelve antes las evaluaciones pendientes."""
+        finished = []
+        while wait and self.pending:
+            finished.extend(self.poll(block=True))
+        for _ in self.workers:
+            self.requests.put(None)
+        for p in self.workers:
+            p.join(timeout=10)
+            if p.is_alive():
+                p.terminate()
+        return finished
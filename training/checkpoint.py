@@ -0,0 +1,154 @@
+"""
+Checkpoints completos de entrenamiento para los agentes DQN.
+
+Cada checkpoint es un directorio `ckpt-<n>/` con:
+  - state.pt: redes online y target, optimizador, epsilon, train_step, última
+    jugada de cada agente, estado del bucle de entrenamiento y de los RNG
+  - replay_<i>/: la memoria de cada agente en ficheros .npy (memory-mapped);
+    una memoria compartida entre agentes se guarda una sola vez
+El fichero `latest` apunta al último checkpoint completo. El directorio se
+escribe con otro nombre y se renombra al terminar, y `latest` se sustituye con
+os.replace, así que un proceso matado a mitad nunca deja un checkpoint corrupto.
+Se conservan los `keep` checkpoints guardados más recientemente (por fecha de
+state.pt, no por nombre: una ejecución nueva puede escribir ckpt-00001000 en un
+directorio con ckpt-00030000 de otra anterior), y nunca el que nombra `latest`.
+"""
+import os
+import random
+import shutil
+import numpy as np
+import torch
+from core.replay_buffer import ReplayBuffer
+
+LATEST = "latest"
+
+
+def _write_atomic(path, write):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def agent_state(agent):
+    return {
+        "model": agent.model.state_dict(),
+        "target_model": agent.target_model.state_dict(),
+        "optimizer": agent.optimizer.state_dict(),
+        "epsilon": agent.epsilon,
+        "train_step": agent.train_step,
+        "last_state": agent.last_state,
+        "last_action": getattr(agent, "last_action", None),
+        "replay_rng": agent.memory.rng.bit_generator.state,
+    }
+
+
+def load_agent_state(agent, state):
+    agent.model.load_state_dict(state["model"])
+    agent.target_model.load_state_dict(state["target_model"])
+    agent.optimizer.load_state_dict(state["optimizer"])
+    agent.epsilon = state["epsilon"]
+    agent.train_step = state["train_step"]
+    agent.last_state = state["last_state"]
+    agent.last_action = state["last_action"]
+
+
+def rng_state():
+    return {"python": random.getstate(), "numpy": np.random.get_state(), "torch": torch.get_rng_state()}
+
+
+def load_rng_state(state):
+    random.setstate(state["python"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+
+
+class Checkpointer:
+    """Guarda y recupera checkpoints completos en `directory`, conservando los `keep` últimos."""
+
+    def __init__(self, directory="checkpoints", keep=2):
+        self.directory = directory
+        self.keep = keep
+
+    def save(self, tag, agents, trainer_state):
+        """Escribe el checkpoint `tag` (p. ej. el nº de episodio) y lo marca como el último."""
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"ckpt-{tag:08d}"
+        final_dir = os.path.join(self.directory, name)
+        tmp_dir = final_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        # Índice del primer agente que usa cada memoria (memorias compartidas)
+        owners = [next(j for j, a in enumerate(agents) if a.memory is agent.memory) for agent in agents]
+        for i, agent in enumerate(agents):
+            if owners[i] == i:
+                agent.memory.save(os.path.join(tmp_dir, f"replay_{i}"))
+        state = {
+            "trainer": trainer_state,
+            "agents": [agent_state(a) for a in agents],
+            "replay_owners": owners,
+            "rng": rng_state(),
+        }
+        _write_atomic(os.path.join(tmp_dir, "state.pt"), lambda f: torch.save(state, f))
+
+        # El anterior con el mismo nombre se aparta (no se borra) hasta que el nuevo está en su sitio
+        old_dir = final_dir + ".old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(final_dir):
+            os.replace(final_dir, old_dir)
+        os.replace(tmp_dir, final_dir)
+        _write_atomic(os.path.join(self.directory, LATEST), lambda f: f.write(name.encode()))
+        shutil.rmtree(old_dir, ignore_errors=True)
+        self._prune(keep_names={name})
+        return final_dir
+
+    def latest(self):
+        path = os.path.join(self.directory, LATEST)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return os.path.join(self.directory, f.read().strip())
+
+    def load_latest(self, agents, mmap_mode="c"):
+        """
+        Restaura agentes, memorias (memory-mapped) y RNG desde el último checkpoint.
+        Devuelve el estado del bucle de entrenamiento, o None si no hay checkpoint.
+        """
+        checkpoint_dir = self.latest()
+        if checkpoint_dir is None:
+            return None
+
+        state = torch.load(os.path.join(checkpoint_dir, "state.pt"), weights_only=False)
+        owners = state.get("replay_owners", range(len(agents)))
+        for i, (agent, saved, owner) in enumerate(zip(agents, state["agents"], owners)):
+            load_agent_state(agent, saved)
+            if owner != i:
+                agent.memory = agents[owner].memory
+                continue
+            memory = ReplayBuffer.open(os.path.join(checkpoint_dir, f"replay_{i}"), mmap_mode=mmap_mode)
+            memory.copy_augmentation(agent.memory)
+            agent.memory = memory
+            agent.memory.rng.bit_generator.state = saved["replay_rng"]
+        load_rng_state(state["rng"])
+        print(f"[INFO] Reanudando desde {checkpoint_dir}")
+        return state["trainer"]
+
+    def _saved_at(self, name):
+        path = os.path.join(self.directory, name, "state.pt")
+        return os.path.getmtime(path) if os.path.exists(path) else 0.0
+
+    def _prune(self, keep_names=()):
+        """Borra los checkpoints más antiguos (por orden de guardado) salvo los `keep` últimos y `latest`."""
+        checkpoints = [d for d in os.listdir(self.directory)
+                       if d.startswith("ckpt-") and d[len("ckpt-"):].isdigit()]
+        checkpoints.sort(key=lambda d: (self._saved_at(d), d))
+        protected = set(keep_names)
+        latest = self.latest()
+        if latest is not None:
+            protected.add(os.path.basename(latest))
+        for old in checkpoints[:-self.keep] if self.keep > 0 else checkpoints:
+            if old not in protected:
+                shutil.rmtree(os.path.join(self.directory, old), ignore_errors=True)
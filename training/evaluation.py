@@ -0,0 +1,78 @@
+import os
+
+
+def evaluate_against_fixed(agent, opponent_class, game_class, episodes=50):
+    """
+    Evalúa `agent` contra un oponente fijo (RandomAgent o custom).
+    Devuelve winrate del `agent` (porcentaje de victorias del agent en estas partidas).
+    """
+    wins = 0
+    prev_epsilon = agent.epsilon
+    agent.epsilon = 0.0  # solo explotación durante la evaluación
+
+    for _ in range(episodes):
+        game = game_class(num_players=2)
+        game.reset()
+        done = False
+        opponent = opponent_class("Rival")
+        eval_agents = [agent, opponent]  # agent siempre en posición 0 para esta evaluación
+
+        while not done:
+            current_players = game.get_current_players()
+            player_actions = []
+            for p_idx in current_players:
+                valid = game.valid_actions(p_idx)
+                # pedimos el estado completo a los agentes (API: act(state, valid_actions))
+                action = eval_agents[p_idx].act(game.get_state(), valid)
+                player_actions.append((p_idx, action))
+            _, rewards, done = game.step(player_actions)
+
+        # rewards es lista de recompensas por jugador; ganar da +3 al ganador
+        if isinstance(rewards, list):
+            if rewards[0] >= 3:
+                wins += 1
+        else:
+            # Si por algún motivo reward viene como escalar (versiones antiguas), asumimos index 0
+            if rewards >= 3:
+                wins += 1
+
+    agent.epsilon = prev_epsilon
+    return wins / episodes
+
+
+class BestModelTracker:
+    """Guarda el modelo en `save_dir` cada vez que mejora el winrate contra el oponente fijo."""
+
+    def __init__(self, opponent_name, save_dir="models", best_winrate=0.0):
+        self.opponent_name = opponent_name
+        self.save_dir = save_dir
+        self.best_winrate = best_winrate
+
+    def update(self, winrate, save):
+        """`save(path)` escribe el modelo evaluado. Devuelve True si era el mejor hasta ahora."""
+        if winrate <= self.best_winrate:
+            return False
+        self.best_winrate = winrate
+        os.makedirs(self.save_dir, exist_ok=True)
+        save_path = os.path.join(self.save_dir, f"best_model_vs_{self.opponent_name}.pth")
+        save(save_path)
+        print(f"💾 Nuevo MEJOR modelo guardado contra {self.opponent_name}! -> {save_path}")
+        return True
+
+    def report(self, episode, winrate, save, epsilon=None, writer=None):
+        """Muestra (y registra en `writer`) una evaluación y guarda el modelo si mejora."""
+        if writer is not None:
+            writer.log_scalar("winrate_vs_fixed", winrate, episode)
+        line = f"[EVAL] Ep {episode} → winrate vs {self.opponent_name}: {winrate:.2f}"
+        if epsilon is not None:
+            line += f" | ε={epsilon:.3f}"
+        print(line)
+        return self.update(winrate, save)
+
+    def report_async(self, results, writer=None):
+        """report() de los resultados de AsyncEvaluator: (episodio, winrate, instantánea, epsilon)."""
+        import torch  # solo con evaluación asíncrona, que ya trabaja con pesos de torch
+
+        for episode, winrate, snapshot, epsilon in results:
+            self.report(episode, winrate, lambda path, snapshot=snapshot: torch.save(snapshot, path),
+                        epsilon=epsilon, writer=writer)
@@ -0,0 +1,326 @@
+"""
+Entrenamiento en liga (población de agentes):
+  - varios learners entrenan jugando contra rivales elegidos de la liga,
+    con preferencia por aquellos a los que todavía no ganan
+  - cada `snapshot_interval` rondas se congela una copia de cada learner
+  - un pool de procesos juega partidas de rating entre miembros con ratings
+    parecidos y se actualiza una tabla Elo
+
+Los pesos congelados se guardan como vectores .npy en `league_dir/frozen/` y
+los workers los abren con memory-map: los parámetros del modelo son vistas
+sobre el fichero, así que las páginas se comparten entre procesos y tener
+cientos de rivales no multiplica la RAM.
+"""
+import json
+import multiprocessing as mp
+import os
+import random
+import numpy as np
+import torch
+from torch.nn.utils import parameters_to_vector
+from tqdm import tqdm
+from games.tic_tac_toe.game import TicTacToeGame
+from games.tic_tac_toe.compact import board_features
+from agents.random_agent import RandomAgent
+from agents.tic_tac_toe_agent import MyTicTacToeAgent
+from agents.dqn_inference import greedy_action
+from core.base_agent import BaseAgent
+from training.self_play import decay_epsilon
+from core import profiling
+from core.metrics import create_metrics
+
+HEURISTICS = {"my": MyTicTacToeAgent, "random": RandomAgent}
+INITIAL_RATING = 1000.0
+ELO_K = 16.0
+FROZEN_EPSILON = 0.05  # algo de exploración para que las partidas entre redes no se repitan
+
+
+def save_weights(model, path):
+    """Guarda los parámetros de `model` como un vector float32 (escritura atómica)."""
+    vector = parameters_to_vector(model.parameters()).detach().cpu().numpy().astype(np.float32)
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, vector)
+    os.replace(tmp_path, path)
+
+
+def map_weights(model, path):
+    """Sustituye los parámetros de `model` por vistas de solo lectura sobre el fichero `path`."""
+    # mmap_mode="c": páginas compartidas mientras nadie escriba (y nadie escribe)
+    vector = torch.from_numpy(np.load(path, mmap_mode="c"))
+    offset = 0
+    with torch.no_grad():
+        for param in model.parameters():
+            n = param.numel()
+            param.data = vector[offset:offset + n].view_as(param)
+            offset += n
+    model.requires_grad_(False)
+    return model
+
+
+class FrozenPolicy(BaseAgent):
+    """
+    Rival congelado de la liga: solo la red Q (sin memoria, target network ni
+    optimizador), con epsilon-greedy sobre las acciones válidas.
+    """
+
+    def __init__(self, name, model, epsilon=FROZEN_EPSILON):
+        super().__init__(name)
+        self.model = model.eval()
+        self.epsilon = epsilon
+
+    def act(self, state, valid_actions):
+        if random.random() < self.epsilon:
+            return random.choice(valid_actions)
+        board = torch.from_numpy(board_features(state)).view(1, -1)
+        with torch.no_grad():
+            q_values = self.model(board)[0].numpy()
+        return greedy_action(q_values, valid_actions)
+
+
+class PolicyCache:
+    """Políticas de la liga ya cargadas en este proceso (una por fichero y versión)."""
+
+    def __init__(self, agent_class):
+        self.agent_class = agent_class
+        self.policies = {}
+
+    def get(self, member):
+        source, version = member["source"], member.get("version", 0)
+        cached = self.policies.get(source)
+        if cached is None or cached[0] != version:
+            # Una versión nueva de un learner sustituye a la anterior
+            if member["kind"] == "heuristic":
+                policy = HEURISTICS[source]("League")
+            else:
+                # Solo la red del agente, con los pesos mapeados del fichero
+                policy = FrozenPolicy("League", map_weights(self.agent_class.build_network(), source))
+            self.policies[source] = cached = (version, policy)
+        return cached[1]
+
+
+def play_match(policies, games):
+    """Juega `games` partidas alternando quién empieza. Devuelve (victorias 0, victorias 1, empates)."""
+    game = TicTacToeGame(num_players=2)
+    results = [0, 0, 0]
+    for g in range(games):
+        seats = [0, 1] if g % 2 == 0 else [1, 0]  # seats[p] = índice de la política en el asiento p
+        game.reset()
+        done = False
+        while not done:
+            player_actions = []
+            for p_idx in game.get_current_players():
+                action = policies[seats[p_idx]].act(game.get_state(), game.valid_actions(p_idx))
+                player_actions.append((p_idx, action))
+            _, _, done = game.step(player_actions)
+        winner = game.get_winner()
+        results[2 if winner is None else seats[winner]] += 1
+    return results
+
+
+_worker_cache = None
+
+
+def _init_worker(agent_class):
+    global _worker_cache
+    torch.set_num_threads(1)
+    _worker_cache = PolicyCache(agent_class)
+
+
+def _match_worker(task):
+    a, b, games = task
+    return play_match([_worker_cache.get(a), _worker_cache.get(b)], games)
+
+
+class League:
+    """Miembros de la liga (heurísticos, congelados y learners), resultados y tabla Elo."""
+
+    def __init__(self, directory="league"):
+        self.directory = directory
+        self.members = {}
+        self.results = {}  # (a, b) -> [victorias a, victorias b, empates]
+        os.makedirs(os.path.join(directory, "frozen"), exist_ok=True)
+
+    def add(self, name, kind, source, version=0):
+        member = self.members.setdefault(name, {"kind": kind, "rating": INITIAL_RATING, "games": 0})
+        member.update(source=source, version=version)
+        return member
+
+    def add_heuristic(self, name, key):
+        return self.add(name, "heuristic", key)
+
+    def freeze(self, name, model, kind="frozen", version=0):
+        """Guarda los pesos de `model` en la liga como el miembro `name`."""
+        path = os.path.join(self.directory, "frozen", f"{name}.npy")
+        save_weights(model, path)
+        return self.add(name, kind, path, version)
+
+    def record(self, a, b, wins_a, wins_b, draws):
+        """
+        Acumula el resultado de un enfrentamiento y actualiza el Elo de ambos
+        partida a partida (con la puntuación media del enfrentamiento), así que
+        cada partida mueve el rating como mucho ELO_K puntos.
+        """
+        if a > b:
+            a, b, wins_a, wins_b = b, a, wins_b, wins_a
+        totals = self.results.setdefault((a, b), [0, 0, 0])
+        for i, n in enumerate((wins_a, wins_b, draws)):
+            totals[i] += n
+
+        games = wins_a + wins_b + draws
+        score_a = (wins_a + 0.5 * draws) / max(games, 1)
+        for _ in range(games):
+            ra, rb = self.members[a]["rating"], self.members[b]["rating"]
+            expected_a = 1.0 / (1.0 + 10 ** ((rb - ra) / 400))
+            delta = ELO_K * (score_a - expected_a)
+            self.members[a]["rating"] += delta
+            self.members[b]["rating"] -= delta
+        self.members[a]["games"] += games
+        self.members[b]["games"] += games
+
+    def winrate(self, a, b):
+        """Puntuación media de `a` contra `b` (victoria 1, empate 0.5); 0.5 si no se han enfrentado."""
+        key = (a, b) if a < b else (b, a)
+        wins = self.results.get(key)
+        if not wins or not sum(wins):
+            return 0.5
+        wins_a, wins_b = (wins[0], wins[1]) if a < b else (wins[1], wins[0])
+        return (wins_a + 0.5 * wins[2]) / sum(wins)
+
+    def pick_opponent(self, name, rng=random):
+        """Rival de entrenamiento para `name`: más probable cuanto peor le va contra él."""
+        candidates = [m for m in self.members if m != name]
+        weights = [(1.0 - self.winrate(name, m)) ** 2 + 0.01 for m in candidates]
+        return rng.choices(candidates, weights=weights)[0]
+
+    def schedule(self, num_matches, rng=random):
+        """
+        Parejas para las partidas de rating: se priorizan las de rating parecido
+        (resultado más incierto) y los miembros con pocas partidas.
+        """
+        names = list(self.members)
+        pairs = [(a, b) for i, a in enumerate(names) for b in names[i + 1:]]
+
+        def priority(pair):
+            a, b = (self.members[n] for n in pair)
+            gap = abs(a["rating"] - b["rating"])
+            return gap / 100 + min(a["games"], b["games"]) / 200 + rng.random() * 0.1
+        return sorted(pairs, key=priority)[:num_matches]
+
+    def table(self):
+        return sorted(((name, m["rating"], m["games"]) for name, m in self.members.items()),
+                      key=lambda row: -row[1])
+
+    def save(self):
+        state = {
+            "members": self.members,
+            "results": [[a, b, *r] for (a, b), r in self.results.items()],
+        }
+        with open(os.path.join(self.directory, "league.json"), "w") as f:
+            json.dump(state, f, indent=2)
+
+    def print_table(self):
+        print("[LEAGUE] Rating")
+        for name, rating, games in self.table():
+            print(f"  {name:<24} {rating:7.1f}  ({games} partidas)")
+
+
+def play_training_episode(game, learner, opponent, learner_seat):
+    """
+    Partida de entrenamiento contra un rival de la liga: solo el learner observa
+    y entrena (mismo esquema que el self-play). Devuelve la lista de pérdidas.
+    """
+    agents = [opponent, learner] if learner_seat else [learner, opponent]
+    game.reset()
+    state = game.get_state()
+    done = False
+    losses = []
+
+    while not done:
+        player_actions = []
+        for p_idx in game.get_current_players():
+            action = agents[p_idx].act(state, game.valid_actions(p_idx))
+            if p_idx == learner_seat:
+                learner.set_last(state, action)
+            player_actions.append((p_idx, action))
+
+        next_state, rewards, done = game.step(player_actions)
+        learner.observe(next_state, rewards[learner_seat], done, learner_seat)
+        loss = learner.train_from_memory()
+        if loss is not None:
+            losses.append(loss)
+        state = next_state
+
+    learner.last_state = None
+    return losses
+
+
+def train_league(agent_class, rounds, num_learners=2, episodes_per_round=200, snapshot_interval=5,
+                 rating_matches=16, games_per_match=20, workers=2, league_dir="league",
+                 agent_kwargs=None, metrics=None, log_dir="runs"):
+    """
+    Entrena `num_learners` agentes `agent_class` durante `rounds` rondas de
+    `episodes_per_round` partidas cada uno contra rivales de la liga.
+    Tras cada ronda se juegan `rating_matches` enfrentamientos de rating en
+    `workers` procesos (0 = en este mismo proceso). `metrics` y `log_dir` como
+    en train_sequential (pérdida y epsilon de cada learner y rating de cada
+    miembro, por ronda). Devuelve la liga.
+    """
+    league = League(league_dir)
+    for key, cls in HEURISTICS.items():
+        league.add_heuristic(cls.__name__, key)
+
+    learners = {f"Learner-{i}": agent_class(f"Learner-{i}", **(agent_kwargs or {})) for i in range(num_learners)}
+    for name, learner in learners.items():
+        league.freeze(name, learner.model, kind="learner")
+
+    cache = PolicyCache(agent_class)
+    pool = None
+    if workers > 0:
+        # spawn: los workers solo heredan lo necesario y abren los pesos con memory-map
+        pool = mp.get_context("spawn").Pool(workers, initializer=_init_worker, initargs=(agent_class,))
+
+    writer = create_metrics(metrics, log_dir=log_dir)
+    game = TicTacToeGame(num_players=2)
+    try:
+        for round_idx in tqdm(range(1, rounds + 1)):
+            profiling.step(round_idx)
+            # --- Partidas de entrenamiento contra rivales de la liga ---
+            for name, learner in learners.items():
+                losses = []
+                for episode in range(episodes_per_round):
+                    opponent = league.pick_opponent(name)
+                    policy = learners[opponent] if opponent in learners else cache.get(league.members[opponent])
+                    losses.extend(play_training_episode(game, learner, policy, episode % 2))
+                    decay_epsilon([learner])
+                if losses:
+                    print(f"[TRAIN] Ronda {round_idx} {name} → loss={np.mean(losses):.4f} | ε={learner.epsilon:.3f}")
+                    writer.log_scalar(f"loss/{name}", np.mean(losses), round_idx)
+                writer.log_scalar(f"epsilon/{name}", learner.epsilon, round_idx)
+
+                # Pesos actuales del learner, visibles para los workers de rating
+                league.freeze(name, learner.model, kind="learner", version=round_idx)
+                if round_idx % snapshot_interval == 0:
+                    league.freeze(f"{name}@{round_idx}", learner.model)
+
+            # --- Partidas de rating en paralelo ---
+            pairs = league.schedule(rating_matches)
+            tasks = [(league.members[a], league.members[b], games_per_match) for a, b in pairs]
+            if pool:
+                outcomes = pool.map(_match_worker, tasks)
+            else:
+                outcomes = [play_match([cache.get(a), cache.get(b)], games) for a, b, games in tasks]
+            for (a, b), outcome in zip(pairs, outcomes):
+                league.record(a, b, *outcome)
+            league.save()
+            for member, rating, _ in league.table():
+                writer.log_scalar(f"rating/{member}", rating, round_idx)
+    finally:
+        writer.close()
+        if pool:
+            pool.close()
+            pool.join()
+
+    league.print_table()
+    for name, learner in learners.items():
+        learner.save(os.path.join(league_dir, f"{name}.pth"))
+    return league
@@ -0,0 +1,239 @@
+"""
+Datos de entrenamiento offline: se generan una vez (en varios procesos) y se
+reutilizan en tantos entrenamientos como se quiera sin volver a simular partidas.
+
+Un dataset es un directorio con:
+  - dataset.json: agentes usados, nº de partidas/transiciones y lista de shards
+  - shard-<worker>-<n>/: transiciones en el formato de ReplayBuffer.save()
+    (un .npy de ancho fijo por campo), que se leen con memory-map
+"""
+import glob
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import threading
+import time
+import numpy as np
+from core import profiling
+from core.metrics import create_metrics
+from core.replay_buffer import ReplayBuffer
+from games.tic_tac_toe.game import TicTacToeGame
+from agents.random_agent import RandomAgent
+from agents.tic_tac_toe_agent import MyTicTacToeAgent
+from training.evaluation import evaluate_against_fixed, BestModelTracker
+
+MANIFEST = "dataset.json"
+DATA_AGENTS = {"my": MyTicTacToeAgent, "random": RandomAgent}
+
+
+def _write_shard(buffer, directory):
+    """Guarda solo las transiciones ocupadas de `buffer` (shard de tamaño exacto)."""
+    shard = ReplayBuffer(len(buffer), obs_size=buffer.obs_size)
+    shard.add_batch(*buffer.contents())
+    shard.save(directory)
+    buffer.clear()
+    return len(shard)
+
+
+def generate_shards(worker_id, agent_names, games, out_dir, shard_size=100_000, seed=None):
+    """
+    Juega `games` partidas entre los agentes `agent_names` (claves de DATA_AGENTS),
+    alternando quién empieza, y guarda las transiciones de ambos jugadores con el
+    mismo esquema que el self-play: tras cada jugada, cada jugador registra
+    (su último estado, su última acción, su recompensa, estado siguiente, done).
+    Devuelve [(nombre del shard, nº de transiciones)].
+    """
+    if seed is not None:
+        random.seed(seed + worker_id)
+        np.random.seed(seed + worker_id)
+
+    buffer = ReplayBuffer(shard_size)
+    shards = []
+
+    def flush():
+        name = f"shard-{worker_id:03d}-{len(shards):05d}"
+        shards.append((name, _write_shard(buffer, os.path.join(out_dir, name))))
+
+    players = [DATA_AGENTS[name](f"Data-{i}") for i, name in enumerate(agent_names)]
+    game = TicTacToeGame(num_players=2)
+    for g in range(games):
+        # Alternar el asiento de cada agente para tener ambas perspectivas
+        agents = players[::-1] if g % 2 else players
+        last = [None, None]
+
+        game.reset()
+        state = game.get_state()
+        done = False
+        while not done:
+            player_actions = []
+            for p_idx in game.get_current_players():
+                action = agents[p_idx].act(state, game.valid_actions(p_idx))
+                last[p_idx] = (state, action)
+                player_actions.append((p_idx, action))
+            next_state, rewards, done = game.step(player_actions)
+
+            if len(buffer) + len(rewards) > shard_size:
+                flush()
+            for p_idx, reward in enumerate(rewards):
+                if last[p_idx] is not None:
+                    buffer.append(*last[p_idx], reward, next_state, done)
+            state = next_state
+
+    if len(buffer):
+        flush()
+    return shards
+
+
+def _generate_worker(args):
+    return generate_shards(*args)
+
+
+def generate_dataset(out_dir, games, agent_names=("my", "random"), workers=1, shard_size=100_000, seed=None):
+    """Reparte `games` partidas entre `workers` procesos y escribe el manifiesto del dataset."""
+    os.makedirs(out_dir, exist_ok=True)
+    per_worker = [games // workers + (i < games % workers) for i in range(workers)]
+    jobs = [(i, list(agent_names), n, out_dir, shard_size, seed) for i, n in enumerate(per_worker) if n]
+
+    start = time.time()
+    if workers > 1:
+        with mp.Pool(workers) as pool:
+            results = pool.map(_generate_worker, jobs)
+    else:
+        results = [_generate_worker(job) for job in jobs]
+    shards = [shard for worker_shards in results for shard in worker_shards]
+
+    manifest = {
+        "agents": list(agent_names),
+        "games": games,
+        "transitions": sum(n for _, n in shards),
+        "shards": [{"name": name, "size": n} for name, n in shards],
+    }
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"[INFO] {manifest['transitions']} transiciones de {games} partidas en "
+          f"{len(shards)} shards ({time.time() - start:.1f}s) -> {out_dir}")
+    return manifest
+
+
+class ShardLoader:
+    """
+    Itera mini-batches barajados de un dataset generado con generate_dataset().
+    En cada época se baraja el orden de los shards y, dentro de cada shard, el
+    orden de las transiciones; un hilo en segundo plano prepara hasta `prefetch`
+    batches mientras el entrenamiento consume los anteriores.
+    """
+    def __init__(self, data_dir, batch_size=64, epochs=1, prefetch=8, seed=None):
+        manifest_path = os.path.join(data_dir, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                names = [s["name"] for s in json.load(f)["shards"]]
+            self.shard_dirs = [os.path.join(data_dir, name) for name in names]
+        else:
+            self.shard_dirs = sorted(glob.glob(os.path.join(data_dir, "shard-*")))
+        if not self.shard_dirs:
+            raise ValueError(f"No hay shards de datos en {data_dir}")
+
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.prefetch = prefetch
+        self.rng = np.random.default_rng(seed)
+
+    def _batches(self):
+        for _ in range(self.epochs):
+            for shard_idx in self.rng.permutation(len(self.shard_dirs)):
+                shard = ReplayBuffer.open(self.shard_dirs[shard_idx], mmap_mode="r")
+                order = self.rng.permutation(len(shard))
+                # El último batch de cada shard puede ser más pequeño (shards < batch_size incluidos)
+                for start in range(0, len(order), self.batch_size):
+                    # Índices ordenados: lectura más secuencial del fichero mapeado
+                    idx = np.sort(order[start:start + self.batch_size])
+                    yield (np.asarray(shard.boards[idx]), np.asarray(shard.actions[idx]),
+                           np.asarray(shard.rewards[idx]), np.asarray(shard.next_boards[idx]),
+                           np.asarray(shard.dones[idx]))
+
+    def __iter__(self):
+        batches = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        end = object()
+        errors = []  # excepción del hilo productor (shard corrupto o que falta), se relanza aquí
+
+        def produce():
+            try:
+                for batch in self._batches():
+                    while not stop.is_set():
+                        try:
+                            batches.put(batch, timeout=0.1)
+                            break
+                        except queue.Full:
+                            pass
+                    if stop.is_set():
+                        return
+            except Exception as e:
+                errors.append(e)
+            finally:
+                if not stop.is_set():
+                    batches.put(end)
+
+        worker = threading.Thread(target=produce, daemon=True)
+        worker.start()
+        try:
+            while (batch := batches.get()) is not end:
+                yield batch
+            if errors:
+                raise errors[0]
+        finally:
+            stop.set()
+
+
+def train_offline(agent_class, data_dir, epochs=1, batch_size=None, prefetch=8, eval_interval=1000,
+                  eval_episodes=50, save_dir="models", agent_kwargs=None, seed=None, metrics=None,
+                  log_dir="runs"):
+    """
+    Entrena un agente `agent_class` solo con las transiciones de `data_dir`
+    (sin jugar partidas), evaluándolo cada `eval_interval` pasos de gradiente.
+    `metrics` y `log_dir` como en train_sequential (pérdida y winrate por paso).
+    Devuelve un resumen con pasos de gradiente/s y el mejor winrate.
+    """
+    agent = agent_class("DQN-Offline", **(agent_kwargs or {}))
+    if batch_size:
+        agent.batch_size = batch_size
+    # Mismo aumento de datos que sample(): con "all" se leen batch_size / K transiciones y se usan sus K variantes
+    augment = agent.memory.augment
+    read_size = agent.batch_size
+    if augment == "all":
+        read_size = max(1, agent.batch_size // len(agent.memory.permutations))
+    loader = ShardLoader(data_dir, batch_size=read_size, epochs=epochs, prefetch=prefetch, seed=seed)
+    tracker = BestModelTracker(MyTicTacToeAgent.__name__, save_dir=save_dir)
+    writer = create_metrics(metrics, log_dir=log_dir)
+
+    grad_steps = 0
+    losses = []
+    start = time.time()
+    for batch in loader:
+        if augment:
+            batch = agent.memory.augment_batch(*batch)
+        losses.append(agent.train_on_batch(*batch))
+        grad_steps += 1
+        profiling.step(grad_steps)
+
+        # --- Evaluación periódica ---
+        if eval_interval and grad_steps % eval_interval == 0:
+            winrate = evaluate_against_fixed(agent, MyTicTacToeAgent, TicTacToeGame, episodes=eval_episodes)
+            print(f"[EVAL] Paso {grad_steps} → winrate vs {MyTicTacToeAgent.__name__}: {winrate:.2f} | "
+                  f"loss={np.mean(losses):.4f}")
+            writer.log_scalar("loss", np.mean(losses), grad_steps)
+            writer.log_scalar("winrate_vs_fixed", winrate, grad_steps)
+            losses = []
+            tracker.update(winrate, agent.save)
+
+    writer.close()
+    elapsed = time.time() - start
+    summary = {
+        "grad_steps": grad_steps,
+        "grad_steps_per_s": grad_steps / elapsed if elapsed else 0.0,
+        "best_winrate": tracker.best_winrate,
+    }
+    print(f"[PERF] grad steps/s: {summary['grad_steps_per_s']:.0f} | grad steps: {grad_steps}")
+    return summary
@@ -0,0 +1,71 @@
+def play_self_play_episode(game, agents, train=True):
+    """
+    Juega una partida de self-play completa.
+    Tras cada jugada todos los agentes observan el resultado y, si train=True,
+    entrenan un paso desde su memoria (mismo esquema que train_dqn.py).
+    Devuelve (número de jugadas, lista de pérdidas).
+    """
+    game.reset()
+    state = game.get_state()
+    done = False
+    steps = 0
+    losses = []
+
+    while not done:
+        current_players = game.get_current_players()  # lista de índices de jugadores que deben actuar
+        player_actions = []
+
+        for p_idx in current_players:
+            valid = game.valid_actions(p_idx)
+            action = agents[p_idx].act(state, valid)
+            agents[p_idx].set_last(state, action)
+            player_actions.append((p_idx, action))
+
+        # Ejecutar el turno
+        next_state, rewards, done = game.step(player_actions)
+        steps += 1
+
+        # Almacenar experiencia y entrenar (una vez por red distinta)
+        for p_idx, reward in enumerate(rewards):
+            agents[p_idx].observe(next_state, reward, done, p_idx)
+        if train:
+            for agent in learners(agents):
+                loss = agent.train_from_memory()
+                if loss is not None:
+                    losses.append(loss)
+
+        state = next_state
+
+    return steps, losses
+
+
+def decay_epsilon(agents):
+    """Decay de epsilon al final de cada episodio."""
+    for a in agents:
+        a.epsilon = max(a.epsilon_min, a.epsilon * a.epsilon_decay)
+
+
+def share_experience(agents, share_network=False):
+    """
+    Self-play con memoria compartida: todos los asientos guardan sus transiciones
+    en la memoria del primero (los estados ya vienen normalizados desde la
+    perspectiva de cada jugador). Con share_network=True comparten además red,
+    red target y optimizador, y solo el primero entrena.
+    """
+    first = agents[0]
+    for agent in agents[1:]:
+        agent.memory = first.memory
+        if share_network:
+            agent.model, agent.target_model, agent.optimizer = first.model, first.target_model, first.optimizer
+    return agents
+
+
+def learners(agents):
+    """Agentes que deben dar pasos de gradiente: uno por cada red distinta."""
+    seen = set()
+    unique = []
+    for agent in agents:
+        if id(agent.model) not in seen:
+            seen.add(id(agent.model))
+            unique.append(agent)
+    return unique
@@ -0,0 +1,94 @@
+"""
+Bucle de entrenamiento self-play clásico: una partida tras otra, con un paso
+de gradiente por agente después de cada jugada.
+"""
+import numpy as np
+from tqdm import tqdm
+from games.tic_tac_toe.game import TicTacToeGame
+from agents.tic_tac_toe_agent import MyTicTacToeAgent
+from training.evaluation import evaluate_against_fixed, BestModelTracker
+from training.self_play import play_self_play_episode, decay_epsilon, share_experience
+from training.checkpoint import Checkpointer
+from core.metrics import create_metrics
+from core import profiling
+
+
+def train_sequential(agent_class, episodes, eval_interval=500, eval_episodes=50,
+                     resume=False, checkpoint_dir="checkpoints", checkpoint_interval=1000,
+                     async_eval=False, eval_workers=2, save_dir="models", agent_kwargs=None,
+                     metrics=None, log_dir="runs", shared=None):
+    """
+    Entrena dos agentes `agent_class` en self-play durante `episodes` partidas.
+    Con async_eval=True la evaluación periódica se hace en procesos en segundo
+    plano (sobre una copia de los pesos) sin detener el entrenamiento.
+    `agent_kwargs` se pasa al constructor de los agentes (p. ej. augment="random").
+    Con `metrics` ("jsonl", "csv" o "tensorboard") se registran métricas en
+    `log_dir`; con None no se registran. shared="memory" hace que ambos agentes usen
+    una sola memoria; shared="network", además una sola red (un paso de gradiente por jugada).
+    Devuelve los agentes entrenados.
+    """
+    # --- Inicialización agentes (self-play) ---
+    agent1 = agent_class("DQN-1", **(agent_kwargs or {}))
+    agent2 = agent_class("DQN-2", **(agent_kwargs or {}))
+    agents = [agent1, agent2]
+    if shared:
+        share_experience(agents, share_network=shared == "network")
+
+    # --- Métricas (buffer en memoria, se vuelcan por bloques) ---
+    writer = create_metrics(metrics, log_dir=log_dir)
+    tracker = BestModelTracker(MyTicTacToeAgent.__name__, save_dir=save_dir)
+
+    # --- Checkpoints (reanudar donde se quedó) ---
+    checkpointer = Checkpointer(checkpoint_dir)
+    start_episode = 1
+    if resume:
+        trainer_state = checkpointer.load_latest(agents)
+        if trainer_state is not None:
+            start_episode = trainer_state["episode"] + 1
+            tracker.best_winrate = trainer_state["best_winrate"]
+
+    evaluator = None
+    if async_eval:
+        from training.async_eval import AsyncEvaluator
+        evaluator = AsyncEvaluator(agent_class, MyTicTacToeAgent, TicTacToeGame,
+                                   episodes=eval_episodes, num_workers=eval_workers)
+
+    # --- Loop de entrenamiento ---
+    game = TicTacToeGame(num_players=2)
+    for episode in tqdm(range(start_episode, episodes + 1), initial=start_episode - 1, total=episodes):
+        profiling.step(episode)
+
+        _, losses = play_self_play_episode(game, agents, train=True)
+
+        # Decay epsilon para ambos agentes (solo aquí)
+        decay_epsilon(agents)
+        if writer.enabled:
+            for a in agents:
+                # Log epsilon individual
+                writer.log_scalar(f"epsilon/{a.name}", a.epsilon, episode)
+
+        # Log de pérdida promedio por episodio
+        if losses and writer.enabled:
+            writer.log_scalar("loss", np.mean(losses), episode)
+
+        # --- Evaluación periódica ---
+        if episode % eval_interval == 0:
+            if evaluator:
+                evaluator.submit(episode, agent1.model, agent1.epsilon)
+            else:
+                winrate = evaluate_against_fixed(agent1, MyTicTacToeAgent, TicTacToeGame, episodes=eval_episodes)
+                tracker.report(episode, winrate, agent1.save, agent1.epsilon, writer)
+        if evaluator:
+            tracker.report_async(evaluator.poll(), writer)
+
+        # --- Checkpoint completo periódico ---
+        if checkpoint_interval and episode % checkpoint_interval == 0:
+            checkpointer.save(episode, agents, {"episode": episode, "best_winrate": tracker.best_winrate})
+
+    if evaluator:
+        tracker.report_async(evaluator.close(wait=True), writer)
+
+    # Cerrar writer al final
+    writer.close()
+
+    return agents
@@ -0,0 +1,173 @@
+"""
+Entrenamiento self-play vectorizado: N partidas avanzan en lockstep sobre
+VecTicTacToe, cada agente elige las jugadas de todas sus partidas con una sola
+pasada epsilon-greedy, las N transiciones se insertan de golpe en la memoria y
+se da un paso de gradiente por agente cada K jugadas (K=1 por defecto: los
+mismos pasos de gradiente por jugada que el bucle secuencial; con K>1 se
+entrena K veces menos a cambio de velocidad).
+Las transiciones guardadas son las mismas que en el bucle secuencial de train_dqn.py.
+"""
+import time
+import numpy as np
+from tqdm import tqdm
+from games.tic_tac_toe.game import TicTacToeGame
+from games.tic_tac_toe.lines import NUM_CELLS
+from games.tic_tac_toe.vector_env import VecTicTacToe
+from agents.tic_tac_toe_agent import MyTicTacToeAgent
+from training.evaluation import evaluate_against_fixed, BestModelTracker
+from training.checkpoint import Checkpointer
+from training.self_play import share_experience, learners
+from core.metrics import create_metrics
+from core import profiling
+
+
+def train_vectorized(agent_class, episodes, num_envs=32, train_every=1, batch_size=None,
+                     eval_interval=500, eval_episodes=50, save_dir="models", resume=False,
+                     checkpoint_dir="checkpoints", checkpoint_interval=1000,
+                     async_eval=False, eval_workers=2, agent_kwargs=None, shared=None,
+                     metrics=None, log_dir="runs"):
+    """
+    Self-play con dos agentes (uno por asiento) durante `episodes` partidas.
+    Con resume=True continúa desde el último checkpoint de `checkpoint_dir`
+    (incluidas las partidas en curso). Con async_eval=True la evaluación
+    periódica se hace en procesos en segundo plano. `agent_kwargs` se pasa al
+    constructor de los agentes (p. ej. augment="random"). shared="memory" o
+    "network" comparte memoria (y red) entre asientos, como en train_sequential.
+    `metrics` y `log_dir` como en train_sequential (pérdida y epsilon en cada evaluación).
+    Devuelve un resumen con jugadas/s, pasos de gradiente y el mejor winrate.
+    """
+    agents = [agent_class(name, **(agent_kwargs or {})) for name in ("DQN-1", "DQN-2")]
+    if batch_size:
+        for agent in agents:
+            agent.batch_size = batch_size
+    if shared:
+        share_experience(agents, share_network=shared == "network")
+
+    env = VecTicTacToe(num_envs)
+    num_seats = len(agents)
+    # Última jugada de cada asiento en cada partida (equivale a set_last del agente)
+    last_boards = np.zeros((num_seats, num_envs, NUM_CELLS), dtype=np.int8)
+    last_actions = np.zeros((num_seats, num_envs), dtype=np.int64)
+    has_last = np.zeros((num_seats, num_envs), dtype=bool)
+    actions = np.zeros(num_envs, dtype=np.int64)
+
+    finished = 0
+    env_steps = 0
+    pending_steps = 0
+    grad_steps = 0
+    losses = []
+    tracker = BestModelTracker(MyTicTacToeAgent.__name__, save_dir=save_dir)
+    writer = create_metrics(metrics, log_dir=log_dir)
+    next_eval = eval_interval
+    next_checkpoint = checkpoint_interval
+
+    # --- Checkpoints (reanudar donde se quedó) ---
+    checkpointer = Checkpointer(checkpoint_dir)
+    if resume:
+        trainer_state = checkpointer.load_latest(agents)
+        if trainer_state is not None:
+            finished, env_steps, pending_steps, grad_steps = (
+                trainer_state[k] for k in ("episode", "env_steps", "pending_steps", "grad_steps"))
+            tracker.best_winrate, next_eval = trainer_state["best_winrate"], trainer_state["next_eval"]
+            next_checkpoint = trainer_state["next_checkpoint"]
+            env.boards, env.current_player, env.done, env.turns = trainer_state["env"]
+            last_boards, last_actions, has_last = trainer_state["last"]
+
+    evaluator = None
+    if async_eval:
+        from training.async_eval import AsyncEvaluator
+        evaluator = AsyncEvaluator(agent_class, MyTicTacToeAgent, TicTacToeGame,
+                                   episodes=eval_episodes, num_workers=eval_workers)
+
+    start = time.time()
+    start_steps = env_steps
+    progress = tqdm(total=episodes, initial=finished)
+
+    while finished < episodes:
+        boards = env.get_boards()
+        valid = env.valid_mask()
+        movers = env.current_player
+
+        for seat, agent in enumerate(agents):
+            rows = np.flatnonzero(movers == seat)
+            if len(rows):
+                actions[rows] = agent.act_batch(boards[rows], valid[rows])
+                last_boards[seat, rows] = boards[rows]
+                last_actions[seat, rows] = actions[rows]
+                has_last[seat, rows] = True
+
+        next_boards, rewards, dones, _ = env.step(actions)
+        env_steps += num_envs
+        pending_steps += num_envs
+
+        # Almacenar experiencia: cada agente observa todas sus partidas
+        for seat, agent in enumerate(agents):
+            rows = np.flatnonzero(has_last[seat])
+            agent.memory.add_batch(last_boards[seat, rows], last_actions[seat, rows],
+                                   rewards[rows, seat], next_boards[rows], dones[rows])
+
+        # Un paso de gradiente por agente cada `train_every` jugadas
+        while pending_steps >= train_every:
+            pending_steps -= train_every
+            for agent in learners(agents):
+                loss = agent.train_from_memory()
+                if loss is not None:
+                    losses.append(loss)
+                    grad_steps += 1
+
+        num_done = int(dones.sum())
+        if not num_done:
+            continue
+
+        env.reset(dones)
+        finished += num_done
+        progress.update(num_done)
+        profiling.step(finished)
+
+        # Decay epsilon una vez por episodio terminado
+        for agent in agents:
+            agent.epsilon = max(agent.epsilon_min, agent.epsilon * agent.epsilon_decay ** num_done)
+
+        # --- Evaluación periódica ---
+        if finished >= next_eval:
+            next_eval += eval_interval
+            if losses:
+                print(f"[TRAIN] Ep {finished} → loss={np.mean(losses):.4f}")
+                writer.log_scalar("loss", np.mean(losses), finished)
+                losses = []
+            for agent in agents:
+                writer.log_scalar(f"epsilon/{agent.name}", agent.epsilon, finished)
+            if evaluator:
+                evaluator.submit(finished, agents[0].model, agents[0].epsilon)
+            else:
+                winrate = evaluate_against_fixed(agents[0], MyTicTacToeAgent, TicTacToeGame, episodes=eval_episodes)
+                tracker.report(finished, winrate, agents[0].save, agents[0].epsilon, writer)
+        if evaluator:
+            tracker.report_async(evaluator.poll(), writer)
+
+        # --- Checkpoint completo periódico ---
+        if checkpoint_interval and finished >= next_checkpoint:
+            next_checkpoint += checkpoint_interval
+            checkpointer.save(finished, agents, {
+                "episode": finished, "env_steps": env_steps, "pending_steps": pending_steps,
+                "grad_steps": grad_steps, "best_winrate": tracker.best_winrate, "next_eval": next_eval,
+                "next_checkpoint": next_checkpoint,
+                "env": (env.boards, env.current_player, env.done, env.turns),
+                "last": (last_boards, last_actions, has_last),
+            })
+
+    if evaluator:
+        tracker.report_async(evaluator.close(wait=True), writer)
+    writer.close()
+
+    progress.close()
+    elapsed = time.time() - start
+    summary = {
+        "episodes": finished,
+        "env_steps": env_steps,
+        "grad_steps": grad_steps,
+        "env_steps_per_s": (env_steps - start_steps) / elapsed,
+        "best_winrate": tracker.best_winrate,
+    }
+    print(f"[PERF] env steps/s: {summary['env_steps_per_s']:.0f} | grad steps: {grad_steps}")
+    return summary
@@ -0,0 +1,141 @@
+"""
+Render de replays sin ventana (driver de vídeo "dummy" de SDL) a secuencias
+de PNG o a GIF animados, reutilizando el dibujo de games/tic_tac_toe/ui.py.
+
+Cada proceso worker crea una sola TicTacToeUI, dibuja la rejilla una vez y
+la reutiliza como fondo de todos los frames; las fichas salen de la caché de
+glifos de la propia UI.
+"""
+import json
+import multiprocessing as mp
+import os
+from types import SimpleNamespace
+import numpy as np
+from core.replay_archive import ReplayArchive, json_to_game
+
+FORMATS = ("png", "gif")
+
+_renderer = None
+
+
+class FrameRenderer:
+    """Dibuja tableros en la superficie (offscreen) de una TicTacToeUI."""
+
+    def __init__(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from games.tic_tac_toe.game import TicTacToeGame
+        from games.tic_tac_toe.ui import TicTacToeUI
+
+        self.pygame = pygame
+        self.game = TicTacToeGame(num_players=2)
+        self.ui = TicTacToeUI(self.game)
+        self.ui.draw_board()
+        self.grid = self.ui.screen.copy()  # fondo estático, se dibuja una sola vez
+        self.palette = None
+
+    def frames(self, players, moves):
+        """Genera la superficie de cada turno (tablero vacío incluido) de una partida."""
+        self.ui.agents = [SimpleNamespace(name=name) for name in players]
+        board = np.zeros((3, 3), dtype=int)
+        yield self._frame(board, moves[0][0] if moves else None)
+        for n, (player, (i, j)) in enumerate(moves):
+            board[i, j] = player + 1
+            yield self._frame(board, moves[n + 1][0] if n + 1 < len(moves) else None)
+
+    def gif_palette(self):
+        """
+        Paleta de 64 colores calculada una vez por worker sobre un tablero de
+        muestra: cuantizar cada frame desde cero es lo más lento al generar GIFs.
+        """
+        if self.palette is None:
+            from PIL import Image
+            sample = self._frame(np.array([[1, 2, 0], [0, 1, 2], [2, 0, 1]]), 0 if self.ui.agents else None)
+            image = Image.frombytes("RGB", sample.get_size(), self.pygame.image.tobytes(sample, "RGB"))
+            self.palette = image.quantize(colors=64)
+        return self.palette
+
+    def _frame(self, board, current_player):
+        screen = self.ui.screen
+        screen.blit(self.grid, (0, 0))
+        self.ui.draw_marks(board)
+        if current_player is not None and current_player < len(self.ui.agents):
+            label = self.ui.labels.render(f"Turn: {self.ui.agents[current_player].name}", (20, 20, 20))
+            screen.blit(label, (10, 10))
+        return screen
+
+
+def load_jobs(paths, limit=None):
+    """
+    Partidas a renderizar: (nombre, jugadores, jugadas) de cada replay JSON
+    o de cada partida de un archivo .replays.
+    """
+    jobs = []
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if path.endswith(".json"):
+            with open(path) as f:
+                players, moves, _ = json_to_game(json.load(f))
+            jobs.append((stem, players, moves))
+        else:
+            with ReplayArchive(path) as archive:
+                for k in range(len(archive)):
+                    replay = archive[k]
+                    jobs.append((f"{stem}_{k:06d}", replay["players"], replay["moves"]))
+        if limit is not None and len(jobs) >= limit:
+            return jobs[:limit]
+    return jobs
+
+
+def _init_worker():
+    global _renderer
+    _renderer = FrameRenderer()
+
+
+def render_game(job, out_dir, fmt="gif", frame_ms=600):
+    """Renderiza una partida y devuelve la ruta generada (directorio de PNGs o GIF)."""
+    if _renderer is None:
+        _init_worker()
+    name, players, moves = job
+    pygame = _renderer.pygame
+
+    if fmt == "png":
+        game_dir = os.path.join(out_dir, name)
+        os.makedirs(game_dir, exist_ok=True)
+        for n, frame in enumerate(_renderer.frames(players, moves)):
+            pygame.image.save(frame, os.path.join(game_dir, f"frame_{n:03d}.png"))
+        return game_dir
+
+    from PIL import Image  # solo hace falta para GIF
+    palette = _renderer.gif_palette()
+    images = [Image.frombytes("RGB", frame.get_size(), pygame.image.tobytes(frame, "RGB"))
+              .quantize(palette=palette, dither=Image.Dither.NONE)
+              for frame in _renderer.frames(players, moves)]
+    path = os.path.join(out_dir, f"{name}.gif")
+    # El último frame (resultado final) se mantiene más tiempo en pantalla
+    durations = [frame_ms] * (len(images) - 1) + [frame_ms * 4]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=durations, loop=0, optimize=False)
+    return path
+
+
+def _render_worker(args):
+    return render_game(*args)
+
+
+def render_replays(paths, out_dir, fmt="gif", workers=1, frame_ms=600, limit=None):
+    """Renderiza todas las partidas de `paths` en `workers` procesos. Devuelve las rutas generadas."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}")
+    if fmt == "gif":
+        try:
+            import PIL  # se comprueba antes de lanzar los workers
+        except ImportError:
+            raise ValueError("La salida GIF necesita Pillow (pip install Pillow) o usa --format png") from None
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(job, out_dir, fmt, frame_ms) for job in load_jobs(paths, limit)]
+
+    if workers > 1:
+        # spawn: cada worker inicializa su propio SDL sin heredar el del padre
+        with mp.get_context("spawn").Pool(workers, initializer=_init_worker) as pool:
+            return list(pool.imap(_render_worker, tasks, chunksize=16))
+    return [_render_worker(task) for task in tasks]
@@ -0,0 +1,33 @@
+import numpy as np
+
+KEYFRAME_INTERVAL = 8
+
+
+class BoardKeyframes:
+    """
+    Instantáneas del tablero cada `interval` jugadas de un replay.
+    Reconstruir el tablero en cualquier turno cuesta copiar la instantánea
+    anterior y aplicar como mucho `interval - 1` jugadas, sea cual sea la
+    longitud de la partida.
+    """
+    def __init__(self, empty_board, moves, interval=KEYFRAME_INTERVAL):
+        self.interval = interval
+        self.moves = moves  # lista de (valor de la ficha, (fila, columna))
+        board = np.array(empty_board, copy=True)
+        self.keyframes = [board.copy()]
+        for n, (value, (i, j)) in enumerate(moves, 1):
+            board[i, j] = value
+            if n % interval == 0:
+                self.keyframes.append(board.copy())
+
+    def __len__(self):
+        return len(self.moves)
+
+    def board_at(self, index, out):
+        """Escribe en `out` el tablero tras las primeras `index` jugadas."""
+        index = min(max(index, 0), len(self.moves))
+        k = index // self.interval
+        out[...] = self.keyframes[k]
+        for value, (i, j) in self.moves[k * self.interval:index]:
+            out[i, j] = value
+        return out
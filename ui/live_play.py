@@ -0,0 +1,105 @@
+"""
+Partidas en bucle sobre una única ventana (play.py).
+
+La ventana y el UIManager de ReplayViewerGUI se crean una sola vez y cada
+partida nueva se carga con viewer.load(). Los agentes se crean y juegan en un
+hilo aparte (GameEngine sin UI); el hilo de render espera eventos con el
+timeout del visor (hasta la próxima jugada, o a `fps` mientras espera a un
+agente) y muestra las jugadas según llegan, una cada `delay` segundos,
+redibujando solo lo que cambia. La partida siguiente se
+juega en segundo plano mientras se muestra la actual, así que empieza al
+instante.
+"""
+import threading
+import time
+import pygame
+from core import profiling
+from core.engine import GameEngine
+from ui.replay_viewer_gui import ReplayViewerGUI
+
+FPS = 30
+HOLD = 2.0  # segundos con el resultado en pantalla antes de pasar a la siguiente partida
+
+
+class GameThread(threading.Thread):
+    """Crea los agentes y juega una partida completa fuera del hilo de render."""
+
+    def __init__(self, game, agent_configs):
+        super().__init__(daemon=True)
+        self.game = game
+        self.agent_configs = agent_configs
+        self.engine = None
+        self.error = None
+        self.ready = threading.Event()  # el motor (y sus agentes) ya existe
+
+    def run(self):
+        try:
+            agents = [a["class"](a["name"], **a["params"]) for a in self.agent_configs]
+            self.engine = GameEngine(self.game, agents)
+            self.ready.set()
+            self.engine.run()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ready.set()
+
+    def check(self):
+        """Propaga en el hilo principal el error del agente, si lo hubo."""
+        if self.error is not None:
+            raise self.error
+
+
+class LivePlay:
+    def __init__(self, game_factory, agent_configs, delay=0.6, fps=FPS, hold=HOLD):
+        self.game_factory = game_factory
+        self.agent_configs = agent_configs
+        self.delay = delay
+        self.fps = fps
+        self.hold = hold
+        self.games_played = 0
+
+    def _next_game(self):
+        # Se alterna quién empieza (la primera partida, en orden inverso como antes)
+        configs = self.agent_configs if self.games_played % 2 else list(reversed(self.agent_configs))
+        profiling.step(self.games_played)
+        self.games_played += 1
+        thread = GameThread(self.game_factory(), configs)
+        thread.start()
+        return thread
+
+    def run(self):
+        current = self._next_game()
+        current.ready.wait()
+        current.check()
+
+        viewer = ReplayViewerGUI(self.game_factory(), current.engine)
+        viewer.delay = self.delay
+        viewer.fps = self.fps
+        viewer.follow = True
+        viewer.toggle_play()
+        clock = pygame.time.Clock()
+        upcoming = None
+        finished_at = None
+
+        while viewer.running:
+            for event in viewer.wait_events():
+                viewer.handle_event(event)
+            current.check()
+
+            done = not current.is_alive()
+            if done and upcoming is None:
+                upcoming = self._next_game()
+
+            if done and viewer.playing and viewer.index >= len(viewer.history):
+                finished_at = finished_at or time.time()
+                if time.time() - finished_at >= self.hold and upcoming.ready.is_set():
+                    upcoming.check()
+                    current, upcoming, finished_at = upcoming, None, None
+                    viewer.load(current.engine)
+                    viewer.last_update = time.time()
+            else:
+                finished_at = None
+
+            viewer.update(clock.tick() / 1000.0)
+
+        pygame.quit()
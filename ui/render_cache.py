@@ -0,0 +1,19 @@
+class TextCache:
+    """
+    Superficies de texto ya renderizadas, por (texto, color).
+    font.render es lo más caro de cada frame; con la caché cada etiqueta
+    se rasteriza una sola vez.
+    """
+    def __init__(self, font, max_size=512):
+        self.font = font
+        self.max_size = max_size
+        self.cache = {}
+
+    def render(self, text, color):
+        key = (text, color)
+        surface = self.cache.get(key)
+        if surface is None:
+            if len(self.cache) >= self.max_size:
+                self.cache.clear()
+            surface = self.cache[key] = self.font.render(text, True, color)
+        return surface
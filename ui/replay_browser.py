@@ -0,0 +1,234 @@
+"""
+Navegador de replays para archivos con decenas de miles de partidas.
+
+Abre un archivo .replays (o un directorio de replays JSON, que se convierte
+una vez a un archivo `.browser.replays` dentro del propio directorio) y muestra
+la lista de partidas con filtros. Solo se dibujan las filas visibles y el
+detalle de una partida se lee del archivo cuando se selecciona.
+
+Teclas: ↑/↓ seleccionar, RePág/AvPág página, Inicio/Fin, rueda del ratón
+desplazar, clic seleccionar, ←/→ moverse por la partida seleccionada,
+W filtrar por ganador, A por agente, +/- longitud mínima, R quitar filtros.
+"""
+import glob
+import os
+import sys
+import numpy as np
+import pygame
+from core.replay_archive import ReplayArchive, ReplaySummary, import_json
+from ui.keyframes import BoardKeyframes
+from ui.render_cache import TextCache
+
+ROW_H = 24
+HEADER_H = 60
+LIST_W = 460
+FONT_SIZE = 22
+BG = (245, 245, 245)
+TEXT = (40, 40, 40)
+SELECTED = (200, 215, 240)
+MARK_COLORS = {1: (200, 50, 50), 2: (50, 50, 200)}
+
+
+def open_source(path):
+    """Archivo de replays a navegar para `path` (archivo .replays o directorio con JSON)."""
+    if not os.path.isdir(path):
+        return ReplayArchive(path)
+
+    json_files = sorted(glob.glob(os.path.join(path, "*.json")))
+    cache = os.path.join(path, ".browser.replays")
+    newest = max((os.path.getmtime(f) for f in json_files), default=0)
+    if not os.path.exists(cache) or os.path.getmtime(cache) < newest:
+        for stale in (cache, f"{cache}.idx"):
+            if os.path.exists(stale):
+                os.remove(stale)
+        import_json(json_files, cache)
+    return ReplayArchive(cache)
+
+
+def _cycle(options, current):
+    """Siguiente opción de un filtro (None = sin filtro)."""
+    options = [None] + options
+    return options[(options.index(current) + 1) % len(options)]
+
+
+class ReplayBrowser:
+    def __init__(self, path, width=900, height=600, cell_size=100):
+        self.archive = open_source(path)
+        self.summary = ReplaySummary(self.archive)
+        self.filters = {"winner": None, "agent": None, "min_moves": None}
+        self.rows = self.summary.select()
+        self.top = 0
+        self.selected = 0
+        self.detail = None   # (k, partida, keyframes) de la partida seleccionada
+        self.turn = 0
+        self.cell_size = cell_size
+
+        pygame.init()
+        self.screen = pygame.display.set_mode((width, height))
+        pygame.display.set_caption(f"Replay Browser - {os.path.basename(path.rstrip(os.sep))}")
+        self.text = TextCache(pygame.font.SysFont(None, FONT_SIZE))
+        self.marks = TextCache(pygame.font.SysFont(None, cell_size * 2 // 3))
+        self.visible_rows = (height - HEADER_H) // ROW_H
+        self.list_rect = pygame.Rect(0, 0, LIST_W, height)
+        self.detail_rect = pygame.Rect(LIST_W, 0, width - LIST_W, height)
+        self._load_selected()
+
+    # --- Datos ---
+    def apply_filters(self):
+        self.rows = self.summary.select(**self.filters)
+        self.top = self.selected = 0
+        self._load_selected()
+
+    def _load_selected(self):
+        """Lee del archivo solo la partida seleccionada."""
+        if not len(self.rows):
+            self.detail = None
+            return
+        k = int(self.rows[self.selected])
+        if self.detail and self.detail[0] == k:
+            return
+        replay = self.archive[k]
+        moves = [(player + 1, action) for player, action in replay["moves"]]
+        self.detail = (k, replay, BoardKeyframes(np.zeros((3, 3), dtype=int), moves))
+        self.turn = len(moves)
+
+    def select(self, row):
+        if not len(self.rows):
+            return
+        self.selected = min(max(row, 0), len(self.rows) - 1)
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.visible_rows:
+            self.top = self.selected - self.visible_rows + 1
+        self._load_selected()
+
+    def scroll(self, delta):
+        max_top = max(0, len(self.rows) - self.visible_rows)
+        self.top = min(max(self.top + delta, 0), max_top)
+
+    def _row_text(self, k):
+        names = self.summary.names
+        players = [names[c] for c in self.summary.players[k] if c >= 0]
+        winner = self.summary.winner[k]
+        result = players[winner] if 0 <= winner < len(players) else "empate"
+        return f"#{k:<7} {' vs '.join(players):<24} {self.summary.num_moves[k]} jug.  {result}"
+
+    # --- Render ---
+    def draw_list(self):
+        self.screen.fill(BG, self.list_rect)
+        f = self.filters
+        header = (f"{len(self.rows)}/{len(self.summary)} partidas | ganador: {f['winner'] or '-'} | "
+                  f"agente: {f['agent'] or '-'} | jug. >= {f['min_moves'] or 0}")
+        self.screen.blit(self.text.render(header, TEXT), (10, 10))
+        self.screen.blit(self.text.render("W ganador  A agente  +/- longitud  R reset", (120, 120, 120)), (10, 34))
+
+        # Solo las filas visibles
+        for r in range(self.top, min(self.top + self.visible_rows, len(self.rows))):
+            y = HEADER_H + (r - self.top) * ROW_H
+            if r == self.selected:
+                pygame.draw.rect(self.screen, SELECTED, (0, y, LIST_W, ROW_H))
+            self.screen.blit(self.text.render(self._row_text(int(self.rows[r])), TEXT), (10, y + 4))
+
+    def draw_detail(self):
+        self.screen.fill((230, 230, 230), self.detail_rect)
+        if self.detail is None:
+            self.screen.blit(self.text.render("Sin partidas con estos filtros", TEXT), (LIST_W + 20, 20))
+            return
+        k, replay, keyframes = self.detail
+        x0, y0, cell = LIST_W + 20, 60, self.cell_size
+        title = f"Partida #{k}: {' vs '.join(replay['players'])} | turno {self.turn}/{len(keyframes)}"
+        self.screen.blit(self.text.render(title, TEXT), (x0, 20))
+
+        board = keyframes.board_at(self.turn, np.zeros((3, 3), dtype=int))
+        for i in range(1, 3):
+            pygame.draw.line(self.screen, (50, 50, 50), (x0, y0 + i * cell), (x0 + 3 * cell, y0 + i * cell), 3)
+            pygame.draw.line(self.screen, (50, 50, 50), (x0 + i * cell, y0), (x0 + i * cell, y0 + 3 * cell), 3)
+        for i, j in zip(*np.nonzero(board)):
+            mark = self.marks.render("X" if board[i, j] == 1 else "O", MARK_COLORS[board[i, j]])
+            self.screen.blit(mark, mark.get_rect(center=(x0 + j * cell + cell // 2, y0 + i * cell + cell // 2)))
+
+        y = y0 + 3 * cell + 20
+        for n, (player, action) in enumerate(replay["moves"][:self.turn][-8:]):
+            self.screen.blit(self.text.render(f"{replay['players'][player]}: {action}", (80, 80, 80)),
+                             (x0, y + n * ROW_H))
+
+    def render(self):
+        self.draw_list()
+        self.draw_detail()
+        pygame.display.flip()
+
+    # --- Input ---
+    def handle_key(self, key):
+        names = self.summary.names
+        if key == pygame.K_DOWN:
+            self.select(self.selected + 1)
+        elif key == pygame.K_UP:
+            self.select(self.selected - 1)
+        elif key == pygame.K_PAGEDOWN:
+            self.select(self.selected + self.visible_rows)
+        elif key == pygame.K_PAGEUP:
+            self.select(self.selected - self.visible_rows)
+        elif key == pygame.K_HOME:
+            self.select(0)
+        elif key == pygame.K_END:
+            self.select(len(self.rows) - 1)
+        elif key == pygame.K_RIGHT and self.detail:
+            self.turn = min(self.turn + 1, len(self.detail[2]))
+        elif key == pygame.K_LEFT and self.detail:
+            self.turn = max(self.turn - 1, 0)
+        elif key == pygame.K_w:
+            self.filters["winner"] = _cycle(names + ["draw"], self.filters["winner"])
+            self.apply_filters()
+        elif key == pygame.K_a:
+            self.filters["agent"] = _cycle(names, self.filters["agent"])
+            self.apply_filters()
+        elif key in (pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_EQUALS):
+            self.filters["min_moves"] = (self.filters["min_moves"] or 0) + 1
+            self.apply_filters()
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.filters["min_moves"] = max((self.filters["min_moves"] or 0) - 1, 0) or None
+            self.apply_filters()
+        elif key == pygame.K_r:
+            self.filters = {"winner": None, "agent": None, "min_moves": None}
+            self.apply_filters()
+        else:
+            return False
+        return True
+
+    def handle_event(self, event):
+        """Devuelve True si hay que redibujar."""
+        if event.type == pygame.KEYDOWN:
+            return self.handle_key(event.key)
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll(-event.y * 3)
+            return True
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.list_rect.collidepoint(event.pos):
+            row = self.top + (event.pos[1] - HEADER_H) // ROW_H
+            if event.pos[1] >= HEADER_H and row < len(self.rows):
+                self.select(row)
+                return True
+        return False
+
+    def run(self):
+        """Bucle dirigido por eventos: solo se redibuja cuando algo cambia."""
+        self.render()
+        while True:
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                break
+            redraw = self.handle_event(event)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    return
+                redraw = self.handle_event(event) or redraw
+            if redraw:
+                self.render()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso: python -m ui.replay_browser <archivo.replays | directorio>")
+        sys.exit(1)
+    ReplayBrowser(sys.argv[1]).run()
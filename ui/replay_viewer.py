@@ -1,12 +1,16 @@
 import pygame
-import sys
 import time
 import json
 import os
+import numpy as np
+from ui.keyframes import BoardKeyframes
+from ui.render_cache import TextCache
 
 BTN_W, BTN_H = 100, 40
 FONT_SIZE = 28
 LOG_LINES = 6
+SLIDER_W = 240
+BUTTON_LABELS = {"prev": "← Prev", "next": "Next →", "save": "💾 Save", "load": "📂 Load"}
 
 class ReplayViewer:
     def __init__(self, game, engine=None, cell_size=120):
@@ -19,6 +23,9 @@ class ReplayViewer:
         self.size = cell_size * 3
         self.total_turns = len(self.history)
         self.slider_drag = False
+        self._keyframes_key = None
+        # Valor de la ficha de cada jugador (el historial del motor guarda nombres)
+        self.agent_map = {agent.name: i + 1 for i, agent in enumerate(engine.agents)} if engine else {}
 
         pygame.init()
         self.font = pygame.font.SysFont(None, FONT_SIZE)
@@ -35,31 +42,66 @@ class ReplayViewer:
         self.last_update = 0
         self.delay = 0.8
 
+        # Render dirigido por eventos: textos cacheados y solo las zonas que cambian
+        self.text = TextCache(self.font)
+        self.hover = None
+        self.dirty = set()
+        self._metrics_cache = {}
+        self._layout()
+        self.reset_game()
+
     # --- Button utils ---
-    def _button(self, x, y, text):
-        mouse = pygame.mouse.get_pos()
-        click = pygame.mouse.get_pressed()
-        color = self.button_hover if x < mouse[0] < x+BTN_W and y < mouse[1] < y+BTN_H else self.button_color
-        pygame.draw.rect(self.screen, color, (x, y, BTN_W, BTN_H))
-        label = self.font.render(text, True, (0, 0, 0))
-        self.screen.blit(label, (x + (BTN_W - label.get_width())//2, y + 5))
-        if click[0] and x < mouse[0] < x+BTN_W and y < mouse[1] < y+BTN_H:
-            return True
-        return False
+    def _layout(self):
+        """Posición fija de los controles del panel lateral."""
+        x = self.size + 20
+        self.buttons = {
+            "prev": pygame.Rect(x, 80, BTN_W, BTN_H),
+            "play": pygame.Rect(x + BTN_W + 10, 80, BTN_W, BTN_H),
+            "next": pygame.Rect(x + 2 * (BTN_W + 10), 80, BTN_W, BTN_H),
+            "save": pygame.Rect(x, 200, BTN_W, BTN_H),
+            "load": pygame.Rect(x + BTN_W + 10, 200, BTN_W, BTN_H),
+        }
+        self.slider_rect = pygame.Rect(x, 150, SLIDER_W, 6)
+        self.board_rect = pygame.Rect(0, 0, self.size, self.size)
+        self.sidebar_rect = pygame.Rect(self.size, 0, self.screen.get_width() - self.size, self.size)
+
+    def _button_label(self, name):
+        if name == "play":
+            return "⏸ Pause" if self.playing else "▶ Play"
+        return BUTTON_LABELS[name]
+
+    def _button(self, name):
+        rect = self.buttons[name]
+        color = self.button_hover if self.hover == name else self.button_color
+        pygame.draw.rect(self.screen, color, rect)
+        label = self.text.render(self._button_label(name), (0, 0, 0))
+        self.screen.blit(label, (rect.x + (BTN_W - label.get_width())//2, rect.y + 5))
 
     # --- Replay logic ---
+    def _keyframes(self):
+        """Instantáneas del historial actual (se recalculan si cambia el historial)."""
+        key = (id(self.history), len(self.history))
+        if self._keyframes_key != key:
+            moves = [(self._player_value(player), action) for player, action, _ in self.history]
+            self.keyframes = BoardKeyframes(np.zeros_like(self.game.board), moves)
+            self._keyframes_key = key
+            self._metrics_cache = {}
+        return self.keyframes
+
+    def _player_value(self, player):
+        if isinstance(player, str):
+            return self.agent_map.setdefault(player, len(self.agent_map) + 1)
+        return player
+
     def reset_game(self):
         self.game.reset()
-        for i in range(self.index):
-            player, action, _ = self.history[i]
-            i_, j_ = action
-            self.game.board[i_, j_] = player
+        self._keyframes().board_at(self.index, self.game.board)
 
     def step_forward(self):
         if self.index < self.total_turns:
             player, action, _ = self.history[self.index]
             i, j = action
-            self.game.board[i, j] = player
+            self.game.board[i, j] = self._player_value(player)
             self.index += 1
 
     def step_back(self):
@@ -105,6 +147,16 @@ class ReplayViewer:
 
 
     # --- Rendering ---
+    def _metrics(self):
+        """Métricas del tablero en el turno actual (calculadas una vez por turno)."""
+        if not hasattr(self.game, "get_metrics"):
+            return {}
+        self._keyframes()
+        key = self.index
+        if key not in self._metrics_cache:
+            self._metrics_cache[key] = self.game.get_metrics()
+        return self._metrics_cache[key]
+
     def draw_board(self):
         cell = self.cell_size
         for i in range(1, 3):
@@ -119,74 +171,44 @@ class ReplayViewer:
                 y = i * cell + cell // 2
                 val = self.game.board[i, j]
                 if val != 0:
-                    text = self.font.render("X" if val == 1 else "O", True, (200, 50, 50) if val == 1 else (50, 50, 200))
+                    text = self.text.render("X" if val == 1 else "O", (200, 50, 50) if val == 1 else (50, 50, 200))
                     rect = text.get_rect(center=(x, y))
                     self.screen.blit(text, rect)
 
-    def draw_slider(self, x, y, width=240, height=6):
+    def draw_slider(self):
         if self.total_turns <= 1:
             return
-
-        mouse = pygame.mouse.get_pos()
-        click = pygame.mouse.get_pressed()
+        x, y, width, height = self.slider_rect
         ratio = self.index / max(1, self.total_turns)
         knob_x = x + int(ratio * width)
 
         # Base line
-        pygame.draw.rect(self.screen, (180, 180, 180), (x, y, width, height))
+        pygame.draw.rect(self.screen, (180, 180, 180), self.slider_rect)
         # Knob
         pygame.draw.circle(self.screen, (80, 80, 80), (knob_x, y + height // 2), 8)
 
-        # Dragging
-        if click[0]:
-            if abs(mouse[0] - knob_x) < 10 and abs(mouse[1] - (y + height // 2)) < 10:
-                self.slider_drag = True
-            if self.slider_drag:
-                rel = max(0, min(1, (mouse[0] - x) / width))
-                self.index = int(rel * self.total_turns)
-                self.reset_game()
-        else:
-            self.slider_drag = False
-
     def draw_sidebar(self):
         start_x = self.size + 20
-        y = 30
-        label = self.font.render(f"Turn {self.index}/{self.total_turns}", True, self.text_color)
-        self.screen.blit(label, (start_x, y))
-        y += 50
+        self.screen.fill(self.bg, self.sidebar_rect)
+        label = self.text.render(f"Turn {self.index}/{self.total_turns}", self.text_color)
+        self.screen.blit(label, (start_x, 30))
 
         # Buttons
-        if self._button(start_x, y, "← Prev"):
-            self.step_back()
-        if self._button(start_x + BTN_W + 10, y, "▶ Play" if not self.playing else "⏸ Pause"):
-            self.toggle_play()
-        if self._button(start_x + 2*(BTN_W + 10), y, "Next →"):
-            self.step_forward()
-        y += 70
+        for name in self.buttons:
+            self._button(name)
 
         # Slider
-        self.draw_slider(start_x, y)
-        y += 50
-
-        # File operations
-        if self._button(start_x, y, "💾 Save"):
-            self.save_replay()
-        if self._button(start_x + BTN_W + 10, y, "📂 Load"):
-            self.load_replay()
-        y += 70
+        self.draw_slider()
+        y = 290
 
         # --- Metrics panel ---
-        # --- Metrics panel ---
-        y += 20
-        metrics = {}
-        if hasattr(self.game, "get_metrics"):
-            metrics = self.game.get_metrics()  # se llama en cada render, reflejando el estado actual
+        metrics = self._metrics()
         if metrics:
             pygame.draw.rect(self.screen, (245, 235, 210), (self.size, y, 300, 150))
-            label = self.font.render("Metrics", True, (60, 40, 0))
+            label = self.text.render("Metrics", (60, 40, 0))
             self.screen.blit(label, (start_x, y + 10))
             for i, (k, v) in enumerate(metrics.items()):
-                text = self.font.render(f"{k}: {v}", True, (50, 50, 50))
+                text = self.text.render(f"{k}: {v}", (50, 50, 50))
                 self.screen.blit(text, (start_x, y + 40 + i * 30))
             y += 170
         else:
@@ -197,34 +219,93 @@ class ReplayViewer:
         logs = self.history[max(0, self.index - LOG_LINES):self.index]
         for k, move in enumerate(reversed(logs)):
             player, action, _ = move
-            msg = f"P{1 if player == 1 else 2}: {action}"
-            log_text = self.font.render(msg, True, (80, 80, 80))
+            msg = f"P{self._player_value(player)}: {action}"
+            log_text = self.text.render(msg, (80, 80, 80))
             self.screen.blit(log_text, (start_x, y + 20 + k*30))
 
-    def render(self):
-        self.screen.fill(self.bg)
-        self.draw_board()
-        self.draw_marks()
-        self.draw_sidebar()
-        pygame.display.flip()
+    def render(self, dirty=None):
+        """
+        Dibuja las zonas `dirty` ("board", "sidebar"; todas por defecto) y
+        actualiza en pantalla solo esos rectángulos.
+        """
+        dirty = dirty or {"board", "sidebar"}
+        rects = []
+        if "board" in dirty:
+            self.screen.fill(self.bg, self.board_rect)
+            self.draw_board()
+            self.draw_marks()
+            rects.append(self.board_rect)
+        if "sidebar" in dirty:
+            self.draw_sidebar()
+            rects.append(self.sidebar_rect)
+        pygame.display.update(rects)
+
+    # --- Input ---
+    def _seek_slider(self, mouse_x):
+        x, _, width, _ = self.slider_rect
+        rel = max(0, min(1, (mouse_x - x) / width))
+        index = int(rel * self.total_turns)
+        if index != self.index:
+            self.index = index
+            self.reset_game()
+            self.dirty.update(("board", "sidebar"))
+
+    def handle_event(self, event):
+        """Actualiza el estado según el evento y marca qué zonas hay que redibujar."""
+        if event.type == pygame.MOUSEMOTION:
+            hover = next((name for name, rect in self.buttons.items() if rect.collidepoint(event.pos)), None)
+            if hover != self.hover:
+                self.hover = hover
+                self.dirty.add("sidebar")
+            if self.slider_drag:
+                self._seek_slider(event.pos[0])
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            knob = self.slider_rect.inflate(20, 20)
+            if self.total_turns > 1 and knob.collidepoint(event.pos):
+                self.slider_drag = True
+                self._seek_slider(event.pos[0])
+            elif self.hover:
+                before = self.index
+                {"prev": self.step_back, "play": self.toggle_play, "next": self.step_forward,
+                 "save": self.save_replay, "load": self.load_replay}[self.hover]()
+                self.dirty.add("sidebar")
+                if self.index != before or self.hover == "load":
+                    self.dirty.add("board")
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.slider_drag = False
 
     # --- Main loop ---
     def run(self):
+        """
+        Bucle dirigido por eventos: sin cambios no se redibuja nada y, si no
+        se está reproduciendo, se bloquea en event.wait sin consumir CPU.
+        """
         running = True
+        self.render()
         while running:
-            self.clock.tick(30)
-            for event in pygame.event.get():
+            if self.playing:
+                timeout = max(1, int((self.last_update + self.delay - time.time()) * 1000))
+                events = [pygame.event.wait(timeout)]
+            else:
+                events = [pygame.event.wait()]
+            events += pygame.event.get()
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type != pygame.NOEVENT:
+                    self.handle_event(event)
 
             now = time.time()
             if self.playing and now - self.last_update > self.delay:
                 self.step_forward()
                 self.last_update = now
+                self.dirty.update(("board", "sidebar"))
                 if self.index >= self.total_turns:
                     self.playing = False
 
-            self.render()
+            if self.dirty:
+                self.render(self.dirty)
+                self.dirty = set()
 
         pygame.quit()
-        sys.exit()
@@ -1,33 +1,37 @@
 import pygame
 import pygame_gui
-import sys
+import numpy as np
 import time
 from pygame_gui.elements import UIButton, UILabel, UIHorizontalSlider, UIPanel
+from ui.keyframes import BoardKeyframes
+from ui.render_cache import TextCache
 
 CELL_SIZE = 120
 GRID_COLOR = (50, 50, 50)
 X_COLOR = (200, 50, 50)
 O_COLOR = (50, 50, 200)
 BG_COLOR = (240, 240, 240)
+FPS = 30         # ritmo de refresco mientras hay algo en marcha
+ANIMATION = 0.5  # segundos que se sigue refrescando el panel tras un evento (transiciones de pygame_gui)
 
 class ReplayViewerGUI:
     def __init__(self, game, engine, width=600, height=360):
         pygame.init()
         self.game = game
-        self.engine = engine
-        self.history = engine.history
-        self.index = 0
         self.playing = False
+        self.follow = False  # seguir esperando jugadas al llegar al final (partida en curso)
+        self.running = True
+        self.quit_requested = False
         self.cell_size = CELL_SIZE
         self.board_size = self.cell_size * 3
         self.window_size = (self.board_size + 250, self.board_size)
+        self.board_rect = pygame.Rect(0, 0, self.board_size, self.board_size)
+        self.panel_rect = pygame.Rect(self.board_size, 0, 250, self.board_size)
+        self.fps = FPS
+        self.animate_until = 0.0  # hasta cuándo hay que refrescar el panel
         self.screen = pygame.display.set_mode(self.window_size)
         pygame.display.set_caption("Replay Viewer GUI")
 
-        # Mapping dinámico de jugadores
-        self.agent_map = {agent.name: i+1 for i, agent in enumerate(engine.agents)}
-
-
         # UI Manager
         self.ui_manager = pygame_gui.UIManager(self.window_size, 'ui/theme.json')
 
@@ -74,7 +78,7 @@ class ReplayViewerGUI:
 
         # Slider
         self.slider = UIHorizontalSlider(relative_rect=pygame.Rect(10, 110, 220, 30),
-                                         start_value=0, value_range=(0, len(self.history)),
+                                         start_value=0, value_range=(0, len(engine.history)),
                                          manager=self.ui_manager, container=self.panel)
 
         # Labels métricas y logs
@@ -84,14 +88,33 @@ class ReplayViewerGUI:
                                   text="Logs", manager=self.ui_manager, container=self.panel)
 
         self.clock = pygame.time.Clock()
+        # Glifos de las fichas cacheados; métricas y textos solo se recalculan al cambiar de turno
+        self.marks = TextCache(pygame.font.SysFont(None, 72))
         self.last_update = time.time()
         self.delay = 0.8  # segundos entre turnos
+        self.load(engine)
+
+    def load(self, engine):
+        """
+        Muestra la partida de `engine` reutilizando la ventana y el UIManager.
+        El historial puede seguir creciendo mientras se muestra (partida en curso).
+        """
+        self.engine = engine
+        self.history = engine.history
+        self.index = 0
+        # Mapping dinámico de jugadores
+        self.agent_map = {agent.name: i+1 for i, agent in enumerate(engine.agents)}
+        self._keyframes_key = None
+        self._metrics_cache = {}
+        self._labels_key = None
+        self.board_dirty = True
+        self.animate_until = time.time() + ANIMATION
         self.game.reset()  # reseteamos tablero para visualizar desde 0
         self.update_labels()
 
     # --- Tablero ---
     def draw_board(self):
-        self.screen.fill(BG_COLOR)
+        self.screen.fill(BG_COLOR, self.board_rect)
         # Líneas
         for i in range(1, 3):
             pygame.draw.line(self.screen, GRID_COLOR, (0, i*self.cell_size), (self.board_size, i*self.cell_size), 4)
@@ -103,8 +126,7 @@ class ReplayViewerGUI:
                 if val != 0:
                     text = 'X' if val == 1 else 'O'
                     color = X_COLOR if val == 1 else O_COLOR
-                    font = pygame.font.SysFont(None, 72)
-                    surf = font.render(text, True, color)
+                    surf = self.marks.render(text, color)
                     rect = surf.get_rect(center=(j*self.cell_size+self.cell_size//2, i*self.cell_size+self.cell_size//2))
                     self.screen.blit(surf, rect)
 
@@ -116,38 +138,58 @@ class ReplayViewerGUI:
             i, j = action
             self.game.board[i, j] = player
             self.index += 1
-            self.slider.set_current_value(self.index)
+            self.board_dirty = True
 
     def step_back(self):
         if self.index > 0:
-            self.index -= 1
-            self.game.reset()
-            for i in range(self.index):
-                agent_name, action, _ = self.history[i]
-                player = self.agent_map.get(agent_name, 0)
-                ii, jj = action
-                self.game.board[ii, jj] = player
-            self.slider.set_current_value(self.index)
+            self.seek(self.index - 1)
+
+    def _keyframes(self):
+        """Instantáneas del historial actual (se recalculan si cambia el historial)."""
+        key = (id(self.history), len(self.history))
+        if self._keyframes_key != key:
+            moves = [(self.agent_map.get(name, 0), action) for name, action, _ in self.history]
+            self.keyframes = BoardKeyframes(np.zeros_like(self.game.board), moves)
+            self._keyframes_key = key
+            self._metrics_cache = {}
+        return self.keyframes
+
+    def seek(self, index):
+        """Coloca el tablero en el turno `index` partiendo de la instantánea más cercana."""
+        self.index = int(min(max(index, 0), len(self.history)))
+        self._keyframes().board_at(self.index, self.game.board)
+        self.board_dirty = True
 
     # --- Actualizar métricas y logs ---
     def update_labels(self):
-        # Métricas dinámicas
+        # set_text re-maqueta el texto: solo cuando cambia el turno mostrado
+        self._keyframes()
+        key = (self._keyframes_key, self.index)
+        if key == self._labels_key:
+            return
+        self._labels_key = key
+        self.animate_until = max(self.animate_until, time.time() + ANIMATION)
+
+        # Métricas dinámicas (una vez por turno)
         if hasattr(self.game, "get_metrics"):
-            metrics = self.game.get_metrics()
-            winner = metrics["Winner"]
-            if winner:
-                metrics["Winner"] = self.engine.agents[winner].name
-            # Corregimos Total turns
-            metrics["Total turns"] = len(self.history)  # total jugadas de la partida
-            text = "\n".join([f"{k}: {v}" for k,v in metrics.items()])
-            self.label_metrics.set_text(text)
+            if self.index not in self._metrics_cache:
+                metrics = self.game.get_metrics()
+                winner = metrics["Winner"]
+                if winner:
+                    metrics["Winner"] = self.engine.agents[winner].name
+                # Corregimos Total turns
+                metrics["Total turns"] = len(self.history)  # total jugadas de la partida
+                self._metrics_cache[self.index] = "\n".join([f"{k}: {v}" for k,v in metrics.items()])
+            self.label_metrics.set_text(self._metrics_cache[self.index])
 
         # Logs últimos movimientos
         logs = self.history[max(0, self.index - 6):self.index]
         log_text = "\n".join([f"{p}: {a}" for p,a,_ in reversed(logs)])
         self.label_logs.set_text(log_text)
 
-        # Slider
+        # Slider (su rango crece con el historial)
+        if self.slider.value_range[1] != len(self.history):
+            self.slider.value_range = (0, len(self.history))
         self.slider.set_current_value(self.index)
 
     def toggle_play(self):
@@ -155,58 +197,92 @@ class ReplayViewerGUI:
         self.btn_play.set_text("Pause" if self.playing else "Play")
 
     # --- Loop principal ---
-    def run(self):
-        running = True
-        while running:
-            if self.playing:
-                self.btn_play.set_text("Pause")
-            else:
-                self.btn_play.set_text("Play")
-
-            time_delta = self.clock.tick(30)/1000.0
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                
-                # Botones Play/Prev/Next
-                if event.type == pygame_gui.UI_BUTTON_PRESSED:
-                    if event.ui_element == self.btn_prev:
-                        self.step_back()
-                        self.playing = False
-                    elif event.ui_element == self.btn_play:
-                        self.toggle_play()
-                    elif event.ui_element == self.btn_next:
-                        self.step_forward()
-                        self.playing = False
-                    elif event.ui_element == self.btn_end:
-                        pygame.quit()
-                        sys.exit()
-
-                # Slider
-                if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
-                    if event.ui_element == self.slider:
-                        self.index = int(min(max(event.value, 0), len(self.history)))
-                        self.game.reset()
-                        for i in range(self.index):
-                            p, a, _ = self.history[i]
-                            ii, jj = a
-                            self.game.board[ii, jj] = p
-
-                self.ui_manager.process_events(event)
-
-            # Avanzar automáticamente si play
-            if self.playing and time.time() - self.last_update > self.delay:
+    def handle_event(self, event):
+        # Cualquier evento puede cambiar el panel (hover, pulsaciones): se refresca un rato
+        self.animate_until = time.time() + ANIMATION
+        if event.type == pygame.QUIT:
+            self.running = False
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.board_dirty = True
+
+        # Botones Play/Prev/Next
+        if event.type == pygame_gui.UI_BUTTON_PRESSED:
+            if event.ui_element == self.btn_prev:
+                self.step_back()
+                self.playing = False
+            elif event.ui_element == self.btn_play:
+                self.toggle_play()
+            elif event.ui_element == self.btn_next:
                 self.step_forward()
-                self.last_update = time.time()
-                if self.index >= len(self.history):
-                    self.playing = False
-                    self.btn_play.set_text("Play")
+                self.playing = False
+            elif event.ui_element == self.btn_end:
+                self.running = False
+                self.quit_requested = True
+
+        # Slider
+        if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
+            if event.ui_element == self.slider:
+                self.seek(event.value)
 
+        self.ui_manager.process_events(event)
+
+    def timeout(self):
+        """
+        Segundos que se puede esperar al siguiente evento (None = sin límite):
+        a ritmo de FPS mientras el panel anima o se espera una jugada de la
+        partida en curso, hasta la próxima jugada con play y sin límite si no
+        hay nada en marcha.
+        """
+        now = time.time()
+        if now < self.animate_until or (self.playing and self.index >= len(self.history)):
+            return 1 / self.fps
+        if self.playing:
+            return max(0.001, self.last_update + self.delay - now)
+        return None
+
+    def wait_events(self):
+        """Bloquea hasta el siguiente evento o hasta timeout() y devuelve los eventos pendientes."""
+        timeout = self.timeout()
+        events = [pygame.event.wait() if timeout is None else pygame.event.wait(max(1, int(timeout * 1000)))]
+        events += pygame.event.get()
+        return [event for event in events if event.type != pygame.NOEVENT]
+
+    def update(self, time_delta):
+        """
+        Un frame: avance automático si está en play y redibujado solo de lo que
+        cambió (tablero y/o panel), actualizando en pantalla solo esos rectángulos.
+        """
+        if self.playing and time.time() - self.last_update > self.delay and self.index < len(self.history):
+            self.step_forward()
+            self.last_update = time.time()
+        if self.playing and not self.follow and self.index >= len(self.history):
+            self.playing = False
+            self.btn_play.set_text("Play")
+
+        rects = []
+        if self.board_dirty:
             self.draw_board()
-            self.update_labels()
+            self.board_dirty = False
+            rects.append(self.board_rect)
+        self.update_labels()
+        if time.time() < self.animate_until:
             self.ui_manager.update(time_delta)
             self.ui_manager.draw_ui(self.screen)
-            pygame.display.update()
+            rects.append(self.panel_rect)
+        if rects:
+            pygame.display.update(rects)
+
+    def run(self):
+        """
+        Muestra la partida hasta cerrar la ventana. Devuelve False si se pulsó Quit.
+        Sin nada en marcha se bloquea esperando eventos, sin consumir CPU.
+        """
+        self.running = True
+        self.clock.tick()
+        while self.running:
+            for event in self.wait_events():
+                self.handle_event(event)
+            self.update(self.clock.tick() / 1000.0)
 
         pygame.quit()
-        # sys.exit()
+        return not self.quit_requested
@@ -1,25 +1,155 @@
 import os
+import re
 import json
-import importlib.util
 import argparse
-from tqdm import tqdm
-from games.tic_tac_toe.game import TicTacToeGame
-from core.base_agent import BaseAgent
-from core.engine import GameEngine
+import time
+from core.agent_registry import load_agent, player_spec
+from core.sprt import SPRT
+from core import profiling
+from core.profiling import add_profile_args, profile_from_args
 
-def load_agent_from_file(filepath):
-    module_name = os.path.splitext(os.path.basename(filepath))[0]
-    spec = importlib.util.spec_from_file_location(module_name, filepath)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+RESULTS_DIR = "versus_results"
 
-    for obj in module.__dict__.values():
-        if isinstance(obj, type) and issubclass(obj, BaseAgent) and obj is not BaseAgent:
-            return obj
-    raise ValueError(f"No se encontró ninguna clase Agent válida en {filepath}")
 
+def _config_name(conf_file_path):
+    return os.path.splitext(os.path.basename(conf_file_path))[0]
+
+
+def default_results_path(conf_file_path):
+    """Log nuevo para esta ejecución: {RESULTS_DIR}/<cfg>-<fecha>.jsonl (no pisa los anteriores)."""
+    base = os.path.join(RESULTS_DIR, f"{_config_name(conf_file_path)}-{time.strftime('%Y%m%d-%H%M%S')}")
+    path, n = base + ".jsonl", 1
+    while os.path.exists(path):
+        n += 1
+        path = f"{base}-{n}.jsonl"
+    return path
+
+
+def latest_results_path(conf_file_path):
+    """El log más reciente de la configuración en RESULTS_DIR (None si no hay ninguno)."""
+    pattern = re.compile(re.escape(_config_name(conf_file_path)) + r"(-\d{8}-\d{6}(-\d+)?)?\.jsonl")
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    paths = [os.path.join(RESULTS_DIR, name) for name in os.listdir(RESULTS_DIR) if pattern.fullmatch(name)]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def read_results(path):
+    """
+    Lee un log de resultados: (cabecera, {índice: partida}, bytes válidos).
+    Una última línea a medias (corte durante la escritura) se ignora.
+    """
+    header, records, valid = None, {}, 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            valid += len(line)
+            if "players" in entry:
+                header = entry
+            else:
+                records[entry["game"]] = entry
+    return header, records, valid
+
+
+def new_stats(agent_names):
+    def counters():
+        return {"games": 0, "wins": {name: 0 for name in agent_names}, "draws": 0}
+    return {"players": agent_names, "total": counters(), "by_first": [counters() for _ in agent_names],
+            "moves": 0, "seconds": 0.0, "think": {name: 0.0 for name in agent_names}}
+
+
+def add_result(stats, record):
+    """Acumula una partida del log en las estadísticas."""
+    names = stats["players"]
+    for counters in (stats["total"], stats["by_first"][record["first"]]):
+        counters["games"] += 1
+        if record["winner"] < 0:
+            counters["draws"] += 1
+        else:
+            counters["wins"][names[record["winner"]]] += 1
+    stats["moves"] += record["moves"]
+    stats["seconds"] += record["ms"] / 1000
+    for name, ms in zip(names, record["think_ms"]):
+        stats["think"][name] += ms / 1000
+    return stats
+
+
+def summarize(results_path):
+    """Recalcula todas las estadísticas a partir del log, sin jugar ninguna partida."""
+    header, records, _ = read_results(results_path)
+    if header is None:
+        raise ValueError(f"{results_path} no es un log de resultados de versus.py")
+    stats = new_stats(header["players"])
+    for record in records.values():
+        add_result(stats, record)
+    return header, stats
+
+
+def sprt_status(test, stats):
+    candidate = stats["players"][0]
+    total = stats["total"]
+    wins = total["wins"][candidate]
+    losses = total["games"] - wins - total["draws"]
+    return test.status(wins, losses, total["draws"]), test.llr(wins, losses, total["draws"])
+
+
+def print_summary(stats, rounds, test=None):
+    agent_names = stats["players"]
+    total = stats["total"]
+    played = max(total["games"], 1)
+    print(f"\n--- EVALUATION ({total['games']} partidas) ---\n")
+
+    # Global
+    print("Winrate global:")
+    for name in agent_names:
+        print(f"  {name}: {total['wins'][name]/played:.2f}")
+    print(f"Draw rate global: {total['draws']/played:.2f}\n")
+
+    # Por orden de inicio
+    for first, order in ((0, agent_names), (1, list(reversed(agent_names)))):
+        counters = stats["by_first"][first]
+        games = max(counters["games"], 1)
+        print(f"Resultados cuando jugador {agent_names[first]} empieza primero ({counters['games']} partidas):")
+        for name in order:
+            print(f"  {name}: {counters['wins'][name]/games:.2f}")
+        print(f"  Draw rate: {counters['draws']/games:.2f}\n")
+
+    think = " | ".join(f"{name} {1000 * stats['think'][name] / played:.2f} ms" for name in agent_names)
+    print(f"Duración media: {stats['moves']/played:.1f} jugadas, {1000 * stats['seconds'] / played:.2f} ms/partida "
+          f"(act por partida: {think})")
+
+    if test:
+        decision, llr = sprt_status(test, stats)
+        verdict = {"H1": f"{agent_names[0]} es más fuerte (H1)", "H0": f"{agent_names[0]} no es más fuerte (H0)",
+                   None: "sin decidir"}[decision]
+        print(f"\nSPRT: {verdict} | LLR={llr:.2f} en ({test.lower:.2f}, {test.upper:.2f}) | "
+              f"{total['games']} partidas jugadas, {rounds - total['games']} ahorradas")
+        return decision
+
+
+def start_versus(conf_file_path, archive_path=None, sprt=None, results_path=None, resume=False, fresh=False):
+    """
+    Enfrenta a los dos jugadores del fichero de configuración. Cada partida se
+    añade al log `results_path` (JSONL) en cuanto termina; con `resume` se
+    recupera el log y solo se juegan las partidas que faltan. Sin
+    `results_path` cada ejecución usa un log nuevo (o, con `resume`, el más
+    reciente de la configuración). Un log indicado que ya tiene partidas no
+    se sobrescribe salvo con `fresh`.
+    Con `sprt` (dict con elo0/elo1 o p0/p1, alpha, beta y batch) se para en
+    cuanto el test concluye si el primer jugador es más fuerte.
+    """
+    # Aquí y no arriba: --help y --summary no necesitan numpy, tqdm ni el motor
+    from tqdm import tqdm
+    from games.tic_tac_toe.game import TicTacToeGame
+    from core.engine import GameEngine
+    from core.replay_archive import ReplayArchiveWriter
+    from core.base_agent import supports_compact_state
 
-def start_versus(conf_file_path):
     if not os.path.exists(conf_file_path):
         raise ValueError("No existe un fichero de configuración en el path indicado.")
 
@@ -30,83 +160,126 @@ def start_versus(conf_file_path):
     agent_configs = []
     for player in config["players"]:
         agent_configs.append({
-            "class": load_agent_from_file(player["path"]),
+            "class": load_agent(player_spec(player)),
             "name": player["name"],
             "params": player["params"]
         })
 
     # cargar otras configuraciones
     rounds = config["rounds"]
-
-    # --- Estadísticas globales ---
     agent_names = [a["name"] for a in agent_configs]
-    wins_global = {name: 0 for name in agent_names}
-    draws_global = 0
+    explicit = results_path is not None
+    if not explicit:
+        results_path = (resume and latest_results_path(conf_file_path)) or default_results_path(conf_file_path)
+
+    test = None
+    if sprt is not None:
+        sprt = dict(sprt)
+        batch = sprt.pop("batch", 50)
+        test = SPRT(**sprt)
+    # Orden de inicio: con SPRT se alterna partida a partida; si no, mitad y mitad
+    order_scheme = "alternate" if test else "halves"
+    header = {"players": agent_names, "rounds": rounds, "order": order_scheme}
 
-    # --- Estadísticas por orden de inicio ---
-    first_start_wins = {name: 0 for name in agent_names}
-    first_start_draws = 0
-    second_start_wins = {name: 0 for name in agent_names}
-    second_start_draws = 0
+    # --- Log de resultados: se recupera (resume) o se empieza de cero ---
+    stats = new_stats(agent_names)
+    records = {}
+    if resume and os.path.exists(results_path):
+        saved, records, valid = read_results(results_path)
+        if saved is not None:
+            if saved["players"] != agent_names:
+                raise ValueError(f"{results_path} es de otros jugadores: {saved['players']}")
+            if saved["rounds"] != rounds:
+                raise ValueError(f"{results_path} es de un versus de {saved['rounds']} partidas, no de {rounds}")
+            if saved.get("order", "halves") != order_scheme:
+                raise ValueError(f"{results_path} se empezó con otro orden de inicio ({saved.get('order', 'halves')}): "
+                                 f"reanúdalo {'con' if test is None else 'sin'} --sprt")
+        with open(results_path, "r+b") as f:
+            f.truncate(valid)
+        log = open(results_path, "a")
+        if saved is None:
+            log.write(json.dumps(header) + "\n")
+        for record in records.values():
+            add_result(stats, record)
+        print(f"[INFO] {len(records)} partidas recuperadas de {results_path}")
+    else:
+        if explicit and not fresh and os.path.exists(results_path) and read_results(results_path)[1]:
+            raise ValueError(f"{results_path} ya tiene partidas: usa --resume para continuarlo "
+                             f"o --fresh para empezar de cero")
+        if os.path.dirname(results_path):
+            os.makedirs(os.path.dirname(results_path), exist_ok=True)
+        log = open(results_path, "w")
+        log.write(json.dumps(header) + "\n")
+
+    # Archivo de replays (opcional): cada partida se añade al terminar
+    archive = ReplayArchiveWriter(archive_path) if archive_path else None
 
     half = rounds // 2
-    remaining = rounds - half  # para caso de número impar
-
-    for i in tqdm(range(rounds)):
-        # Alternar quién empieza
-        if i < half:
-            # jugador 1 empieza primero
-            agents = [a["class"](a["name"], **a["params"]) for a in agent_configs]
-            first_start = True
-        else:
-            # jugador 2 empieza primero
-            agents = [a["class"](a["name"], **a["params"]) for a in reversed(agent_configs)]
-            first_start = False
-
-        # Jugar partida
-        game = TicTacToeGame(num_players=2)
-        engine = GameEngine(game, agents, ui=None)
-        winner_idx = engine.run(verbose=False)
-
-        # Global
-        if winner_idx is None:
-            draws_global += 1
-        else:
-            winner_name = agents[winner_idx].name
-            wins_global[winner_name] += 1
+    decision = sprt_status(test, stats)[0] if test and records else None
 
-        # Estadísticas por orden de inicio
-        if first_start:
-            if winner_idx is None:
-                first_start_draws += 1
-            else:
-                first_start_wins[agents[winner_idx].name] += 1
-        else:
-            if winner_idx is None:
-                second_start_draws += 1
-            else:
-                second_start_wins[agents[winner_idx].name] += 1
+    try:
+        for i in tqdm(range(rounds)):
+            profiling.step(i)
+            if decision:
+                break
+            if i in records:
+                continue
 
-    # --- Resultados ---
-    print(f"\n--- EVALUATION ({rounds} partidas) ---\n")
+            # Alternar quién empieza (con SPRT, partida a partida: cada lote queda equilibrado)
+            first = 0 if ((i % 2 == 0) if order_scheme == "alternate" else (i < half)) else 1
+            order = agent_configs if first == 0 else list(reversed(agent_configs))
+            agents = [a["class"](a["name"], **a["params"]) for a in order]
 
-    # Global
-    print("Winrate global:")
-    for name in agent_names:
-        print(f"  {name}: {wins_global[name]/rounds:.2f}")
-    print(f"Draw rate global: {draws_global/rounds:.2f}\n")
+            # Jugar partida
+            # Estado compacto solo si ambos agentes lo admiten (BaseAgent.compact_state)
+            game = TicTacToeGame(num_players=2, compact=supports_compact_state(agents))
+            engine = GameEngine(game, agents, ui=None, archive=archive)
+            start = time.perf_counter()
+            winner_idx = engine.run(verbose=False)
+            elapsed = time.perf_counter() - start
 
-    # Jugador 1 empieza primero
-    print(f"Resultados cuando jugador {agent_names[0]} empieza primero ({half} partidas):")
-    for name in agent_names:
-        print(f"  {name}: {first_start_wins[name]/half:.2f}")
-    print(f"  Draw rate: {first_start_draws/half:.2f}\n")
+            # Registro compacto (índices en el orden de la configuración)
+            seat_of = {agent.name: seat for seat, agent in enumerate(agents)}
+            record = {
+                "game": i,
+                "first": first,
+                "winner": -1 if winner_idx is None else agent_names.index(agents[winner_idx].name),
+                "moves": len(engine.moves),
+                "ms": round(1000 * elapsed, 3),
+                "think_ms": [round(1000 * engine.think_time[seat_of[name]], 3) for name in agent_names],
+            }
+            log.write(json.dumps(record, separators=(",", ":")) + "\n")
+            log.flush()
+            add_result(stats, record)
+
+            if test and stats["total"]["games"] % batch == 0:
+                decision = sprt_status(test, stats)[0]
+    finally:
+        log.close()
+        if archive:
+            archive.close()
+            print(f"Replays guardados en {archive_path}")
 
-    # Jugador 2 empieza primero
-    print(f"Resultados cuando jugador {agent_names[-1]} empieza primero ({remaining} partidas):")
-    for name in reversed(agent_names):
-        print(f"  {name}: {second_start_wins[name]/remaining:.2f}")
-    print(f"  Draw rate: {second_start_draws/remaining:.2f}")
+    decision = print_summary(stats, rounds, test)
+    total = stats["total"]
+    return {"games": total["games"], "wins": total["wins"], "draws": total["draws"], "sprt": decision}
+
+
+def start_tournament(conf_file_path, out_dir=None, rating="elo", workers=1):
+    """Todos contra todos entre los N jugadores del fichero de configuración."""
+    from core.tournament import Tournament
+
+    if not os.path.exists(conf_file_path):
+        raise ValueError("No existe un fichero de configuración en el path indicado.")
+
+    with open(conf_file_path, "r") as cfg:
+        config = json.load(cfg)
+
+    if out_dir is None:
+        out_dir = os.path.join("tournaments", os.path.splitext(os.path.basename(conf_file_path))[0])
+    options = {k: config[k] for k in ("batch_games", "min_games", "max_games", "precision") if k in config}
+    tournament = Tournament(config["players"], out_dir, rating=rating, **options)
+    return tournament.run(workers=workers)
 
 
 if __name__ == "__main__":
@@ -116,6 +289,54 @@ if __name__ == "__main__":
         required=True,
         help="ruta/al/fichero_conf.json"
     )
+    parser.add_argument(
+        "--archive",
+        default=None,
+        help="ruta/al/archivo.replays donde añadir todas las partidas"
+    )
+    parser.add_argument("--mode", choices=["versus", "tournament"], default="versus",
+                        help="versus: dos jugadores; tournament: todos contra todos entre N jugadores")
+    parser.add_argument("--rating", choices=["elo", "glicko"], default="elo", help="rating del torneo")
+    parser.add_argument("--workers", type=int, default=1, help="procesos para las partidas del torneo")
+    parser.add_argument("--out", default=None,
+                        help="directorio del torneo (results.jsonl y standings.json)")
+    parser.add_argument("--sprt", action="store_true",
+                        help="parar en cuanto el SPRT decida (opciones en la clave \"sprt\" del fichero)")
+    parser.add_argument("--elo0", type=float, default=None, help="SPRT: diferencia de Elo de H0")
+    parser.add_argument("--elo1", type=float, default=None, help="SPRT: diferencia de Elo de H1")
+    parser.add_argument("--alpha", type=float, default=None, help="SPRT: error de tipo I")
+    parser.add_argument("--beta", type=float, default=None, help="SPRT: error de tipo II")
+    parser.add_argument("--batch", type=int, default=None, help="SPRT: partidas entre comprobaciones")
+    parser.add_argument("--results", default=None,
+                        help=f"log JSONL con una línea por partida (por defecto uno nuevo por ejecución: "
+                             f"{RESULTS_DIR}/<cfg>-<fecha>.jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="recupera el log de resultados (--results o el más reciente de la configuración) "
+                             "y juega solo las partidas que faltan")
+    parser.add_argument("--fresh", action="store_true",
+                        help="sobrescribe el log de --results aunque ya tenga partidas")
+    parser.add_argument("--summary", action="store_true",
+                        help="recalcula las estadísticas desde el log sin jugar partidas")
+    add_profile_args(parser)
     args = parser.parse_args()
 
-    start_versus(args.cfg)
+    sprt = None
+    if args.sprt:
+        with open(args.cfg) as cfg:
+            sprt = json.load(cfg).get("sprt", {})
+        sprt.update({k: v for k, v in (("elo0", args.elo0), ("elo1", args.elo1), ("alpha", args.alpha),
+                                       ("beta", args.beta), ("batch", args.batch)) if v is not None})
+
+    with profile_from_args(args, "versus"):
+        if args.summary:
+            results_path = args.results or latest_results_path(args.cfg)
+            if results_path is None:
+                raise ValueError(f"No hay logs de resultados de {args.cfg} en {RESULTS_DIR}")
+            header, stats = summarize(results_path)
+            test = SPRT(**{k: v for k, v in sprt.items() if k != "batch"}) if sprt is not None else None
+            print_summary(stats, header["rounds"], test)
+        elif args.mode == "tournament":
+            start_tournament(args.cfg, out_dir=args.out, rating=args.rating, workers=args.workers)
+        else:
+            start_versus(args.cfg, archive_path=args.archive, sprt=sprt, results_path=args.results,
+                         resume=args.resume, fresh=args.fresh)